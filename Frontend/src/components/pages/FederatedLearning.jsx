@@ -77,20 +77,50 @@ export default function FederatedLearning() {
   useEffect(() => {
     fetchClients();
     fetchTrainingStatus();
+    fetchTrainingHistory();
     fetchModelInfo();
     fetchDataStats();
   }, []);
 
-  // Poll training status when training is active
+  // Stream training progress while training is active. Each event carries a
+  // small status summary and, per completed round, only that round's data.
   useEffect(() => {
-    let interval;
-    if (trainingStatus?.is_training) {
-      interval = setInterval(() => {
+    if (!trainingStatus?.is_training) return;
+
+    const source = new EventSource(
+      `${ADMIN_SERVER}/api/training/stream?since=${trainingStatus.version ?? 0}`
+    );
+    source.onmessage = (message) => {
+      const event = JSON.parse(message.data);
+      if (event.type === 'resync') {
         fetchTrainingStatus();
         fetchTrainingHistory();
-      }, 2000);
-    }
-    return () => clearInterval(interval);
+        return;
+      }
+      setTrainingStatus(prev => {
+        const next = { ...prev, ...event.status, version: event.version };
+        if (event.type === 'client_completed') {
+          const others = (prev?.client_metrics || []).filter(m => m.client_id !== event.data.metrics.client_id);
+          next.client_metrics = [...others, event.data.metrics];
+        } else if (event.type === 'round_completed') {
+          next.client_metrics = event.data.client_metrics;
+        } else if (event.type === 'training_completed') {
+          next.global_metrics = event.data.global_metrics;
+        } else if (event.type === 'training_failed') {
+          next.error = event.data.error;
+        }
+        return next;
+      });
+      if (event.type === 'training_started') {
+        setTrainingHistory([]);
+      } else if (event.type === 'round_completed') {
+        setTrainingHistory(prev =>
+          prev.some(r => r.round === event.data.round) ? prev : [...prev, event.data]
+        );
+      }
+    };
+    // EventSource reconnects on its own, resuming from the last event id
+    return () => source.close();
   }, [trainingStatus?.is_training]);
 
   const fetchClients = async () => {
@@ -262,6 +292,7 @@ export default function FederatedLearning() {
       });
 
       if (response.ok) {
+        setTrainingHistory([]);
         fetchTrainingStatus();
       } else {
         const data = await response.json();
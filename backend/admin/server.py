@@ -7,22 +7,32 @@ Run with: python server.py
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+import logging
 import sys
 import os
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from core.log import RequestIdMiddleware, configure_logging
+
+logger = logging.getLogger("admin.server")
+
 # Try to import authentication
 try:
     from auth.routes import router as auth_router
-    from auth.database import ensure_tables, close_pool
+    from auth.database import warm_pool, ensure_tables, close_pool, pool_metrics
+    from auth.sign_in_buffer import start_sign_in_flusher, stop_sign_in_flusher
+    from auth.jwt_handler import is_admin_authorization
     from config import settings, validate_settings
     AUTH_AVAILABLE = True
 except ImportError as e:
-    print(f"Warning: Auth module not available: {e}")
+    logger.warning("Auth module not available: %s", e)
     AUTH_AVAILABLE = False
     
+    async def warm_pool():
+        pass
+
     async def ensure_tables():
         pass
     
@@ -35,16 +45,24 @@ try:
     TF_AVAILABLE = True
 except ImportError:
     TF_AVAILABLE = False
-    print("Warning: TensorFlow not available. Model training will be simulated.")
+    logger.warning("TensorFlow not available. Model training will be simulated.")
+
+# Queue-based structured logging (LOG_LEVEL / LOG_FORMAT / LOG_PRODUCTION, read after .env is loaded)
+configure_logging()
 
 # Import route modules
-from routes import clients_router, data_router, model_router, training_router, users_router
+from routes import clients_router, data_router, model_router, readings_router, training_router, users_router
+from routes.readings import start_readings_flusher, stop_readings_flusher
+from core.responses import FastJSONResponse
+from core.metrics import REGISTRY, install_metrics
+from core.profiling import ProfilingMiddleware, configure_profiling
 
 # Create FastAPI app
 app = FastAPI(
     title="Federated Learning Admin Server",
     version="2.0.0",
-    description="Coordinates federated learning across multiple client devices"
+    description="Coordinates federated learning across multiple client devices",
+    default_response_class=FastJSONResponse
 )
 
 # Add CORS middleware
@@ -61,9 +79,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request metrics middleware and the Prometheus /metrics endpoint
+install_metrics(app)
+
+# Opt-in per-request profiling (X-Profile header, admins only, PROFILING_ENABLED)
+if AUTH_AVAILABLE:
+    configure_profiling(
+        enabled=settings.PROFILING_ENABLED,
+        directory=settings.PROFILE_DIR or None,
+        sample_interval_ms=settings.PROFILE_SAMPLE_INTERVAL_MS,
+        authorize=is_admin_authorization
+    )
+app.add_middleware(ProfilingMiddleware)
+
+# Request IDs for log records (X-Request-ID in and out)
+app.add_middleware(RequestIdMiddleware)
+
+if AUTH_AVAILABLE:
+    REGISTRY.register_collector(pool_metrics)
+
 # Include routers
 if AUTH_AVAILABLE:
     app.include_router(auth_router)
+    # Readings are only accepted when the flusher that writes them runs
+    app.include_router(readings_router)
 
 app.include_router(clients_router)
 app.include_router(data_router)
@@ -77,14 +116,20 @@ if AUTH_AVAILABLE:
     async def startup_db():
         """Initialize PostgreSQL pool and ensure tables exist on startup."""
         try:
+            # Open the pool's connections now so the first request doesn't pay for them
+            await warm_pool()
             await ensure_tables()
-            print("✅ PostgreSQL ready")
+            logger.info("PostgreSQL ready")
         except Exception as e:
-            print(f"⚠️  PostgreSQL startup error: {e}")
+            logger.error("PostgreSQL startup error: %s", e)
+        start_sign_in_flusher()
+        start_readings_flusher()
 
     @app.on_event("shutdown")
     async def shutdown_db():
-        """Close database connection pool."""
+        """Flush buffered sign-ins and readings, then close database connection pool."""
+        await stop_sign_in_flusher()
+        await stop_readings_flusher()
         await close_pool()
 
 
@@ -114,6 +159,9 @@ async def index():
         "tensorflow_available": TF_AVAILABLE,
         "auth_available": AUTH_AVAILABLE,
         "endpoints": {
+            "Monitoring": {
+                "GET /metrics": "Prometheus metrics (requests, latency, inference, rounds, fan-out, DB pool)"
+            },
             "Authentication": {
                 "POST /api/auth/register": "Register new user",
                 "POST /api/auth/login": "Login with email/password",
@@ -136,9 +184,16 @@ async def index():
                 "GET /api/all-clients-metrics": "Fetch model metrics from all clients",
                 "GET /api/data/statistics": "Get training data statistics"
             },
+            "Sensor Readings": {
+                "POST /api/readings": "Ingest a batch of device readings",
+                "GET /api/readings": "Query stored readings by device and time range",
+                "GET /api/readings/stats": "Ingestion buffer statistics"
+            },
             "Federated Training": {
                 "GET /api/training/status": "Get training status",
                 "GET /api/training/history": "Get training round history",
+                "GET /api/training/events": "Long-poll training progress events",
+                "GET /api/training/stream": "Stream training progress events (SSE)",
                 "POST /api/training/start": "Start federated training",
                 "POST /api/training/stop": "Stop ongoing training"
             },
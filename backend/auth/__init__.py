@@ -12,11 +12,20 @@ from .jwt_handler import (
 
 from .database import (
     get_pool,
+    warm_pool,
+    get_pool_stats,
     close_pool,
     ensure_tables,
     check_database_health
 )
 
+from .sign_in_buffer import (
+    record_sign_in,
+    flush_sign_ins,
+    start_sign_in_flusher,
+    stop_sign_in_flusher
+)
+
 from .models import (
     UserCreate,
     UserLogin,
@@ -38,9 +47,15 @@ __all__ = [
     "get_current_user",
     "get_current_active_user",
     "get_pool",
+    "warm_pool",
+    "get_pool_stats",
     "close_pool",
     "ensure_tables",
     "check_database_health",
+    "record_sign_in",
+    "flush_sign_ins",
+    "start_sign_in_flusher",
+    "stop_sign_in_flusher",
     "UserCreate",
     "UserLogin",
     "UserResponse",
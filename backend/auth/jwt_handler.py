@@ -182,6 +182,19 @@ async def get_current_active_user(
     
     return current_user
 
+def is_admin_authorization(authorization: Optional[str]) -> bool:
+    """
+    Whether an Authorization header value carries a valid admin access token.
+    For checks outside FastAPI dependencies (e.g. ASGI middleware).
+    """
+    if not authorization or not authorization.lower().startswith("bearer "):
+        return False
+    try:
+        payload = verify_token(authorization[7:].strip(), "access")
+    except HTTPException:
+        return False
+    return payload.get("role") == "admin"
+
 def get_optional_user(
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))
 ) -> Optional[Dict[str, Any]]:
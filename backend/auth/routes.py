@@ -3,6 +3,8 @@ Authentication API routes.
 Uses pure JWT authentication with PostgreSQL for data persistence.
 """
 
+import logging
+
 from fastapi import APIRouter, HTTPException, status, Depends
 
 from .models import (
@@ -14,12 +16,15 @@ from .jwt_handler import (
     get_current_user, get_current_active_user
 )
 from .database import (
-    get_user_by_email, create_user, update_user_profile,
-    update_user_password, update_last_sign_in, check_database_health
+    get_user_by_email, get_user_by_id, create_user, update_user_profile,
+    update_user_password, check_database_health, get_pool_stats
 )
+from .sign_in_buffer import record_sign_in
 from .utils import hash_password, verify_password, row_to_user_data
 from config import settings
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter(prefix="/api/auth", tags=["Authentication"])
 
 
@@ -28,7 +33,8 @@ def create_token_response(user_data: dict) -> TokenResponse:
     token_data = {
         "sub": user_data["id"],
         "email": user_data["email"],
-        "full_name": user_data.get("full_name")
+        "full_name": user_data.get("full_name"),
+        "role": user_data.get("role", "user")
     }
 
     access_token = create_access_token(token_data)
@@ -68,9 +74,11 @@ async def register(user_data: UserCreate):
             email=user_data.email,
             password_hash=hashed,
             full_name=user_data.full_name,
+            # Open registration never grants admin; promote via admin_users.role
+            role="user",
         )
 
-        print(f"✓ User {user_data.email} registered successfully")
+        logger.info("User %s registered", user_data.email)
         user = row_to_user_data(row)
         return create_token_response(user)
 
@@ -78,7 +86,7 @@ async def register(user_data: UserCreate):
         raise
     except Exception as e:
         error_msg = str(e)
-        print(f"❌ Registration error: {error_msg}")
+        logger.error("Registration error: %s", error_msg)
 
         if "unique" in error_msg.lower() or "duplicate" in error_msg.lower():
             raise HTTPException(
@@ -114,8 +122,8 @@ async def login(credentials: UserLogin):
                 detail="Account is deactivated. Contact an administrator."
             )
 
-        # Update last sign-in timestamp
-        await update_last_sign_in(str(row["id"]))
+        # Buffer last sign-in timestamp (flushed in batches in the background)
+        record_sign_in("admin_users", str(row["id"]))
 
         user = row_to_user_data(row)
         return create_token_response(user)
@@ -138,14 +146,15 @@ async def refresh_token(token_data: TokenRefresh):
     try:
         payload = verify_token(token_data.refresh_token, "refresh")
 
-        user_data = {
-            "id": payload.get("sub"),
-            "email": payload.get("email"),
-            "full_name": payload.get("full_name"),
-            "email_confirmed": True
-        }
+        # Re-read the user so role changes and deactivation apply on refresh
+        row = await get_user_by_id(payload.get("sub"))
+        if row is None or not row.get("is_active", True):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid or expired refresh token"
+            )
 
-        return create_token_response(user_data)
+        return create_token_response(row_to_user_data(row))
 
     except HTTPException:
         raise HTTPException(
@@ -286,5 +295,6 @@ async def auth_health_check():
 
     return {
         "status": "healthy",
-        "message": "Authentication service is connected to PostgreSQL"
+        "message": "Authentication service is connected to PostgreSQL",
+        "pool": get_pool_stats()
     }
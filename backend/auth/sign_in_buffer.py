@@ -0,0 +1,111 @@
+"""
+Write-behind buffer for last_sign_in timestamps.
+
+Logins record the sign-in time in memory and return immediately; a background
+task flushes all pending timestamps in one batched UPDATE per table every
+SIGN_IN_FLUSH_INTERVAL_SECONDS, and once more at shutdown. While flushes fail
+the interval doubles up to SIGN_IN_MAX_FLUSH_BACKOFF_SECONDS, and only the
+first failure is logged with a traceback.
+"""
+
+import os
+import sys
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from .database import batch_update_last_sign_in
+
+logger = logging.getLogger(__name__)
+
+try:
+    from config import settings
+except ImportError:
+    class settings:
+        SIGN_IN_FLUSH_INTERVAL_SECONDS = float(os.getenv("SIGN_IN_FLUSH_INTERVAL_SECONDS", "5"))
+        SIGN_IN_MAX_FLUSH_BACKOFF_SECONDS = float(os.getenv("SIGN_IN_MAX_FLUSH_BACKOFF_SECONDS", "300"))
+
+# Pending timestamps per table: {table: {user_id: signed_in_at}}
+_pending: Dict[str, Dict[str, datetime]] = {
+    "admin_users": {},
+    "portal_users": {},
+}
+_flush_task: Optional[asyncio.Task] = None
+_stop_requested: Optional[asyncio.Event] = None
+# Consecutive flushes with at least one failed table (drives the backoff)
+_failed_flushes = 0
+
+
+def record_sign_in(table: str, user_id: str):
+    """Buffer a sign-in for user_id; only the latest timestamp per user is kept."""
+    _pending[table][user_id] = datetime.now(timezone.utc)
+
+
+async def flush_sign_ins() -> int:
+    """Write all buffered sign-ins to the database. Returns the number of rows flushed."""
+    global _failed_flushes
+    flushed, failed = 0, False
+    for table, pending in _pending.items():
+        if not pending:
+            continue
+        # Swap the buffer out before awaiting so concurrent logins go to a fresh dict
+        batch = dict(pending)
+        pending.clear()
+        try:
+            await batch_update_last_sign_in(table, list(batch.keys()), list(batch.values()))
+            flushed += len(batch)
+        except BaseException as e:
+            # Put the batch back unless a newer sign-in arrived meanwhile
+            for user_id, ts in batch.items():
+                pending.setdefault(user_id, ts)
+            if not isinstance(e, Exception):
+                # Cancelled mid-UPDATE: the batch is pending again for the final flush
+                raise
+            if not _failed_flushes and not failed:
+                logger.exception("Failed to flush %d sign-ins to %s, retrying with backoff", len(batch), table)
+            else:
+                logger.debug("Sign-in flush to %s failed again: %s", table, e)
+            failed = True
+    if failed:
+        _failed_flushes += 1
+    elif _failed_flushes and flushed:
+        logger.info("Sign-in flushes recovered after %d failures", _failed_flushes)
+        _failed_flushes = 0
+    return flushed
+
+
+def _flush_delay(interval: float) -> float:
+    """Seconds until the next flush: interval, doubled per consecutive failure up to the cap."""
+    if not _failed_flushes:
+        return interval
+    return min(interval * 2 ** min(_failed_flushes, 32), settings.SIGN_IN_MAX_FLUSH_BACKOFF_SECONDS)
+
+
+async def _flush_loop(interval: float, stop: asyncio.Event):
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=_flush_delay(interval))
+        except asyncio.TimeoutError:
+            await flush_sign_ins()
+
+
+def start_sign_in_flusher():
+    """Start the periodic background flush (call on app startup)."""
+    global _flush_task, _stop_requested
+    if _flush_task is None:
+        _stop_requested = asyncio.Event()
+        _flush_task = asyncio.create_task(_flush_loop(settings.SIGN_IN_FLUSH_INTERVAL_SECONDS, _stop_requested))
+
+
+async def stop_sign_in_flusher():
+    """Stop the background flush and write out anything still pending (call on app shutdown)."""
+    global _flush_task
+    if _flush_task is not None:
+        # Let a flush in progress finish its UPDATE instead of cancelling it mid-write
+        _stop_requested.set()
+        await _flush_task
+        _flush_task = None
+    await flush_sign_ins()
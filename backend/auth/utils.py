@@ -24,6 +24,7 @@ def row_to_user_data(row: dict) -> dict:
         "id": str(row["id"]),
         "email": row["email"],
         "full_name": row.get("full_name"),
+        "role": row.get("role", "user"),
         "avatar_url": row.get("avatar_url"),
         "email_confirmed": True,
         "created_at": row.get("created_at"),
@@ -0,0 +1,154 @@
+"""
+Benchmark: CSV vs columnar (.npy) dataset loading.
+
+Generates synthetic datasets of the requested sizes by resampling rows of
+data/synthetic_dataset.csv, converts each to the columnar format and loads
+the training columns in a fresh subprocess per reader, so peak RSS reflects
+that reader alone.
+
+Run from backend/:
+    python -m benchmarks.bench_columnar --rows 1000000 10000000 --output columnar.json
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+BASE_DATA = os.path.join(BACKEND_DIR, "data", "synthetic_dataset.csv")
+
+# Columns read by load_and_prepare_data
+TRAINING_COLUMNS = [
+    'pressure_bar', 'flow_rate_L_min', 'total_volume_L', 'tds_ppm', 'ph',
+    'temperature_C', 'signal_strength_dBm', 'pressure_status', 'tds_status',
+    'ph_status', 'wifi_status', 'sensor_status', 'alert',
+]
+
+READERS = ("csv_full", "csv_usecols", "columnar")
+
+
+def generate_csv(path: str, rows: int, chunk_rows: int = 1_000_000):
+    """Write a CSV of `rows` readings resampled from the bundled dataset."""
+    import numpy as np
+    import pandas as pd
+
+    base = pd.read_csv(BASE_DATA)
+    rng = np.random.default_rng(42)
+    start = pd.Timestamp(base['timestamp'].iloc[0])
+    written = 0
+    with open(path, "w") as f:
+        while written < rows:
+            n = min(chunk_rows, rows - written)
+            chunk = base.iloc[rng.integers(0, len(base), n)].reset_index(drop=True)
+            chunk['timestamp'] = (start + pd.to_timedelta(np.arange(written, written + n) * 5, unit='min')) \
+                .strftime('%Y-%m-%d %H:%M:%S')
+            chunk.to_csv(f, header=(written == 0), index=False)
+            written += n
+
+
+def peak_rss_kb() -> int:
+    """Peak resident set size of this process in KB."""
+    # VmHWM belongs to the current address space; ru_maxrss can carry over the
+    # parent's peak across fork+exec on Linux.
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _run_reader(reader: str, path: str) -> dict:
+    """Load `path` with one reader; runs inside the worker subprocess."""
+    import pandas as pd
+    from core.columnar import read_columnar
+
+    baseline_kb = peak_rss_kb()
+    start = time.perf_counter()
+    if reader == "csv_full":
+        df = pd.read_csv(path)
+    elif reader == "csv_usecols":
+        df = pd.read_csv(path, usecols=TRAINING_COLUMNS)
+    else:
+        df = read_columnar(path, TRAINING_COLUMNS)
+        # Touch every column so memory-mapped pages are actually read
+        for col in df.columns:
+            values = df[col].cat.codes if isinstance(df[col].dtype, pd.CategoricalDtype) else df[col]
+            values.to_numpy().sum()
+    seconds = time.perf_counter() - start
+    peak_kb = peak_rss_kb()
+    return {
+        "reader": reader,
+        "rows": len(df),
+        "seconds": seconds,
+        "peak_rss_mb": peak_kb / 1024,
+        "peak_rss_over_baseline_mb": (peak_kb - baseline_kb) / 1024,
+    }
+
+
+def measure(reader: str, path: str) -> dict:
+    """Run one reader in a fresh interpreter and return its measurements."""
+    out = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_columnar", "--worker", reader, path],
+        cwd=BACKEND_DIR, check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def run(rows_list, workdir: str) -> list:
+    from core.columnar import convert_csv_to_columnar
+
+    results = []
+    for rows in rows_list:
+        csv_path = os.path.join(workdir, f"readings_{rows}.csv")
+        print(f"Generating {rows:,} rows...", file=sys.stderr)
+        generate_csv(csv_path, rows)
+
+        start = time.perf_counter()
+        cols_path = convert_csv_to_columnar(csv_path)
+        convert_seconds = time.perf_counter() - start
+
+        for reader in READERS:
+            result = measure(reader, cols_path if reader == "columnar" else csv_path)
+            result["dataset_rows"] = rows
+            if reader == "columnar":
+                result["convert_seconds"] = convert_seconds
+            print(f"  {reader:12s} {result['seconds']:8.3f}s  peak RSS {result['peak_rss_mb']:9.1f} MB",
+                  file=sys.stderr)
+            results.append(result)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    parser.add_argument("--workdir", help="Directory for generated datasets (default: temp dir)")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--worker", nargs=2, metavar=("READER", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(_run_reader(*args.worker)))
+        return
+
+    with tempfile.TemporaryDirectory(dir=args.workdir) as workdir:
+        results = run(args.rows, workdir)
+
+    report = json.dumps({"benchmark": "columnar_load", "results": results}, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report)
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: admin fan-out endpoints against N local stub clients.
+
+Registers N stub clients (benchmarks.stub_clients) with the admin app and
+times the endpoints that call every registered client:
+
+    GET /api/clients/health
+    GET /api/all-clients-data
+    GET /api/all-clients-metrics
+
+The admin app runs in-process; its calls to the stubs go over real
+localhost HTTP. --latency-ms adds a per-request delay on the stubs to stand
+in for network and device time.
+
+Run from backend/:
+    python -m benchmarks.bench_fanout --clients 1 10 50 --latency-ms 5 --output fanout.json
+"""
+
+import argparse
+import asyncio
+
+from benchmarks.harness import asgi_client, environment, load_admin_app, log, time_async, write_report
+from benchmarks.stub_clients import StubFleet
+
+ENDPOINTS = ("/api/clients/health", "/api/all-clients-data", "/api/all-clients-metrics")
+
+
+async def _measure(app, n_clients: int, latency_ms: float, repeat: int) -> list:
+    results = []
+    async with asgi_client(app, timeout=120.0) as http:
+        for endpoint in ENDPOINTS:
+            async def call():
+                response = await http.get(endpoint)
+                response.raise_for_status()
+
+            stats = {"case": f"fanout{endpoint}/clients={n_clients}", "endpoint": endpoint,
+                     "clients": n_clients, "latency_ms": latency_ms,
+                     **await time_async(call, repeat=repeat)}
+            log(f"  {endpoint:28s} {n_clients:>4} clients  {stats['median_ms']:9.1f} ms")
+            results.append(stats)
+    return results
+
+
+def run(clients_list, latency_ms: float, repeat: int) -> list:
+    app = load_admin_app()
+    from routes.clients import CLIENTS
+
+    results = []
+    saved = list(CLIENTS)
+    try:
+        for n_clients in clients_list:
+            with StubFleet(n_clients, latency_ms) as fleet:
+                CLIENTS[:] = fleet.clients
+                results.extend(asyncio.run(_measure(app, n_clients, latency_ms, repeat)))
+    finally:
+        CLIENTS[:] = saved
+    return results
+
+
+def bench(quick: bool = False) -> list:
+    return run([1, 10] if quick else [1, 10, 50], latency_ms=5.0, repeat=5)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    results = run(args.clients, args.latency_ms, args.repeat)
+    write_report({"benchmark": "fanout", "environment": environment(), "results": results}, args.output)
+
+
+if __name__ == "__main__":
+    main()
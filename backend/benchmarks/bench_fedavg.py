@@ -0,0 +1,75 @@
+"""
+Benchmark: FedAvg aggregation (core.utils.federated_average).
+
+Averages the weights of N clients for the model create_model() builds
+(Dense 32-16-8-1 over the encoded features), plus a wider variant so the
+per-layer cost shows up next to the per-call overhead.
+
+Run from backend/:
+    python -m benchmarks.bench_fedavg --clients 5 50 500 --output fedavg.json
+"""
+
+import argparse
+import math
+
+from benchmarks.harness import environment, log, time_call, write_report
+
+# Dense layer widths of create_model(); "wide" scales them up 16x
+MODELS = {
+    "default": (32, 16, 8, 1),
+    "wide": (512, 256, 128, 1),
+}
+
+
+def layer_shapes(n_features: int, units) -> list:
+    """Kernel and bias shapes of a Dense stack, in get_weights() order."""
+    shapes = []
+    previous = n_features
+    for width in units:
+        shapes.extend([(previous, width), (width,)])
+        previous = width
+    return shapes
+
+
+def client_weights(n_clients: int, shapes, seed: int = 42) -> list:
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    return [[rng.standard_normal(shape).astype(np.float32) for shape in shapes] for _ in range(n_clients)]
+
+
+def run(clients_list, repeat: int) -> list:
+    from core.features import FeatureSpec
+    from core.utils import federated_average
+
+    n_features = FeatureSpec.default().n_features
+    results = []
+    for model, units in MODELS.items():
+        shapes = layer_shapes(n_features, units)
+        params = sum(math.prod(shape) for shape in shapes)
+        for n_clients in clients_list:
+            weights = client_weights(n_clients, shapes)
+            stats = {"case": f"fedavg/{model}/clients={n_clients}", "model": model, "params": params,
+                     "clients": n_clients, **time_call(lambda: federated_average(weights), repeat=repeat)}
+            log(f"  {model:8s} {params:>9,} params  {n_clients:>5} clients  {stats['median_ms']:9.3f} ms")
+            results.append(stats)
+    return results
+
+
+def bench(quick: bool = False) -> list:
+    return run([5, 50] if quick else [5, 50, 500], repeat=20)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, nargs="+", default=[5, 50, 500])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    results = run(args.clients, args.repeat)
+    write_report({"benchmark": "fedavg", "environment": environment(), "results": results}, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Benchmark: clean_for_json + stdlib JSON vs the single-pass FastJSONResponse encoder.
+
+Builds /api/training/history-shaped payloads with the requested number of
+rounds (per-client metrics as Python and NumPy floats, some NaN/Inf, as a
+failed evaluation produces) and times serializing each one:
+
+    legacy  clean_for_json -> FastAPI jsonable_encoder -> json.dumps
+            (what returning clean_for_json(...) from an endpoint cost)
+    fast    core.responses.dumps_json (orjson when installed)
+
+clean_for_json alone (the recursive NaN/Inf walk) is timed as well.
+
+Run from backend/:
+    python -m benchmarks.bench_json --rounds 100 1000 10000 --output json.json
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+
+from benchmarks.harness import environment, time_call, write_report
+
+
+def build_history(rounds: int, clients: int, seed: int = 42) -> dict:
+    """A training-history payload with `rounds` rounds of `clients` clients."""
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    history = []
+    for r in range(1, rounds + 1):
+        client_metrics = []
+        for c in range(clients):
+            values = rng.random(5)
+            if rng.random() < 0.05:
+                values[rng.integers(0, 5)] = np.nan
+            client_metrics.append({
+                'client_id': f"client_{c+1}",
+                'samples': np.int64(rng.integers(1_000, 100_000)),
+                'accuracy': float(values[0]),
+                'precision': values[1],           # NumPy scalar
+                'recall': float(values[2]),
+                'f1_score': float(values[3]),
+                'loss': float(values[4]) if r % 97 else float('inf'),
+            })
+        history.append({
+            'round': r,
+            'client_metrics': client_metrics,
+            'average_metrics': {k: float(np.nanmean([m[k] for m in client_metrics]))
+                                for k in ('accuracy', 'precision', 'recall', 'f1_score')},
+            'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+        })
+    return {
+        'round_history': history,
+        'total_rounds_completed': rounds,
+        'global_metrics': {'accuracy': 0.93, 'loss': float('nan')},
+    }
+
+
+def _legacy(payload) -> bytes:
+    from fastapi.encoders import jsonable_encoder
+    from core.utils import clean_for_json
+    return json.dumps(jsonable_encoder(clean_for_json(payload)), ensure_ascii=False,
+                      allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+def _fast(payload) -> bytes:
+    from core.responses import dumps_json
+    return dumps_json(payload)
+
+
+ENCODERS = {"legacy": _legacy, "fast": _fast}
+
+
+def time_encoder(fn, payload, repeat: int) -> dict:
+    fn(payload)  # warm-up (imports, caches)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = fn(payload)
+        timings.append(time.perf_counter() - start)
+    return {
+        "median_ms": statistics.median(timings) * 1000,
+        "min_ms": min(timings) * 1000,
+        "bytes": len(body),
+    }
+
+
+def run(rounds_list, clients: int, repeat: int) -> list:
+    from core.responses import ORJSON_AVAILABLE
+    from core.utils import clean_for_json
+
+    results = []
+    for rounds in rounds_list:
+        payload = build_history(rounds, clients)
+        # Both encoders must agree on the document they produce
+        assert json.loads(_legacy(payload)) == json.loads(_fast(payload))
+        row = {"case": f"history/rounds={rounds}", "rounds": rounds, "clients": clients,
+               "orjson": ORJSON_AVAILABLE}
+        for name, fn in ENCODERS.items():
+            row[name] = time_encoder(fn, payload, repeat)
+        row["clean_for_json"] = time_call(lambda: clean_for_json(payload), repeat=repeat)
+        row["speedup"] = row["legacy"]["median_ms"] / row["fast"]["median_ms"]
+        print(f"  {rounds:>7,} rounds  legacy {row['legacy']['median_ms']:9.2f} ms  "
+              f"fast {row['fast']['median_ms']:8.2f} ms  x{row['speedup']:.1f}", file=sys.stderr)
+        results.append(row)
+    return results
+
+
+def bench(quick: bool = False) -> list:
+    return run([100, 1_000] if quick else [100, 1_000, 10_000], clients=10, repeat=5)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, nargs="+", default=[100, 1_000, 10_000])
+    parser.add_argument("--clients", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    results = run(args.rounds, args.clients, args.repeat)
+    write_report({"benchmark": "json_serialization", "environment": environment(), "results": results},
+                 args.output)
+
+
+if __name__ == "__main__":
+    main()
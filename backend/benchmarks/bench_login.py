@@ -0,0 +1,106 @@
+"""
+Benchmark: admin login throughput.
+
+    verify_password   the bcrypt check every login pays (no database needed)
+    access_token      creating the access + refresh token pair
+    login             POST /api/auth/login end to end with `concurrency`
+                      requests in flight (needs DATABASE_URL)
+
+The login case registers a throwaway admin user, logs in with it
+`--logins` times and deletes it afterwards. Without DATABASE_URL it is
+reported as skipped.
+
+Run from backend/:
+    python -m benchmarks.bench_login --logins 200 --concurrency 1 8 32 --output login.json
+"""
+
+import argparse
+import asyncio
+import uuid
+
+from benchmarks.harness import (asgi_client, environment, load_admin_app, log, throughput, time_call,
+                                write_report)
+
+PASSWORD = "bench-password-123"
+
+
+def bench_crypto(repeat: int) -> list:
+    from auth.jwt_handler import create_access_token, create_refresh_token
+    from auth.utils import hash_password, verify_password
+
+    hashed = hash_password(PASSWORD)
+    token_data = {"sub": str(uuid.uuid4()), "email": "bench@example.com", "full_name": None, "role": "admin"}
+    results = []
+    for name, fn in (("verify_password", lambda: verify_password(PASSWORD, hashed)),
+                     ("access_token", lambda: (create_access_token(token_data), create_refresh_token(token_data)))):
+        stats = {"case": f"login/{name}", **time_call(fn, repeat=repeat)}
+        stats["per_second"] = 1000 / stats["median_ms"]
+        log(f"  {name:16s} {stats['median_ms']:8.2f} ms")
+        results.append(stats)
+    return results
+
+
+async def _bench_login(logins: int, concurrency_list) -> list:
+    from auth.database import acquire, close_pool, warm_pool
+    from auth.sign_in_buffer import start_sign_in_flusher, stop_sign_in_flusher
+
+    app = load_admin_app()
+    email = f"bench-{uuid.uuid4().hex[:12]}@example.com"
+    credentials = {"email": email, "password": PASSWORD}
+    results = []
+
+    await warm_pool()
+    start_sign_in_flusher()
+    try:
+        async with asgi_client(app) as http:
+            response = await http.post("/api/auth/register", json={**credentials, "full_name": "Benchmark"})
+            response.raise_for_status()
+
+            async def login():
+                response = await http.post("/api/auth/login", json=credentials)
+                response.raise_for_status()
+
+            for concurrency in concurrency_list:
+                stats = await throughput(login, logins, concurrency)
+                stats["case"] = f"login/http/concurrency={concurrency}"
+                log(f"  login x{concurrency:<3}       {stats['per_second']:8.1f} logins/s  "
+                    f"p95 {stats['p95_ms']:.1f} ms")
+                results.append(stats)
+    finally:
+        await stop_sign_in_flusher()
+        async with acquire() as conn:
+            await conn.execute("DELETE FROM admin_users WHERE email = $1", email)
+        await close_pool()
+    return results
+
+
+def run(logins: int, concurrency_list, repeat: int) -> list:
+    from config import settings
+
+    results = bench_crypto(repeat)
+    if not settings.DATABASE_URL:
+        log("  login over HTTP skipped: DATABASE_URL is not set")
+        results.append({"case": "login/http", "skipped": "DATABASE_URL is not set"})
+        return results
+    results.extend(asyncio.run(_bench_login(logins, concurrency_list)))
+    return results
+
+
+def bench(quick: bool = False) -> list:
+    return run(50 if quick else 200, [1, 8] if quick else [1, 8, 32], repeat=10)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--output", help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    results = run(args.logins, args.concurrency, args.repeat)
+    write_report({"benchmark": "login", "environment": environment(), "results": results}, args.output)
+
+
+if __name__ == "__main__":
+    main()
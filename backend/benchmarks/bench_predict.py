@@ -0,0 +1,105 @@
+"""
+Benchmark: single vs batch prediction through the admin API.
+
+Sends readings sampled from data/synthetic_dataset.csv to the admin app
+in-process (httpx ASGI transport, so the full middleware stack runs but no
+sockets are involved):
+
+    single  one POST /api/model/predict per reading, `concurrency` in flight
+    batch   POST /api/model/predict/batch with `batch_size` readings each
+
+and reports readings per second. Without TensorFlow both endpoints return
+simulated predictions; the report's "simulated" flag says which was measured.
+
+Run from backend/:
+    python -m benchmarks.bench_predict --readings 2000 --batch-sizes 100 1000 --output predict.json
+"""
+
+import argparse
+import asyncio
+import itertools
+import os
+
+from benchmarks.harness import (BACKEND_DIR, asgi_client, environment, load_admin_app, log, throughput,
+                                write_report)
+
+BASE_DATA = os.path.join(BACKEND_DIR, "data", "synthetic_dataset.csv")
+
+INPUT_COLUMNS = [
+    'pressure_bar', 'flow_rate_L_min', 'total_volume_L', 'tds_ppm', 'ph', 'temperature_C',
+    'signal_strength_dBm', 'pressure_status', 'tds_status', 'ph_status', 'wifi_status', 'sensor_status',
+]
+
+
+def sample_readings(n: int, seed: int = 42) -> list:
+    """n PredictionInput payloads resampled from the bundled dataset."""
+    import pandas as pd
+
+    df = pd.read_csv(BASE_DATA, usecols=INPUT_COLUMNS).dropna()
+    df = df.sample(n, replace=len(df) < n, random_state=seed)
+    for col in INPUT_COLUMNS[7:]:
+        df[col] = df[col].astype(str)
+    return df.to_dict(orient="records")
+
+
+async def _run(n_readings: int, batch_sizes, concurrency: int) -> list:
+    app = load_admin_app()
+    readings = sample_readings(n_readings)
+    results = []
+
+    async with asgi_client(app) as http:
+        probe = await http.post("/api/model/predict", json=readings[0])
+        probe.raise_for_status()
+        simulated = bool(probe.json().get("simulated"))
+
+        cursor = itertools.count()
+
+        async def single():
+            response = await http.post("/api/model/predict", json=readings[next(cursor) % n_readings])
+            response.raise_for_status()
+
+        stats = await throughput(single, n_readings, concurrency)
+        stats.update({"case": "predict/single", "readings_per_second": stats["per_second"],
+                      "simulated": simulated})
+        log(f"  single            {stats['readings_per_second']:10.0f} readings/s")
+        results.append(stats)
+
+        for batch_size in batch_sizes:
+            batches = [readings[i:i + batch_size] for i in range(0, n_readings, batch_size)]
+            batch_cursor = itertools.count()
+
+            async def batch():
+                body = {"readings": batches[next(batch_cursor) % len(batches)]}
+                response = await http.post("/api/model/predict/batch", json=body)
+                response.raise_for_status()
+
+            stats = await throughput(batch, len(batches), min(concurrency, len(batches)))
+            stats.update({"case": f"predict/batch={batch_size}", "batch_size": batch_size,
+                          "readings_per_second": stats["per_second"] * n_readings / len(batches), "simulated": simulated})
+            log(f"  batch {batch_size:>6}      {stats['readings_per_second']:10.0f} readings/s")
+            results.append(stats)
+    return results
+
+
+def run(n_readings: int, batch_sizes, concurrency: int) -> list:
+    return asyncio.run(_run(n_readings, batch_sizes, concurrency))
+
+
+def bench(quick: bool = False) -> list:
+    return run(500 if quick else 5_000, [100, 1_000], concurrency=8)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readings", type=int, default=5_000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[100, 1_000])
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--output", help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    results = run(args.readings, args.batch_sizes, args.concurrency)
+    write_report({"benchmark": "predict", "environment": environment(), "results": results}, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark: training data preparation and labeling.
+
+    load_and_prepare_data  end-to-end (stream, scale, encode, partition) on
+                           CSVs of the requested sizes resampled from
+                           data/synthetic_dataset.csv
+    create_target          the row-wise labeler applied with DataFrame.apply
+                           vs compute_unsafe, its vectorized equivalent
+
+Run from backend/:
+    python -m benchmarks.bench_prepare --rows 100000 1000000 --output prepare.json
+"""
+
+import argparse
+import os
+import tempfile
+
+from benchmarks.bench_columnar import generate_csv
+from benchmarks.harness import environment, log, time_call, write_report
+
+QUICK_ROWS = [10_000, 100_000]
+FULL_ROWS = [100_000, 1_000_000]
+
+# DataFrame.apply(create_target) is slow enough that larger sizes only add minutes
+CREATE_TARGET_MAX_ROWS = 200_000
+
+
+def bench_prepare(rows: int, path: str, repeat: int) -> dict:
+    from core.utils import load_and_prepare_data
+
+    stats = {"case": f"load_and_prepare_data/rows={rows}", "rows": rows,
+             **time_call(lambda: load_and_prepare_data(path, num_clients=5), repeat=repeat)}
+    stats["rows_per_second"] = rows / (stats["median_ms"] / 1000)
+    log(f"  load_and_prepare_data {rows:>10,} rows  {stats['median_ms']:9.1f} ms")
+    return stats
+
+
+def bench_labeling(rows: int, path: str, repeat: int) -> list:
+    import numpy as np
+    import pandas as pd
+    from core.preprocessing import compute_unsafe
+    from core.utils import create_target
+
+    df = pd.read_csv(path)
+    sample = df.iloc[:10_000]
+    assert np.array_equal(sample.apply(create_target, axis=1).to_numpy(), compute_unsafe(sample))
+
+    cases = []
+    for name, fn in (("create_target", lambda: df.apply(create_target, axis=1)),
+                     ("compute_unsafe", lambda: compute_unsafe(df))):
+        if name == "create_target" and rows > CREATE_TARGET_MAX_ROWS:
+            continue
+        stats = {"case": f"{name}/rows={rows}", "rows": rows, **time_call(fn, repeat=repeat)}
+        stats["rows_per_second"] = rows / (stats["median_ms"] / 1000)
+        log(f"  {name:21s} {rows:>10,} rows  {stats['median_ms']:9.1f} ms")
+        cases.append(stats)
+    return cases
+
+
+def run(rows_list, repeat: int, workdir=None) -> list:
+    results = []
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        for rows in rows_list:
+            path = os.path.join(tmp, f"readings_{rows}.csv")
+            log(f"Generating {rows:,} rows...")
+            generate_csv(path, rows)
+            results.append(bench_prepare(rows, path, repeat))
+            results.extend(bench_labeling(rows, path, repeat))
+    return results
+
+
+def bench(quick: bool = False) -> list:
+    return run(QUICK_ROWS if quick else FULL_ROWS, repeat=3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=FULL_ROWS)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--workdir", help="Directory for generated datasets (default: temp dir)")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.repeat, args.workdir)
+    write_report({"benchmark": "prepare", "environment": environment(), "results": results}, args.output)
+
+
+if __name__ == "__main__":
+    main()
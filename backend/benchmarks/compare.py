@@ -0,0 +1,90 @@
+"""
+Compare two benchmark reports (run_all output or a single suite's output).
+
+Cases are matched by suite and "case" name. Timing fields (*_ms, lower is
+better) and rates (*per_second, higher is better) are compared; changes
+beyond --threshold are flagged as regressions or improvements.
+
+    python -m benchmarks.compare baseline.json candidate.json --threshold 0.10
+
+Exits with status 1 when a regression was found, so it can gate CI.
+"""
+
+import argparse
+import json
+import sys
+from typing import Dict, Tuple
+
+
+def _cases(report: dict) -> Dict[Tuple[str, str], dict]:
+    if "suites" in report:
+        suites = {name: suite.get("results", []) for name, suite in report["suites"].items()}
+    else:
+        suites = {report.get("benchmark", "results"): report.get("results", [])}
+    return {(suite, case["case"]): case for suite, cases in suites.items() for case in cases if "case" in case}
+
+
+def _metrics(case: dict, prefix: str = "") -> Dict[str, float]:
+    """Comparable numeric fields, nested ones flattened as parent.child."""
+    metrics = {}
+    for key, value in case.items():
+        if isinstance(value, dict):
+            metrics.update(_metrics(value, f"{prefix}{key}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            if key.endswith("_ms") or key.endswith("per_second"):
+                metrics[prefix + key] = float(value)
+    return metrics
+
+
+def compare(baseline: dict, candidate: dict, threshold: float, metric_filter: str = "median_ms"):
+    """Rows of (suite, case, metric, old, new, change, verdict)."""
+    old_cases, new_cases = _cases(baseline), _cases(candidate)
+    rows = []
+    for key in sorted(old_cases.keys() & new_cases.keys()):
+        old_metrics, new_metrics = _metrics(old_cases[key]), _metrics(new_cases[key])
+        for metric in sorted(old_metrics.keys() & new_metrics.keys()):
+            if not (metric.endswith(metric_filter) or metric.endswith("per_second")):
+                continue
+            old, new = old_metrics[metric], new_metrics[metric]
+            if old <= 0:
+                continue
+            change = (new - old) / old
+            worse = change > threshold if metric.endswith("_ms") else change < -threshold
+            better = change < -threshold if metric.endswith("_ms") else change > threshold
+            rows.append((*key, metric, old, new, change,
+                         "REGRESSION" if worse else "improved" if better else ""))
+    return rows, sorted(old_cases.keys() - new_cases.keys()), sorted(new_cases.keys() - old_cases.keys())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change to flag (default 0.10)")
+    parser.add_argument("--metric", default="median_ms", help="Timing field to compare (default median_ms)")
+    args = parser.parse_args()
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.candidate) as f:
+        candidate = json.load(f)
+
+    rows, removed, added = compare(baseline, candidate, args.threshold, args.metric)
+    for env_name, report in (("baseline", baseline), ("candidate", candidate)):
+        commit = report.get("environment", {}).get("commit")
+        print(f"{env_name:9s} {commit or '(unknown commit)'}")
+    print()
+    for suite, case, metric, old, new, change, verdict in rows:
+        print(f"{suite:8s} {case:48s} {metric:28s} {old:12.3f} -> {new:12.3f} {change:+7.1%}  {verdict}")
+    for suite, case in removed:
+        print(f"{suite:8s} {case:48s} only in baseline")
+    for suite, case in added:
+        print(f"{suite:8s} {case:48s} only in candidate")
+
+    regressions = sum(1 for row in rows if row[-1] == "REGRESSION")
+    print(f"\n{len(rows)} comparisons, {regressions} regressions (threshold {args.threshold:.0%})")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
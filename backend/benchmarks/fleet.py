@@ -0,0 +1,271 @@
+"""
+Simulated fleet of client servers.
+
+Starts N client/server.py clients, each with its own ID, port and dataset,
+in this process (one event loop on a background thread) or spread over a
+pool of worker processes. With --tenants-per-port K, K clients share each
+port as tenants of one multi-tenant client app (under /clients/<id>/).
+Every server is wrapped in FaultInjectionMiddleware, which adds latency with
+jitter and fails a share of requests, to mimic devices on real networks.
+
+Serve a fleet until Ctrl-C (then register it with a running admin yourself,
+or use benchmarks.loadtest which does both):
+
+    python -m benchmarks.fleet --clients 20 --base-port 6001 --processes 4 \\
+        --latency-ms 20 --jitter-ms 10 --failure-rate 0.02
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import threading
+import time
+from typing import Dict, List, Optional
+
+from benchmarks.harness import BACKEND_DIR, log
+
+CLIENT_SERVER_PATH = os.path.join(BACKEND_DIR, "client", "server.py")
+DEFAULT_DATASET = os.path.join(BACKEND_DIR, "data", "synthetic_dataset.csv")
+
+
+def client_specs(n_clients: int, base_port: int = 6001, id_prefix: str = "sim",
+                 datasets: Optional[List[str]] = None, host: str = "127.0.0.1",
+                 tenants_per_port: int = 1) -> List[Dict]:
+    """
+    One spec per client: id, host, port, base_path and dataset (datasets are
+    assigned round-robin). With tenants_per_port > 1, consecutive clients
+    share a port and are told apart by base path.
+    """
+    datasets = datasets or [DEFAULT_DATASET]
+    specs = []
+    for i in range(n_clients):
+        client_id = f"{id_prefix}_{i + 1}"
+        specs.append({"id": client_id, "host": host, "port": base_port + i // tenants_per_port,
+                      "base_path": f"/clients/{client_id}" if tenants_per_port > 1 else "",
+                      "dataset": os.path.abspath(datasets[i % len(datasets)])})
+    return specs
+
+
+def _by_port(specs: List[Dict]) -> List[List[Dict]]:
+    return [list(group) for _, group in itertools.groupby(specs, key=lambda s: (s["host"], s["port"]))]
+
+
+class FaultInjectionMiddleware:
+    """
+    ASGI middleware delaying each request by latency_ms +/- jitter_ms
+    (uniform) and answering failure_rate of them with 503.
+    """
+
+    def __init__(self, app, latency_ms: float = 0.0, jitter_ms: float = 0.0, failure_rate: float = 0.0,
+                 seed: Optional[int] = None):
+        self.app = app
+        self.latency = latency_ms / 1000.0
+        self.jitter = jitter_ms / 1000.0
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        delay = self.latency + (self.random.uniform(-self.jitter, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if self.failure_rate and self.random.random() < self.failure_rate:
+            body = json.dumps({"detail": "Injected failure"}).encode()
+            await send({"type": "http.response.start", "status": 503,
+                        "headers": [(b"content-type", b"application/json"),
+                                    (b"content-length", str(len(body)).encode())]})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        await self.app(scope, receive, send)
+
+
+_client_server = None
+
+
+def load_client_app(specs: List[Dict]):
+    """
+    A client/server.py app serving specs, which share one host and port: a
+    plain client app for a single spec at the root, a multi-tenant app
+    otherwise. Apps in one process share loaded datasets.
+    """
+    global _client_server
+    if _client_server is None:
+        module_spec = importlib.util.spec_from_file_location("fleet_client_server", CLIENT_SERVER_PATH)
+        _client_server = importlib.util.module_from_spec(module_spec)
+        module_spec.loader.exec_module(_client_server)
+    first = specs[0]
+    if len(specs) == 1 and not first.get("base_path"):
+        return _client_server.create_client_app(first["id"], first["port"], first["dataset"])
+    tenants = [{"id": s["id"], "data_file": s["dataset"]} for s in specs]
+    return _client_server.create_client_app(port=first["port"], tenants=tenants)
+
+
+async def serve_clients(specs: List[Dict], faults: Dict, should_stop):
+    """Run one uvicorn server per port in specs on the current loop until should_stop() is true."""
+    import uvicorn
+
+    servers = []
+    for group in _by_port(specs):
+        spec = group[0]
+        app = FaultInjectionMiddleware(load_client_app(group), seed=faults.get("seed", 0) + spec["port"],
+                                       **{k: v for k, v in faults.items() if k != "seed"})
+        config = uvicorn.Config(app, host=spec["host"], port=spec["port"], log_level="warning",
+                                access_log=False)
+        servers.append(uvicorn.Server(config))
+
+    tasks = [asyncio.ensure_future(server.serve()) for server in servers]
+    while not should_stop():
+        if any(task.done() for task in tasks):
+            break
+        await asyncio.sleep(0.1)
+    for server in servers:
+        server.should_exit = True
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def _process_main(specs: List[Dict], faults: Dict, stop_event):
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    asyncio.run(serve_clients(specs, faults, stop_event.is_set))
+
+
+class Fleet:
+    """
+    Context manager running client servers for specs.
+
+    processes=0 serves every client from a background thread of this
+    process; processes=P splits them across P worker processes so they don't
+    share one interpreter (and GIL) with the load generator.
+    """
+
+    def __init__(self, specs: List[Dict], processes: int = 0, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 failure_rate: float = 0.0, seed: int = 0, startup_timeout: float = 120.0):
+        self.specs = specs
+        self.processes = processes
+        self.faults = {"latency_ms": latency_ms, "jitter_ms": jitter_ms, "failure_rate": failure_rate,
+                       "seed": seed}
+        self.startup_timeout = startup_timeout
+        self._stop = None
+        self._workers = []
+
+    @property
+    def clients(self) -> List[Dict]:
+        """Registration payloads for the admin's POST /api/clients."""
+        return [{"id": s["id"], "ip": s["host"], "port": s["port"], "base_path": s.get("base_path", "")}
+                for s in self.specs]
+
+    def __enter__(self):
+        os.environ.setdefault("LOG_LEVEL", "WARNING")
+        if self.processes:
+            context = multiprocessing.get_context("spawn")
+            self._stop = context.Event()
+            # Tenants sharing a port must be served by the same process
+            groups = _by_port(self.specs)
+            for i in range(self.processes):
+                chunk = [spec for group in groups[i::self.processes] for spec in group]
+                if chunk:
+                    worker = context.Process(target=_process_main, args=(chunk, self.faults, self._stop),
+                                             name=f"fleet-{i}", daemon=True)
+                    worker.start()
+                    self._workers.append(worker)
+        else:
+            self._stop = threading.Event()
+            worker = threading.Thread(
+                target=lambda: asyncio.run(serve_clients(self.specs, self.faults, self._stop.is_set)),
+                name="fleet", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+        try:
+            self.wait_ready()
+        except BaseException:
+            self.__exit__(None, None, None)
+            raise
+        return self
+
+    def wait_ready(self):
+        """Block until every client answers /api/health (retrying through injected failures)."""
+        import httpx
+
+        deadline = time.monotonic() + self.startup_timeout
+        pending = list(self.specs)
+        with httpx.Client(timeout=5.0) as http:
+            while pending:
+                if time.monotonic() > deadline:
+                    raise RuntimeError(f"{len(pending)} fleet clients did not start, e.g. {pending[0]['id']}")
+                if not any(w.is_alive() for w in self._workers):
+                    raise RuntimeError("Fleet workers exited during startup (port in use?)")
+                still_pending = []
+                for spec in pending:
+                    try:
+                        response = http.get(f"http://{spec['host']}:{spec['port']}{spec.get('base_path', '')}/api/health")
+                        if response.status_code != 200 or not response.json().get("data_loaded"):
+                            still_pending.append(spec)
+                    except httpx.HTTPError:
+                        still_pending.append(spec)
+                pending = still_pending
+                if pending:
+                    time.sleep(0.2)
+
+    def __exit__(self, *exc):
+        if self._stop is not None:
+            self._stop.set()
+        for worker in self._workers:
+            worker.join(timeout=30)
+            if isinstance(worker, multiprocessing.process.BaseProcess) and worker.is_alive():
+                worker.terminate()
+        self._workers = []
+        return False
+
+
+def add_fleet_arguments(parser: argparse.ArgumentParser):
+    group = parser.add_argument_group("fleet")
+    group.add_argument("--clients", type=int, default=10, help="Number of client servers")
+    group.add_argument("--base-port", type=int, default=6001, help="Port of the first client; others follow")
+    group.add_argument("--host", default="127.0.0.1", help="Interface the clients listen on")
+    group.add_argument("--id-prefix", default="sim", help="Client IDs are <prefix>_1 .. <prefix>_N")
+    group.add_argument("--datasets", nargs="+", help="Dataset files assigned round-robin (default: bundled CSV)")
+    group.add_argument("--tenants-per-port", type=int, default=1,
+                       help="Clients hosted by each multi-tenant client server (1 = one server per client)")
+    group.add_argument("--processes", type=int, default=0,
+                       help="Worker processes to spread clients over (0 = background thread here)")
+    group.add_argument("--latency-ms", type=float, default=0.0, help="Injected latency per request")
+    group.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform +/- jitter on the latency")
+    group.add_argument("--failure-rate", type=float, default=0.0, help="Share of requests answered with 503")
+    group.add_argument("--seed", type=int, default=0)
+
+
+def fleet_from_args(args) -> Fleet:
+    specs = client_specs(args.clients, args.base_port, args.id_prefix, args.datasets, args.host,
+                         args.tenants_per_port)
+    return Fleet(specs, processes=args.processes, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                 failure_rate=args.failure_rate, seed=args.seed)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_fleet_arguments(parser)
+    args = parser.parse_args()
+
+    with fleet_from_args(args) as fleet:
+        log(f"{len(fleet.specs)} clients ready:")
+        for client in fleet.clients:
+            log(f"  {client['id']:12s} http://{client['ip']}:{client['port']}{client['base_path']}")
+        log("Ctrl-C to stop")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
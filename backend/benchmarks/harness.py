@@ -0,0 +1,149 @@
+"""
+Shared helpers for the benchmark suites.
+
+Every suite module exposes `bench(quick: bool) -> list` returning cases of the
+form {"case": "<unique name>", "median_ms": ..., ...}. run_all collects them
+into one JSON report stamped with the git commit and environment, and compare
+diffs two reports case by case.
+"""
+
+import asyncio
+import importlib.util
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+REPORT_FORMAT = 1
+
+
+def summarize(timings: List[float]) -> Dict[str, float]:
+    """Median/min/p95/mean of wall times (seconds) in milliseconds."""
+    ordered = sorted(timings)
+    p95 = ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+    return {
+        "median_ms": statistics.median(ordered) * 1000,
+        "min_ms": ordered[0] * 1000,
+        "p95_ms": p95 * 1000,
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "repeat": len(ordered),
+    }
+
+
+def time_call(fn: Callable, repeat: int = 5, warmup: int = 1) -> Dict[str, float]:
+    """Time fn() `repeat` times after `warmup` untimed calls."""
+    for _ in range(warmup):
+        fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return summarize(timings)
+
+
+async def time_async(fn: Callable, repeat: int = 5, warmup: int = 1) -> Dict[str, float]:
+    """time_call for a coroutine function."""
+    for _ in range(warmup):
+        await fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await fn()
+        timings.append(time.perf_counter() - start)
+    return summarize(timings)
+
+
+async def throughput(fn: Callable, total: int, concurrency: int) -> Dict[str, float]:
+    """
+    Run `total` calls of coroutine function fn with `concurrency` in flight;
+    returns calls per second and per-call latency.
+    """
+    latencies: List[float] = []
+    remaining = iter(range(total))
+
+    async def worker():
+        for _ in remaining:
+            start = time.perf_counter()
+            await fn()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    result = summarize(latencies)
+    result.update({"total": total, "concurrency": concurrency, "per_second": total / elapsed})
+    return result
+
+
+def git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(["git", "rev-parse", "HEAD"], cwd=BACKEND_DIR,
+                             capture_output=True, text=True, check=True)
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=BACKEND_DIR,
+                               capture_output=True, text=True, check=True).stdout.strip()
+        return out.stdout.strip() + ("-dirty" if dirty else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment() -> Dict[str, object]:
+    """Where the numbers came from: commit, interpreter, machine and key package versions."""
+    versions = {}
+    for name in ("numpy", "pandas", "fastapi", "orjson", "tensorflow"):
+        try:
+            versions[name] = __import__(name).__version__
+        except ImportError:
+            versions[name] = None
+    return {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "packages": versions,
+    }
+
+
+def write_report(report: dict, output: Optional[str]):
+    """Print the report and optionally write it to `output`."""
+    text = json.dumps(report, indent=2)
+    if output:
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        with open(output, "w") as f:
+            f.write(text)
+    print(text)
+
+
+def log(message: str):
+    """Progress output (stderr, so stdout stays valid JSON)."""
+    print(message, file=sys.stderr)
+
+
+_admin_app = None
+
+
+def load_admin_app():
+    """The admin server's FastAPI app (admin/server.py), imported once."""
+    global _admin_app
+    if _admin_app is None:
+        # Keep per-request log lines (httpx, access logs) out of the measurements
+        os.environ.setdefault("LOG_LEVEL", "WARNING")
+        path = os.path.join(BACKEND_DIR, "admin", "server.py")
+        spec = importlib.util.spec_from_file_location("admin_server", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _admin_app = module.app
+    return _admin_app
+
+
+def asgi_client(app, **kwargs):
+    """An httpx.AsyncClient calling `app` in-process (no sockets)."""
+    import httpx
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", **kwargs)
@@ -0,0 +1,205 @@
+"""
+Load test: a simulated client fleet behind the admin API.
+
+Starts a fleet (benchmarks.fleet), registers every client with the admin
+(POST /api/clients), drives a load profile against the admin APIs for a
+fixed duration and reports per-endpoint throughput, errors and latency
+percentiles. Clients are unregistered afterwards.
+
+The admin is the in-process app by default (httpx ASGI transport), or a
+running server given with --admin-url; the admin always reaches the clients
+over real HTTP.
+
+    python -m benchmarks.loadtest --clients 20 --processes 4 --latency-ms 20 --jitter-ms 10 \\
+        --failure-rate 0.02 --profile dashboard --duration 30 --concurrency 16 --output load.json
+
+With --rate the load is open-loop: requests are scheduled at a fixed rate
+and latency is measured from the scheduled start, so a slow admin shows up
+as queueing in the tail instead of as fewer requests.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from benchmarks.fleet import add_fleet_arguments, fleet_from_args
+from benchmarks.harness import asgi_client, environment, load_admin_app, log, write_report
+
+# (method, path, weight); bodies for POSTs come from _request_body
+PROFILES = {
+    # What an open dashboard does: status polling plus periodic fan-outs
+    "dashboard": [
+        ("GET", "/api/training/status", 4),
+        ("GET", "/api/all-clients-data", 3),
+        ("GET", "/api/clients/health", 2),
+        ("GET", "/api/all-clients-metrics", 1),
+    ],
+    # Only the endpoints that call every client
+    "fanout": [
+        ("GET", "/api/all-clients-data", 1),
+        ("GET", "/api/clients/health", 1),
+        ("GET", "/api/all-clients-metrics", 1),
+    ],
+    "predict": [
+        ("POST", "/api/model/predict", 9),
+        ("POST", "/api/model/predict/batch", 1),
+    ],
+}
+
+
+def percentiles(latencies: List[float]) -> Dict[str, float]:
+    """p50/p90/p95/p99/max of latencies (seconds) in milliseconds."""
+    if not latencies:
+        return {}
+    ordered = sorted(latencies)
+
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000
+
+    return {"p50_ms": pick(0.50), "p90_ms": pick(0.90), "p95_ms": pick(0.95), "p99_ms": pick(0.99),
+            "max_ms": ordered[-1] * 1000}
+
+
+def _request_body(path: str, readings: List[dict], rng: random.Random) -> Optional[dict]:
+    if path == "/api/model/predict":
+        return rng.choice(readings)
+    if path == "/api/model/predict/batch":
+        return {"readings": rng.sample(readings, min(100, len(readings)))}
+    return None
+
+
+async def drive(http, profile: str, duration: float, concurrency: int, rate: Optional[float],
+                seed: int = 0) -> Dict:
+    """Run the profile for `duration` seconds; returns per-endpoint and total stats."""
+    endpoints = PROFILES[profile]
+    paths = [(method, path) for method, path, _ in endpoints]
+    weights = [weight for _, _, weight in endpoints]
+    readings = []
+    if any(path.startswith("/api/model/predict") for _, path in paths):
+        from benchmarks.bench_predict import sample_readings
+        readings = sample_readings(1_000, seed)
+
+    latencies = defaultdict(list)
+    counts = defaultdict(lambda: {"requests": 0, "errors": 0, "statuses": defaultdict(int)})
+    rng = random.Random(seed)
+    start = time.perf_counter()
+    end = start + duration
+    schedule = {"next": start}
+
+    async def worker():
+        while True:
+            if rate:
+                # Open loop: take the next slot in the global schedule
+                scheduled = schedule["next"]
+                schedule["next"] += 1.0 / rate
+                if scheduled >= end:
+                    return
+                delay = scheduled - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            else:
+                scheduled = time.perf_counter()
+                if scheduled >= end:
+                    return
+            method, path = rng.choices(paths, weights)[0]
+            body = _request_body(path, readings, rng)
+            stats = counts[path]
+            try:
+                response = await http.request(method, path, json=body)
+                status = response.status_code
+            except Exception as e:
+                status = type(e).__name__
+            latencies[path].append(time.perf_counter() - scheduled)
+            stats["requests"] += 1
+            stats["statuses"][str(status)] += 1
+            if not (isinstance(status, int) and 200 <= status < 300):
+                stats["errors"] += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    endpoints_report = {}
+    for path, stats in counts.items():
+        endpoints_report[path] = {
+            "requests": stats["requests"],
+            "errors": stats["errors"],
+            "statuses": dict(stats["statuses"]),
+            "per_second": stats["requests"] / elapsed,
+            **percentiles(latencies[path]),
+        }
+    all_latencies = [value for values in latencies.values() for value in values]
+    total_requests = sum(s["requests"] for s in counts.values())
+    return {
+        "seconds": elapsed,
+        "requests": total_requests,
+        "errors": sum(s["errors"] for s in counts.values()),
+        "per_second": total_requests / elapsed,
+        **percentiles(all_latencies),
+        "endpoints": endpoints_report,
+    }
+
+
+async def _run(args, fleet) -> Dict:
+    import httpx
+
+    if args.admin_url:
+        http = httpx.AsyncClient(base_url=args.admin_url, timeout=args.timeout)
+    else:
+        http = asgi_client(load_admin_app(), timeout=args.timeout)
+
+    async with http:
+        registered = []
+        for client in fleet.clients:
+            response = await http.post("/api/clients", json=client)
+            if response.status_code == 200:
+                registered.append(client["id"])
+            elif response.status_code != 409:
+                response.raise_for_status()
+        log(f"Registered {len(registered)} clients; running '{args.profile}' for {args.duration:g}s "
+            f"with {args.concurrency} workers" + (f" at {args.rate:g} req/s" if args.rate else ""))
+        try:
+            return await drive(http, args.profile, args.duration, args.concurrency, args.rate, args.seed)
+        finally:
+            for client_id in registered:
+                await http.delete(f"/api/clients/{client_id}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    add_fleet_arguments(parser)
+    load = parser.add_argument_group("load")
+    load.add_argument("--admin-url", help="Running admin server (default: in-process admin app)")
+    load.add_argument("--profile", choices=list(PROFILES), default="dashboard")
+    load.add_argument("--duration", type=float, default=30.0, help="Seconds of load")
+    load.add_argument("--concurrency", type=int, default=8, help="Requests in flight")
+    load.add_argument("--rate", type=float, help="Open-loop requests per second (default: closed loop)")
+    load.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    parser.add_argument("--output", help="Write JSON results to this file")
+    args = parser.parse_args()
+
+    with fleet_from_args(args) as fleet:
+        log(f"Fleet of {len(fleet.specs)} clients ready")
+        result = asyncio.run(_run(args, fleet))
+
+    for path, stats in sorted(result["endpoints"].items()):
+        log(f"  {path:28s} {stats['per_second']:8.1f} req/s  p50 {stats['p50_ms']:8.1f}  "
+            f"p99 {stats['p99_ms']:8.1f} ms  errors {stats['errors']}/{stats['requests']}")
+    report = {
+        "benchmark": "loadtest",
+        "environment": environment(),
+        "config": {
+            "clients": args.clients, "tenants_per_port": args.tenants_per_port, "processes": args.processes, "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms, "failure_rate": args.failure_rate, "profile": args.profile,
+            "duration": args.duration, "concurrency": args.concurrency, "rate": args.rate,
+            "admin": args.admin_url or "in-process",
+        },
+        "result": result,
+    }
+    write_report(report, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Run the benchmark suites and write one combined JSON report.
+
+    python -m benchmarks.run_all --output benchmarks/results/$(git rev-parse --short HEAD).json
+    python -m benchmarks.run_all --quick --suites prepare fedavg
+    python -m benchmarks.compare old.json new.json
+
+Suites: prepare (load_and_prepare_data, create_target), json (clean_for_json
+and response serialization), predict (single vs batch), fedavg, fanout
+(against local stub clients) and login. The report records the git commit
+and environment so results from different commits can be compared.
+"""
+
+import argparse
+import importlib
+import time
+import traceback
+
+from benchmarks.harness import REPORT_FORMAT, environment, log, write_report
+
+SUITES = {
+    "prepare": "benchmarks.bench_prepare",
+    "json": "benchmarks.bench_json",
+    "predict": "benchmarks.bench_predict",
+    "fedavg": "benchmarks.bench_fedavg",
+    "fanout": "benchmarks.bench_fanout",
+    "login": "benchmarks.bench_login",
+}
+
+
+def run(suites, quick: bool) -> dict:
+    report = {
+        "format": REPORT_FORMAT,
+        "quick": quick,
+        "started": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": environment(),
+        "suites": {},
+    }
+    for name in suites:
+        log(f"[{name}]")
+        start = time.perf_counter()
+        try:
+            results = importlib.import_module(SUITES[name]).bench(quick=quick)
+            report["suites"][name] = {"seconds": time.perf_counter() - start, "results": results}
+        except Exception as e:
+            traceback.print_exc()
+            report["suites"][name] = {"seconds": time.perf_counter() - start, "error": f"{type(e).__name__}: {e}"}
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--suites", nargs="+", choices=list(SUITES), default=list(SUITES))
+    parser.add_argument("--quick", action="store_true", help="Smaller sizes for a fast smoke run")
+    parser.add_argument("--output", help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    write_report(run(args.suites, args.quick), args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Local stub clients for benchmarks.
+
+StubFleet starts N minimal client servers on 127.0.0.1 (one uvicorn server
+per client on its own ephemeral port, all on one background event loop).
+Each serves the endpoints the admin fans out to (/api/health,
+/api/local-data, /api/model-metrics) with payloads shaped like the real
+client's, after an optional artificial latency.
+
+    with StubFleet(10, latency_ms=5) as fleet:
+        fleet.clients  # [{"id": "stub_1", "ip": "127.0.0.1", "port": ...}, ...]
+"""
+
+import asyncio
+import os
+import socket
+import threading
+from typing import List, Optional
+
+from benchmarks.harness import BACKEND_DIR
+
+BASE_DATA = os.path.join(BACKEND_DIR, "data", "synthetic_dataset.csv")
+
+
+def local_data_payload(client_id: str) -> dict:
+    """A /api/local-data response body like the real client's (10 latest readings)."""
+    import pandas as pd
+
+    df = pd.read_csv(BASE_DATA, nrows=500)
+    latest = df.tail(10).astype(object).fillna('').to_dict(orient='records')
+    return {
+        "client_id": client_id,
+        "total_records": len(df),
+        "latest_readings": latest,
+        "statistics": {
+            "avg_pressure": float(df['pressure_bar'].mean()),
+            "avg_flow_rate": float(df['flow_rate_L_min'].mean()),
+            "avg_tds": float(df['tds_ppm'].mean()),
+            "avg_ph": float(df['ph'].mean()),
+            "avg_temperature": float(df['temperature_C'].mean()),
+        },
+        "quality_distribution": {"safe": 400, "unsafe": 100, "unsafe_percentage": 20.0},
+    }
+
+
+def create_stub_app(client_id: str, port: int, latency_ms: float = 0.0, payload: Optional[dict] = None):
+    """A FastAPI app answering like client/server.py for the fan-out endpoints."""
+    from fastapi import FastAPI
+
+    app = FastAPI()
+    payload = dict(payload or local_data_payload(client_id), client_id=client_id)
+    delay = latency_ms / 1000.0
+
+    async def wait():
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    @app.get("/api/health")
+    async def health():
+        await wait()
+        return {"status": "online", "client_id": client_id, "port": port,
+                "data_loaded": True, "model_trained": False}
+
+    @app.get("/api/local-data")
+    async def local_data():
+        await wait()
+        return payload
+
+    @app.get("/api/model-metrics")
+    async def model_metrics():
+        await wait()
+        return {"client_id": client_id, "accuracy": 0.9, "precision": 0.88, "recall": 0.86,
+                "f1_score": 0.87, "last_trained": None}
+
+    return app
+
+
+class StubFleet:
+    """N stub client servers on ephemeral localhost ports, run on a background thread."""
+
+    def __init__(self, n_clients: int, latency_ms: float = 0.0):
+        self.n_clients = n_clients
+        self.latency_ms = latency_ms
+        self.clients: List[dict] = []
+        self._servers = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._started = threading.Event()
+
+    def __enter__(self):
+        import uvicorn
+
+        payload = local_data_payload("stub")
+        sockets = []
+        for i in range(self.n_clients):
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+            client_id = f"stub_{i + 1}"
+            app = create_stub_app(client_id, port, self.latency_ms, payload)
+            config = uvicorn.Config(app, log_level="warning", access_log=False, lifespan="off")
+            self._servers.append(uvicorn.Server(config))
+            sockets.append(sock)
+            self.clients.append({"id": client_id, "ip": "127.0.0.1", "port": port,
+                                 "status": "unknown", "last_seen": None})
+
+        def serve():
+            self._loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(self._loop)
+
+            async def main():
+                tasks = [asyncio.ensure_future(server.serve(sockets=[sock]))
+                         for server, sock in zip(self._servers, sockets)]
+                while not all(server.started for server in self._servers):
+                    await asyncio.sleep(0.01)
+                self._started.set()
+                await asyncio.gather(*tasks)
+
+            self._loop.run_until_complete(main())
+            self._loop.close()
+
+        self._thread = threading.Thread(target=serve, name="stub-fleet", daemon=True)
+        self._thread.start()
+        if not self._started.wait(timeout=30):
+            raise RuntimeError("Stub clients did not start")
+        return self
+
+    def __exit__(self, *exc):
+        for server in self._servers:
+            server.should_exit = True
+        self._thread.join(timeout=30)
+        return False
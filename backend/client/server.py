@@ -2,91 +2,95 @@
 Federated Learning Client Server (FastAPI)
 Run this on each client device/laptop to share local data and participate in federated learning.
 
-IMPORTANT: Change CLIENT_ID and CLIENT_PORT for each device!
-- Device 1: CLIENT_ID = "client_1", CLIENT_PORT = 5001
-- Device 2: CLIENT_ID = "client_2", CLIENT_PORT = 5002
-- Device 3: CLIENT_ID = "client_3", CLIENT_PORT = 5003
+Each client needs its own ID and port, and may have its own dataset. Set them
+with command-line options or environment variables (CLIENT_ID, CLIENT_PORT,
+CLIENT_DATA_FILE); the defaults are client_1 on port 5001:
+- Device 1: python server.py --id client_1 --port 5001
+- Device 2: python server.py --id client_2 --port 5002
+- Device 3: python server.py --id client_3 --port 5003 --data data/device_3.csv
 
-Run with: uvicorn server:app --host 0.0.0.0 --port 5001 --reload
-Or: python server.py
+Multi-tenant mode hosts many logical clients in one process, e.g. on a gateway
+serving several sensors. Each tenant is served under /clients/<id>/ and is
+registered with the admin using that base path:
+    python server.py --port 5001 --tenants sensor_1=data/a.csv,sensor_2=data/b.csv,sensor_3
+    CLIENT_TENANTS=tenants.json python server.py    # [{"id": ..., "data_file": ...}, ...]
+Tenants reading the same dataset share one loaded copy.
+
+Or: uvicorn server:app --host 0.0.0.0 --port 5001 --reload (configured from the environment)
 """
 
-from fastapi import FastAPI, HTTPException
+from fastapi import APIRouter, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
+import argparse
+from datetime import datetime
+import json
+import logging
 import numpy as np
 import pandas as pd
 from sklearn.preprocessing import StandardScaler
-from sklearn.model_selection import train_test_split
 import os
 import time
-import math
 import asyncio
+import sys
+
+# Add parent directory to path for shared imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.artifacts import local_manifest, sync_artifact
+from core.conditional import conditional_response, etag_for
+from core.datasets import CATEGORICAL_FEATURES, NUMERICAL_FEATURES, load_dataset
+from core.features import FeatureSpec
+from core.preprocessing import compute_unsafe
+from core.readings_log import ReadingsLog
+from core.responses import FastJSONResponse
+from core.summaries import ReadingsSummary
+from core.metrics import install_metrics
+from core.log import RequestIdMiddleware, configure_logging
 
 # ==================== CONFIGURATION ====================
-# CHANGE THESE FOR EACH CLIENT DEVICE
-CLIENT_ID = "client_1"  # Change to client_2, client_3, etc.
-CLIENT_PORT = 5001      # Change to 5002, 5003, etc.
-DATA_FILE = "data/synthetic_dataset.csv"  # Path to your local data file
+# Defaults for a single client; command-line options override these
+CLIENT_ID = os.getenv("CLIENT_ID", "client_1")                              # client_2, client_3, etc.
+CLIENT_PORT = int(os.getenv("CLIENT_PORT", "5001"))                         # 5002, 5003, etc.
+DATA_FILE = os.getenv("CLIENT_DATA_FILE", "data/synthetic_dataset.csv")     # Path to your local data file
+# Append-only logs of readings POSTed to /api/readings (<dir>/<client_id>.readings.log), replayed on startup
+READINGS_LOG_DIR = os.getenv("CLIENT_READINGS_LOG_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "readings")
+# Batching window before the fsync shared by concurrent ingestion requests
+READINGS_FSYNC_INTERVAL_MS = float(os.getenv("CLIENT_READINGS_FSYNC_MS", "10"))
+# Admin server the global model is fetched from, and where it is installed (shared by tenants)
+ADMIN_URL = os.getenv("CLIENT_ADMIN_URL", "http://localhost:5000")
+MODEL_FILE = os.getenv("CLIENT_MODEL_FILE") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "models", "global_model.h5")
+# Multi-tenant mode: JSON file or "id[=data_file],..." list (empty = single client)
+CLIENT_TENANTS = os.getenv("CLIENT_TENANTS", "")
+# Path prefix of each tenant in multi-tenant mode
+TENANT_PREFIX = "/clients"
+# Feature spec written by the admin server after training (shared column layout and scaling)
+FEATURE_SPEC_FILE = os.path.join(os.path.dirname(__file__), "..", "..", "water_quality_features.json")
 # =======================================================
 
-app = FastAPI(
-    title=f"Federated Learning Client - {CLIENT_ID}",
-    version="1.0.0",
-    description="Client server for federated learning"
-)
-
-# CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[
-        "http://localhost:5173",  # Vite dev server
-        "http://localhost:3000",  # Alternative dev port
-        "http://localhost:5000",  # Admin server
-        "https://smart-water-management-is.vercel.app",  # Production frontend
-    ],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-# ==================== Helper Functions ====================
-
-def clean_for_json(obj):
-    """Convert NaN and Inf values to None for JSON serialization"""
-    if isinstance(obj, dict):
-        return {k: clean_for_json(v) for k, v in obj.items()}
-    elif isinstance(obj, list):
-        return [clean_for_json(item) for item in obj]
-    elif isinstance(obj, float):
-        if math.isnan(obj) or math.isinf(obj):
-            return None
-        return obj
-    elif isinstance(obj, np.floating):
-        if np.isnan(obj) or np.isinf(obj):
-            return None
-        return float(obj)
-    elif isinstance(obj, np.integer):
-        return int(obj)
-    elif isinstance(obj, np.ndarray):
-        return clean_for_json(obj.tolist())
-    elif pd.isna(obj):
-        return None
-    return obj
-
-# Global variables
-local_data = None
-local_model = None
-scaler = None
-features = None
-model_metrics = {
-    "accuracy": 0.0,
-    "precision": 0.0,
-    "recall": 0.0,
-    "f1_score": 0.0,
-    "last_trained": None
+configure_logging()
+logger = logging.getLogger("client.server")
+
+CORS_ORIGINS = [
+    "http://localhost:5173",  # Vite dev server
+    "http://localhost:3000",  # Alternative dev port
+    "http://localhost:5000",  # Admin server
+    "https://smart-water-management-is.vercel.app",  # Production frontend
+]
+
+# Local-data statistics: dataset column -> response key
+STAT_COLUMNS = {
+    'pressure_bar': 'avg_pressure',
+    'flow_rate_L_min': 'avg_flow_rate',
+    'tds_ppm': 'avg_tds',
+    'ph': 'avg_ph',
+    'temperature_C': 'avg_temperature'
 }
+# Latest readings returned by /api/local-data
+LATEST_READINGS = 10
+# Largest batch accepted by POST /api/readings
+MAX_READINGS_BATCH = 10_000
 
 # ==================== Pydantic Models ====================
 
@@ -96,246 +100,572 @@ class TrainRequest(BaseModel):
 class WeightsUpdate(BaseModel):
     weights: Any
 
+class SensorReading(BaseModel):
+    timestamp: datetime
+    device_id: Optional[str] = None
+    pressure_bar: Optional[float] = None
+    pressure_status: Optional[str] = None
+    flow_rate_L_min: Optional[float] = None
+    total_volume_L: Optional[float] = None
+    tds_ppm: Optional[float] = None
+    tds_status: Optional[str] = None
+    ph: Optional[float] = None
+    ph_status: Optional[str] = None
+    temperature_C: Optional[float] = None
+    wifi_status: Optional[str] = None
+    signal_strength_dBm: Optional[float] = None
+    sensor_status: Optional[str] = None
+    alert: Optional[str] = None
+
+class ReadingsBatch(BaseModel):
+    readings: List[SensorReading] = Field(..., min_length=1, max_length=MAX_READINGS_BATCH)
+
+# ==================== Global model ====================
+
+_model_sync_lock = asyncio.Lock()
+# Version of the installed model; read from its manifest on first use
+_model_version: Optional[str] = None
+_model_version_loaded = False
+
+
+def installed_model_version() -> Optional[str]:
+    global _model_version, _model_version_loaded
+    if not _model_version_loaded:
+        _model_version = (local_manifest(MODEL_FILE) or {}).get("version")
+        _model_version_loaded = True
+    return _model_version
+
+
+async def sync_global_model() -> Dict[str, Any]:
+    """Fetch the admin's current model artifact if its version differs from the installed one."""
+    global _model_version
+    import httpx
+
+    async with _model_sync_lock:
+        async with httpx.AsyncClient(timeout=60.0) as http:
+            manifest = await sync_artifact(http, f"{ADMIN_URL}/api/model/artifacts/manifest", MODEL_FILE)
+        if manifest is not None:
+            _model_version = manifest["version"]
+    return {
+        "updated": manifest is not None,
+        "model_version": installed_model_version(),
+        "model_file": MODEL_FILE
+    }
+
+# ==================== Tenant configuration ====================
+
+def parse_tenants(value: str, default_data_file: str = DATA_FILE) -> List[Dict[str, str]]:
+    """
+    Tenants from a JSON file ([{"id": ..., "data_file": ...}]) or an
+    "id[=data_file],..." list; tenants without a data file use the default.
+    """
+    value = value.strip()
+    if not value:
+        return []
+    if os.path.isfile(value):
+        with open(value) as f:
+            entries = json.load(f)
+        tenants = [{"id": str(e["id"]), "data_file": e.get("data_file") or default_data_file} for e in entries]
+    else:
+        tenants = []
+        for item in value.split(","):
+            item = item.strip()
+            if not item:
+                continue
+            client_id, _, data_file = item.partition("=")
+            tenants.append({"id": client_id.strip(), "data_file": data_file.strip() or default_data_file})
+    ids = [t["id"] for t in tenants]
+    if len(set(ids)) != len(ids):
+        raise ValueError(f"Duplicate tenant IDs in {value!r}")
+    return tenants
+
 # ==================== Data Loading ====================
 
-def load_local_data():
-    """Load and preprocess local dataset"""
-    global local_data, scaler, features
-    
+# Loaded datasets by resolved path, shared by tenants that read the same file
+_datasets: Dict[str, Dict[str, Any]] = {}
+
+
+def _resolve_data_path(data_file: str) -> Optional[str]:
     # Try multiple possible data file locations
     possible_paths = [
-        DATA_FILE,
+        data_file,
+        os.path.join(os.path.dirname(__file__), "..", data_file),
         "synthetic_dataset.csv",
         os.path.join(os.path.dirname(__file__), "..", "data", "synthetic_dataset.csv"),
         os.path.join(os.path.dirname(__file__), "data", "synthetic_dataset.csv"),
     ]
-    
-    data_path = None
     for path in possible_paths:
         if os.path.exists(path):
-            data_path = path
-            break
-    
+            return os.path.abspath(path)
+    logger.warning("No data file found. Searched paths: %s", possible_paths)
+    return None
+
+
+def load_data_file(data_file: str) -> Optional[Dict[str, Any]]:
+    """Load and preprocess a dataset, or return the copy already loaded in this process."""
+    data_path = _resolve_data_path(data_file)
     if data_path is None:
-        print(f"Warning: No data file found. Searched paths: {possible_paths}")
         return None
-    
-    print(f"Loading data from: {data_path}")
-    df = pd.read_csv(data_path)
-    
+    if data_path in _datasets:
+        return _datasets[data_path]
+
+    logger.info("Loading data from: %s", data_path)
+    # Column names are normalized to the canonical schema; uses the columnar
+    # copy (data/<name>.cols) when one is up to date
+    df = load_dataset(data_path)
+
     # Create target variable
-    def create_target(row):
-        if pd.notna(row.get('alert')):
-            return 1
-        if row.get('pressure_status') in ['High', 'Low']:
-            return 1
-        if row.get('tds_status') == 'Poor':
-            return 1
-        if row.get('ph_status') in ['Acidic', 'Alkaline']:
-            return 1
-        if row.get('sensor_status') == 'Fault':
-            return 1
-        return 0
-    
-    df['unsafe'] = df.apply(create_target, axis=1)
-    
-    # Define columns
-    numerical_cols = ['pressure_bar', 'flow_rate_L_min', 'total_volume_L', 
-                     'tds_ppm', 'ph', 'temperature_C', 'signal_strength_dBm']
-    categorical_cols = ['pressure_status', 'tds_status', 'ph_status', 
-                       'wifi_status', 'sensor_status']
-    
-    # Scale numerical features
-    scaler = StandardScaler()
-    df_scaled = df.copy()
-    
-    existing_numerical = [c for c in numerical_cols if c in df.columns]
-    if existing_numerical:
-        df_scaled[existing_numerical] = scaler.fit_transform(df[existing_numerical])
-    
-    existing_categorical = [c for c in categorical_cols if c in df.columns]
-    if existing_categorical:
-        df_encoded = pd.get_dummies(df_scaled, columns=existing_categorical, drop_first=True)
+    df['unsafe'] = compute_unsafe(df)
+
+    # Encode with the global feature spec when available so local vectors match
+    # the global model's input layout; otherwise fit scaling on local data
+    if os.path.exists(FEATURE_SPEC_FILE):
+        feature_spec = FeatureSpec.load(FEATURE_SPEC_FILE)
     else:
-        df_encoded = df_scaled
-    
-    feature_cols = existing_numerical + [col for col in df_encoded.columns 
-                                         if any(col.startswith(c) for c in categorical_cols)]
-    features = [f for f in feature_cols if f in df_encoded.columns]
-    
-    X = df_encoded[features].values.astype(np.float32)
-    y = df_encoded['unsafe'].values.astype(np.float32)
-    
-    local_data = {
+        numeric = df.reindex(columns=NUMERICAL_FEATURES).to_numpy(np.float64)
+        feature_spec = FeatureSpec.default().with_scaler(StandardScaler().fit(numeric))
+    features = feature_spec.features
+
+    X = feature_spec.encode_columns({c: df[c].values for c in NUMERICAL_FEATURES + CATEGORICAL_FEATURES if c in df.columns})
+    y = df['unsafe'].values.astype(np.float32)
+
+    _datasets[data_path] = {
         "X": X,
         "y": y,
         "df": df,
-        "features": features
+        "features": features,
+        "feature_spec": feature_spec,
+        "path": data_path,
+        # Running statistics and latest readings served by /api/local-data
+        "summary": ReadingsSummary.from_frame(df, [c for c in STAT_COLUMNS if c in df.columns], LATEST_READINGS)
     }
-    
-    return local_data
+    return _datasets[data_path]
 
-# ==================== API Endpoints ====================
 
-@app.get("/api/health")
-async def health_check():
-    """Client health check"""
+def empty_dataset() -> Dict[str, Any]:
+    """Placeholder dataset for a client that only receives live readings."""
+    feature_spec = FeatureSpec.load(FEATURE_SPEC_FILE) if os.path.exists(FEATURE_SPEC_FILE) else FeatureSpec.default()
     return {
-        "status": "online",
-        "client_id": CLIENT_ID,
-        "port": CLIENT_PORT,
-        "data_loaded": local_data is not None,
-        "model_trained": model_metrics['last_trained'] is not None
+        "X": np.empty((0, feature_spec.n_features), dtype=np.float32),
+        "y": np.empty(0, dtype=np.float32),
+        "df": pd.DataFrame(),
+        "features": feature_spec.features,
+        "feature_spec": feature_spec,
+        "path": None,
+        "summary": ReadingsSummary(STAT_COLUMNS, LATEST_READINGS)
     }
 
-@app.get("/api/local-data")
-async def get_local_data():
-    """Return local water quality data summary"""
-    if local_data is None:
-        raise HTTPException(status_code=404, detail="No data loaded")
-    
-    df = local_data['df']
-    
-    # Get latest readings (last 10 records) - clean NaN values
-    latest_df = df.tail(10).fillna('')
-    latest = latest_df.to_dict(orient='records')
-    
-    # Calculate statistics - handle NaN
-    statistics = {}
-    stat_columns = {
-        'pressure_bar': 'avg_pressure',
-        'flow_rate_L_min': 'avg_flow_rate',
-        'tds_ppm': 'avg_tds',
-        'ph': 'avg_ph',
-        'temperature_C': 'avg_temperature'
-    }
-    
-    for col, stat_name in stat_columns.items():
+
+def readings_frame(records: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Ingested readings as a dataset-shaped frame with the 'unsafe' target."""
+    df = pd.DataFrame.from_records(records)
+    if 'timestamp' in df.columns:
+        df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True, format='ISO8601').dt.tz_convert(None)
+    for col in NUMERICAL_FEATURES:
         if col in df.columns:
-            val = df[col].mean()
-            statistics[stat_name] = float(val) if pd.notna(val) else 0.0
-    
-    # Quality distribution
-    unsafe_count = int(df['unsafe'].sum())
-    safe_count = len(df) - unsafe_count
-    
-    return {
-        "client_id": CLIENT_ID,
-        "total_records": len(df),
-        "latest_readings": clean_for_json(latest),
-        "statistics": clean_for_json(statistics),
-        "quality_distribution": {
-            "safe": safe_count,
-            "unsafe": unsafe_count,
-            "unsafe_percentage": round(unsafe_count / len(df) * 100, 2)
+            df[col] = pd.to_numeric(df[col], errors='coerce')
+    df['unsafe'] = compute_unsafe(df)
+    return df
+
+
+class ClientState:
+    """Identity, data and local model metrics of one logical client."""
+
+    def __init__(self, client_id: str, port: int, data_file: str = DATA_FILE, base_path: str = ""):
+        self.client_id = client_id
+        self.port = port
+        self.data_file = data_file
+        self.base_path = base_path
+        self.local_data: Optional[Dict[str, Any]] = None
+        self.model_metrics = {
+            "accuracy": 0.0,
+            "precision": 0.0,
+            "recall": 0.0,
+            "f1_score": 0.0,
+            "last_trained": None
         }
-    }
 
-@app.get("/api/model-metrics")
-async def get_model_metrics():
-    """Return local model performance metrics"""
-    return {
-        "client_id": CLIENT_ID,
-        **model_metrics
-    }
+        # Live readings: append-only log, running summary and encoded batches since startup.
+        # Training rows live in buffers that double when full: the dataset is copied in
+        # once at the first ingested batch, later batches are appended in place
+        self.readings_log = ReadingsLog(os.path.join(READINGS_LOG_DIR, f"{client_id}.readings.log"),
+                                        READINGS_FSYNC_INTERVAL_MS)
+        self.summary: Optional[ReadingsSummary] = None
+        self._X: Optional[np.ndarray] = None
+        self._y: Optional[np.ndarray] = None
+        self._rows = 0
+        self.ingested_rows = 0
+        self.trained_rows = 0
 
-@app.post("/api/train")
-async def train_local_model(request: TrainRequest):
-    """Train the local model (called by admin during federated learning)"""
-    global model_metrics
-    
-    if local_data is None:
-        raise HTTPException(status_code=400, detail="No data loaded")
-    
-    try:
-        round_num = request.round
-        
-        # Simulate training delay
-        await asyncio.sleep(1)
-        
-        # Simulate metrics improvement over rounds
-        base_accuracy = 0.75 + (round_num * 0.02)
-        noise = np.random.random() * 0.05
-        
-        model_metrics = {
-            "accuracy": float(min(0.95, base_accuracy + noise)),
-            "precision": float(min(0.93, base_accuracy - 0.02 + noise)),
-            "recall": float(min(0.91, base_accuracy - 0.05 + noise)),
-            "f1_score": float(min(0.92, base_accuracy - 0.03 + noise)),
-            "last_trained": time.strftime('%Y-%m-%d %H:%M:%S'),
-            "training_round": round_num
+    def load_local_data(self):
+        """Load (or share) this client's dataset, then replay its readings log"""
+        self.local_data = load_data_file(self.data_file)
+        if self.local_data is not None:
+            logger.info("Loaded %d records, %d features", len(self.local_data['df']),
+                        len(self.local_data['features']), extra={"client_id": self.client_id})
+        else:
+            logger.warning("No data loaded for %s - place synthetic_dataset.csv in backend/data/ folder",
+                           self.client_id)
+            self.local_data = empty_dataset()
+        # Tenants may share the dataset; readings ingested later are per client
+        self.summary = self.local_data['summary'].copy()
+
+        for batch in self.readings_log.replay():
+            try:
+                self.add_readings(self.encode_readings(batch))
+            except Exception:
+                logger.exception("Skipping unreadable batch in %s", self.readings_log.path)
+        if self.ingested_rows:
+            logger.info("Replayed %d readings from %s", self.ingested_rows, self.readings_log.path,
+                        extra={"client_id": self.client_id})
+        return self.local_data
+
+    def encode_readings(self, records: List[Dict[str, Any]]):
+        """Frame, feature matrix and targets of a batch of readings"""
+        df = readings_frame(records)
+        spec = self.local_data['feature_spec']
+        X = spec.encode_columns({c: df[c].values for c in NUMERICAL_FEATURES + CATEGORICAL_FEATURES if c in df.columns})
+        return df, X, df['unsafe'].values.astype(np.float32)
+
+    def add_readings(self, encoded):
+        """Fold an encoded batch into the summary and training data"""
+        df, X, y = encoded
+        self._append_rows(X, y)
+        self.summary.add_frame(df)
+        self.ingested_rows += len(df)
+
+    def _append_rows(self, X: np.ndarray, y: np.ndarray):
+        if self._X is None:
+            base_X, base_y = self.local_data['X'], self.local_data['y']
+            self._rows = len(base_y)
+            self._X = np.empty((2 * (self._rows + len(y)), base_X.shape[1]), dtype=base_X.dtype)
+            self._y = np.empty(len(self._X), dtype=base_y.dtype)
+            self._X[:self._rows] = base_X
+            self._y[:self._rows] = base_y
+        end = self._rows + len(y)
+        if end > len(self._y):
+            capacity = max(end, 2 * len(self._y))
+            grown_X = np.empty((capacity, self._X.shape[1]), dtype=self._X.dtype)
+            grown_y = np.empty(capacity, dtype=self._y.dtype)
+            grown_X[:self._rows] = self._X[:self._rows]
+            grown_y[:self._rows] = self._y[:self._rows]
+            self._X, self._y = grown_X, grown_y
+        self._X[self._rows:end] = X
+        self._y[self._rows:end] = y
+        self._rows = end
+
+    def training_data(self):
+        """X, y of the dataset plus every ingested batch (views, no copy)"""
+        if self._X is None:
+            return self.local_data['X'], self.local_data['y']
+        return self._X[:self._rows], self._y[:self._rows]
+
+# ==================== API Endpoints ====================
+
+def create_client_router(state: ClientState) -> APIRouter:
+    """
+    The client API (health, local data, metrics, training, weights) for one
+    client, under its base path. The prefix is part of each route's path, so
+    request metrics are labelled per tenant.
+    """
+    router = APIRouter(prefix=state.base_path)
+
+    @router.get("/api/health")
+    async def health_check():
+        """Client health check"""
+        return {
+            "status": "online",
+            "client_id": state.client_id,
+            "port": state.port,
+            "data_loaded": state.local_data is not None,
+            "model_trained": state.model_metrics['last_trained'] is not None,
+            "ingested_readings": state.ingested_rows,
+            "model_version": installed_model_version()
         }
-        
+
+    @router.get("/api/local-data")
+    async def get_local_data(request: Request):
+        """Return local water quality data summary (304 while it is unchanged)"""
+        local_data = state.local_data
+        if local_data is None:
+            raise HTTPException(status_code=404, detail="No data loaded")
+
+        # Maintained incrementally as readings arrive, so this is O(1) in the history size
+        summary = state.summary.snapshot()
+        etag = etag_for("local-data", state.client_id, summary['version'])
+        return conditional_response(request, etag, lambda: local_data_response(summary))
+
+    def local_data_response(summary):
+        total = summary['total']
+
+        statistics = {}
+        for col, stat_name in STAT_COLUMNS.items():
+            if col in summary['columns']:
+                mean = summary['columns'][col]['mean']
+                statistics[stat_name] = mean if mean is not None else 0.0
+
+        return FastJSONResponse({
+            "client_id": state.client_id,
+            "total_records": total,
+            "latest_readings": summary['latest'],
+            "statistics": statistics,
+            "quality_distribution": {
+                "safe": summary['safe'],
+                "unsafe": summary['unsafe'],
+                "unsafe_percentage": round(summary['unsafe'] / total * 100, 2) if total else 0.0
+            }
+        })
+
+    @router.post("/api/readings")
+    async def ingest_readings(batch: ReadingsBatch):
+        """Append live readings: durable in the local log before the response, then in summaries and training data"""
+        if state.local_data is None:
+            raise HTTPException(status_code=503, detail="Client is still loading its data")
+
+        records = []
+        for r in batch.readings:
+            record = r.model_dump(mode="json")
+            record['device_id'] = record['device_id'] or state.client_id
+            if record['alert'] in ("", "None"):
+                record['alert'] = None
+            records.append(record)
+
+        # Encode first so a batch that can't be processed never reaches the log
+        encoded = state.encode_readings(records)
+        offset = state.readings_log.append(records)
+        await state.readings_log.commit(offset)
+        state.add_readings(encoded)
+
         return {
-            "client_id": CLIENT_ID,
-            "status": "training_complete",
-            "round": round_num,
-            "metrics": model_metrics
+            "client_id": state.client_id,
+            "accepted": len(records),
+            "ingested_readings": state.ingested_rows,
+            "total_records": state.summary.total
         }
-        
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/api/weights")
-async def get_model_weights():
-    """Return current model weights (for federated averaging)"""
-    return {
-        "client_id": CLIENT_ID,
-        "weights": "placeholder",
-        "message": "Implement actual weight extraction here"
-    }
+    @router.get("/api/model-metrics")
+    async def get_model_metrics():
+        """Return local model performance metrics"""
+        return {
+            "client_id": state.client_id,
+            **state.model_metrics
+        }
 
-@app.post("/api/weights")
-async def set_model_weights(update: WeightsUpdate):
-    """Update model with global weights (from federated server)"""
-    return {
-        "client_id": CLIENT_ID,
-        "status": "weights_updated",
-        "message": "Implement actual weight update here"
-    }
+    @router.post("/api/train")
+    async def train_local_model(request: TrainRequest):
+        """Train the local model (called by admin during federated learning)"""
+        if state.local_data is None:
+            raise HTTPException(status_code=400, detail="No data loaded")
 
-@app.get("/")
-async def index():
-    """Client API information"""
-    return {
-        "name": f"Federated Learning Client - {CLIENT_ID}",
-        "version": "1.0.0",
-        "framework": "FastAPI",
-        "endpoints": {
-            "GET /api/health": "Client health check",
-            "GET /api/local-data": "Get local data summary",
-            "GET /api/model-metrics": "Get model metrics",
-            "POST /api/train": "Trigger local training",
-            "GET /api/weights": "Get model weights",
-            "POST /api/weights": "Update model weights"
+        try:
+            round_num = request.round
+
+            # Dataset plus ingested readings; only batches that arrived since the
+            # last round were encoded (at ingestion), nothing is re-read
+            X, y = state.training_data()
+            new_samples = len(y) - state.trained_rows
+            state.trained_rows = len(y)
+
+            # Simulate training delay
+            await asyncio.sleep(1)
+
+            # Simulate metrics improvement over rounds
+            base_accuracy = 0.75 + (round_num * 0.02)
+            noise = np.random.random() * 0.05
+
+            state.model_metrics = {
+                "accuracy": float(min(0.95, base_accuracy + noise)),
+                "precision": float(min(0.93, base_accuracy - 0.02 + noise)),
+                "recall": float(min(0.91, base_accuracy - 0.05 + noise)),
+                "f1_score": float(min(0.92, base_accuracy - 0.03 + noise)),
+                "last_trained": time.strftime('%Y-%m-%d %H:%M:%S'),
+                "training_round": round_num,
+                "samples": len(y),
+                "new_samples": new_samples
+            }
+
+            return {
+                "client_id": state.client_id,
+                "status": "training_complete",
+                "round": round_num,
+                "metrics": state.model_metrics
+            }
+
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=str(e))
+
+    @router.post("/api/model/sync")
+    async def sync_model():
+        """Download the global model from the admin if a new version was published"""
+        try:
+            result = await sync_global_model()
+        except Exception as e:
+            raise HTTPException(status_code=502, detail=f"Model sync failed: {e}")
+        return {"client_id": state.client_id, **result}
+
+    @router.get("/api/weights")
+    async def get_model_weights():
+        """Return current model weights (for federated averaging)"""
+        return {
+            "client_id": state.client_id,
+            "weights": "placeholder",
+            "message": "Implement actual weight extraction here"
+        }
+
+    @router.post("/api/weights")
+    async def set_model_weights(update: WeightsUpdate):
+        """Update model with global weights (from federated server)"""
+        return {
+            "client_id": state.client_id,
+            "status": "weights_updated",
+            "message": "Implement actual weight update here"
         }
-    }
 
-# ==================== Startup Event ====================
-
-@app.on_event("startup")
-async def startup_event():
-    """Load data on startup"""
-    print(f"\nSearching for data file...")
-    load_local_data()
-    
-    if local_data is not None:
-        print(f"✓ Loaded {len(local_data['df'])} records")
-        print(f"✓ Features: {len(local_data['features'])}")
+    @router.get("/")
+    async def index():
+        """Client API information"""
+        return {
+            "name": f"Federated Learning Client - {state.client_id}",
+            "version": "1.0.0",
+            "framework": "FastAPI",
+            "base_path": state.base_path,
+            "endpoints": {
+                "GET /api/health": "Client health check",
+                "GET /api/local-data": "Get local data summary",
+                "POST /api/readings": "Ingest a batch of live readings",
+                "GET /api/model-metrics": "Get model metrics",
+                "POST /api/train": "Trigger local training",
+                "POST /api/model/sync": "Fetch the global model if its version changed",
+                "GET /api/weights": "Get model weights",
+                "POST /api/weights": "Update model weights"
+            }
+        }
+
+    return router
+
+# ==================== App factory ====================
+
+def create_client_app(
+    client_id: str = CLIENT_ID,
+    port: int = CLIENT_PORT,
+    data_file: str = DATA_FILE,
+    tenants: Optional[List[Dict[str, str]]] = None
+) -> FastAPI:
+    """
+    A client server app.
+
+    Without tenants it serves one client at the root (/api/...). With tenants
+    ([{"id": ..., "data_file": ...}]) every tenant gets the same API under
+    /clients/<id>/ and the root lists them.
+    """
+    if tenants:
+        states = [ClientState(t["id"], port, t.get("data_file") or data_file, f"{TENANT_PREFIX}/{t['id']}")
+                  for t in tenants]
+        title = f"Federated Learning Client Gateway ({len(states)} clients)"
+    else:
+        states = [ClientState(client_id, port, data_file)]
+        title = f"Federated Learning Client - {client_id}"
+
+    app = FastAPI(
+        title=title,
+        version="1.0.0",
+        description="Client server for federated learning",
+        default_response_class=FastJSONResponse
+    )
+    app.state.clients = {s.client_id: s for s in states}
+
+    # CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=CORS_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+
+    # Request metrics middleware and the Prometheus /metrics endpoint
+    install_metrics(app)
+    app.add_middleware(RequestIdMiddleware)
+
+    if tenants:
+        for state in states:
+            app.include_router(create_client_router(state))
+
+        @app.get("/")
+        async def gateway_index():
+            """Clients hosted by this process and their base paths"""
+            return {
+                "name": title,
+                "version": "1.0.0",
+                "framework": "FastAPI",
+                "clients": [
+                    {"id": s.client_id, "base_path": s.base_path, "data_loaded": s.local_data is not None}
+                    for s in states
+                ]
+            }
+
+        @app.get("/api/health")
+        async def gateway_health():
+            """Gateway health check"""
+            return {
+                "status": "online",
+                "port": port,
+                "clients": len(states),
+                "data_loaded": sum(1 for s in states if s.local_data is not None)
+            }
     else:
-        print("✗ No data loaded - place synthetic_dataset.csv in backend/data/ folder")
+        app.include_router(create_client_router(states[0]))
+
+    # ==================== Startup Event ====================
+
+    @app.on_event("startup")
+    async def startup_event():
+        """Load data (and replay readings logs) on startup"""
+        logger.info("Searching for data file...")
+        for state in states:
+            state.load_local_data()
+
+    @app.on_event("shutdown")
+    async def shutdown_event():
+        """Flush and close readings logs"""
+        for state in states:
+            state.readings_log.close()
+
+    return app
+
+
+app = create_client_app(tenants=parse_tenants(CLIENT_TENANTS))
 
 if __name__ == '__main__':
     import uvicorn
-    
+
+    parser = argparse.ArgumentParser(description="Federated learning client server")
+    parser.add_argument("--id", default=CLIENT_ID, help="Client ID (CLIENT_ID)")
+    parser.add_argument("--port", type=int, default=CLIENT_PORT, help="Port to listen on (CLIENT_PORT)")
+    parser.add_argument("--data", default=DATA_FILE, help="Dataset file (CLIENT_DATA_FILE)")
+    parser.add_argument("--tenants", default=CLIENT_TENANTS,
+                        help='Multi-tenant mode: JSON file or "id[=data_file],..." (CLIENT_TENANTS)')
+    parser.add_argument("--host", default="0.0.0.0")
+    args = parser.parse_args()
+
+    tenants = parse_tenants(args.tenants, args.data)
+    app = create_client_app(args.id, args.port, args.data, tenants)
+
     print("\n" + "="*60)
-    print(f"  FEDERATED LEARNING CLIENT: {CLIENT_ID} (FastAPI)")
+    if tenants:
+        print(f"  FEDERATED LEARNING CLIENT GATEWAY: {len(tenants)} clients (FastAPI)")
+    else:
+        print(f"  FEDERATED LEARNING CLIENT: {args.id} (FastAPI)")
     print("="*60)
-    print(f"\nClient server starting on http://0.0.0.0:{CLIENT_PORT}")
+    print(f"\nClient server starting on http://{args.host}:{args.port}")
     print("\nTo register with admin server, use:")
     print(f'  IP: <your-ip-address>')
-    print(f'  Port: {CLIENT_PORT}')
-    print(f'  Client ID: {CLIENT_ID}')
+    print(f'  Port: {args.port}')
+    if tenants:
+        for tenant in tenants:
+            print(f"  Client ID: {tenant['id']}  Base path: {TENANT_PREFIX}/{tenant['id']}")
+    else:
+        print(f'  Client ID: {args.id}')
     print("\n" + "="*60 + "\n")
-    
-    uvicorn.run(app, host="0.0.0.0", port=CLIENT_PORT)
+
+    uvicorn.run(app, host=args.host, port=args.port)
@@ -4,6 +4,7 @@ Loads environment variables from .env file.
 """
 
 import os
+import logging
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
 from typing import Optional
@@ -16,6 +17,10 @@ class Settings(BaseSettings):
     
     # PostgreSQL Configuration
     DATABASE_URL: str = os.getenv("DATABASE_URL", "")
+    DB_POOL_MIN_SIZE: int = int(os.getenv("DB_POOL_MIN_SIZE", "2"))
+    DB_POOL_MAX_SIZE: int = int(os.getenv("DB_POOL_MAX_SIZE", "10"))
+    DB_POOL_MAX_INACTIVE_LIFETIME: float = float(os.getenv("DB_POOL_MAX_INACTIVE_LIFETIME", "300"))
+    DB_STATEMENT_CACHE_SIZE: int = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
     
     # JWT Configuration
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "your-secret-key-change-in-production")
@@ -23,6 +28,67 @@ class Settings(BaseSettings):
     JWT_ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("JWT_ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
     JWT_REFRESH_TOKEN_EXPIRE_DAYS: int = int(os.getenv("JWT_REFRESH_TOKEN_EXPIRE_DAYS", "7"))
     
+    # Sign-in tracking (last_sign_in is written in batches, not per login)
+    SIGN_IN_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("SIGN_IN_FLUSH_INTERVAL_SECONDS", "5"))
+    # While writes keep failing the interval doubles up to this cap
+    SIGN_IN_MAX_FLUSH_BACKOFF_SECONDS: float = float(os.getenv("SIGN_IN_MAX_FLUSH_BACKOFF_SECONDS", "300"))
+    
+    # Sensor reading ingestion (batched COPY into sensor_readings)
+    READINGS_BATCH_SIZE: int = int(os.getenv("READINGS_BATCH_SIZE", "5000"))
+    READINGS_FLUSH_INTERVAL_SECONDS: float = float(os.getenv("READINGS_FLUSH_INTERVAL_SECONDS", "1"))
+    READINGS_MAX_BUFFERED: int = int(os.getenv("READINGS_MAX_BUFFERED", "200000"))
+    # Failed COPYs (other than connection errors) before the batch is split and
+    # the rejected rows moved to the dead-letter file (default backend/data/readings_dead_letter.jsonl)
+    READINGS_MAX_FLUSH_ATTEMPTS: int = int(os.getenv("READINGS_MAX_FLUSH_ATTEMPTS", "3"))
+    READINGS_DEAD_LETTER_FILE: str = os.getenv("READINGS_DEAD_LETTER_FILE", "")
+    # While writes keep failing the flush interval doubles up to this cap
+    READINGS_MAX_FLUSH_BACKOFF_SECONDS: float = float(os.getenv("READINGS_MAX_FLUSH_BACKOFF_SECONDS", "60"))
+    
+    # Training data preparation: rows per chunk, and an optional directory where
+    # the feature matrix is memory-mapped instead of held in RAM
+    TRAINING_CHUNKSIZE: int = int(os.getenv("TRAINING_CHUNKSIZE", "250000"))
+    TRAINING_MEMMAP_DIR: str = os.getenv("TRAINING_MEMMAP_DIR", "")
+    
+    # Training progress events (delta/long-poll/SSE): events kept for catch-up,
+    # and seconds between SSE keep-alives / the longest long-poll wait
+    TRAINING_EVENTS_BUFFER: int = int(os.getenv("TRAINING_EVENTS_BUFFER", "5000"))
+    TRAINING_STREAM_HEARTBEAT_SECONDS: float = float(os.getenv("TRAINING_STREAM_HEARTBEAT_SECONDS", "15"))
+    
+    # Opt-in profiling (see core/profiling.py): PROFILING_ENABLED lets admins
+    # profile single requests / training runs via headers; PROFILE_TRAINING
+    # ("cprofile" or "sample") profiles every training run
+    PROFILING_ENABLED: bool = os.getenv("PROFILING_ENABLED", "false").lower() == "true"
+    PROFILE_TRAINING: str = os.getenv("PROFILE_TRAINING", "")
+    PROFILE_DIR: str = os.getenv("PROFILE_DIR", "")
+    PROFILE_SAMPLE_INTERVAL_MS: float = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5"))
+    
+    # Model registry (see core/registry.py): immutable versions and the CURRENT
+    # pointer (default backend/models); MODEL_AUTO_PROMOTE serves each newly
+    # trained version right away
+    MODEL_REGISTRY_DIR: str = os.getenv("MODEL_REGISTRY_DIR", "")
+    MODEL_AUTO_PROMOTE: bool = os.getenv("MODEL_AUTO_PROMOTE", "true").lower() == "true"
+    # Formats each version is saved in (see core/model_io.py): h5 always, plus
+    # keras (native archive) and/or npz (raw weights, fastest to load)
+    MODEL_SAVE_FORMATS: str = os.getenv("MODEL_SAVE_FORMATS", "h5,npz")
+    
+    # Model artifact distribution (see core/artifacts.py): content-addressed
+    # blobs and manifest (default backend/artifacts), and the precompressed
+    # variants to publish (zstd needs the zstandard package)
+    MODEL_ARTIFACTS_DIR: str = os.getenv("MODEL_ARTIFACTS_DIR", "")
+    MODEL_ARTIFACT_ENCODINGS: str = os.getenv("MODEL_ARTIFACT_ENCODINGS", "gzip,zstd")
+    
+    # Prediction cache (see core/prediction_cache.py): LRU entries (0 disables)
+    # and the decimals reading values are rounded to for the cache key
+    PREDICT_CACHE_SIZE: int = int(os.getenv("PREDICT_CACHE_SIZE", "10000"))
+    PREDICT_CACHE_DECIMALS: int = int(os.getenv("PREDICT_CACHE_DECIMALS", "3"))
+    
+    # Shadow evaluation (see core/shadow.py): score SHADOW_SAMPLE_RATE of
+    # predict requests with registry version SHADOW_MODEL_VERSION on a
+    # background thread; samples beyond SHADOW_QUEUE_SIZE are dropped
+    SHADOW_MODEL_VERSION: str = os.getenv("SHADOW_MODEL_VERSION", "")
+    SHADOW_SAMPLE_RATE: float = float(os.getenv("SHADOW_SAMPLE_RATE", "0.1"))
+    SHADOW_QUEUE_SIZE: int = int(os.getenv("SHADOW_QUEUE_SIZE", "1000"))
+    
     # Server Configuration
     SERVER_HOST: str = os.getenv("SERVER_HOST", "0.0.0.0")
     SERVER_PORT: int = int(os.getenv("SERVER_PORT", "5000"))
@@ -37,17 +103,16 @@ settings = Settings()
 
 def validate_settings():
     """Validate that required settings are configured"""
+    logger = logging.getLogger(__name__)
     errors = []
     
     if not settings.DATABASE_URL:
         errors.append("DATABASE_URL is not configured")
     
     if errors:
-        print("⚠️  Configuration warnings:")
         for error in errors:
-            print(f"   - {error}")
-        print("   Authentication features may not work properly.\n")
+            logger.warning("Configuration warning: %s. Authentication features may not work properly.", error)
     else:
-        print("✓ PostgreSQL configuration loaded successfully\n")
+        logger.info("PostgreSQL configuration loaded")
     
     return len(errors) == 0
@@ -6,12 +6,17 @@ from .utils import (
     clean_for_json,
     create_model,
     create_target,
+    federated_average,
     load_and_prepare_data
 )
+from .responses import FastJSONResponse, dumps_json
 
 __all__ = [
     "clean_for_json",
     "create_model",
     "create_target",
-    "load_and_prepare_data"
+    "federated_average",
+    "load_and_prepare_data",
+    "FastJSONResponse",
+    "dumps_json"
 ]
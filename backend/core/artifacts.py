@@ -0,0 +1,277 @@
+"""
+Content-addressed model artifacts.
+
+publish() turns a model file into immutable blobs named by their SHA-256:
+the raw file plus precompressed gzip (and zstd, when the optional
+`zstandard` package is installed) variants. It then writes a small manifest:
+
+    {"format": 1, "version": "<sha256[:16]>", "name": "federated_water_quality_model.h5",
+     "sha256": ..., "size": ..., "created_at": ...,
+     "variants": [{"encoding": "zstd", "sha256": ..., "size": ...}, ...]}
+
+Blobs never change once written, so the server can send them with a
+far-future Cache-Control and honor byte ranges. A client that was cut off
+can resume a download, check each blob against its hash and decompress it.
+
+sync_artifact() is the client side. It revalidates the manifest with
+If-None-Match (the ETag is the model's SHA-256) and downloads only when the
+version changed. It takes the smallest variant it can decode, resumes
+partial downloads with Range, verifies both hashes and installs the model
+with an atomic rename. The manifest is kept next to the model as
+<model>.manifest.json.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import time
+from typing import Any, Dict, List, Optional
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FORMAT = 1
+MANIFEST_NAME = "manifest.json"
+CHUNK_SIZE = 1 << 20
+
+# Blob file suffix and media type of each variant
+ENCODINGS = {
+    "identity": ("", "application/octet-stream"),
+    "gzip": (".gz", "application/gzip"),
+    "zstd": (".zst", "application/zstd"),
+}
+# Smallest first: the order clients prefer variants in
+ENCODING_PREFERENCE = ["zstd", "gzip", "identity"]
+
+_DIGEST = re.compile(r"^[0-9a-f]{64}$")
+
+
+def available_encodings() -> List[str]:
+    """Variants this process can produce and decode."""
+    return [e for e in ENCODING_PREFERENCE if e != "zstd" or ZSTD_AVAILABLE]
+
+
+def sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _compress(source: str, target: str, encoding: str):
+    with open(source, "rb") as src:
+        if encoding == "gzip":
+            # mtime=0 keeps the output (and its hash) a function of the content only
+            with open(target, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=9, mtime=0) as dst:
+                shutil.copyfileobj(src, dst, CHUNK_SIZE)
+        elif encoding == "zstd":
+            with open(target, "wb") as dst:
+                zstandard.ZstdCompressor(level=19).copy_stream(src, dst)
+        else:
+            with open(target, "wb") as dst:
+                shutil.copyfileobj(src, dst, CHUNK_SIZE)
+
+
+def _decompress(source: str, target: str, encoding: str):
+    with open(target, "wb") as dst:
+        if encoding == "gzip":
+            with gzip.open(source, "rb") as src:
+                shutil.copyfileobj(src, dst, CHUNK_SIZE)
+        elif encoding == "zstd":
+            with open(source, "rb") as src:
+                zstandard.ZstdDecompressor().copy_stream(src, dst)
+        else:
+            with open(source, "rb") as src:
+                shutil.copyfileobj(src, dst, CHUNK_SIZE)
+
+
+def _write_json(path: str, data: Dict[str, Any]):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class ArtifactStore:
+    """Directory of content-addressed blobs plus the manifest of the current model."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, MANIFEST_NAME)
+
+    def blob_path(self, digest: str) -> Optional[str]:
+        """Path of the blob with this SHA-256, or None if it is unknown."""
+        if not _DIGEST.match(digest):
+            return None
+        for encoding in ENCODINGS:
+            path = os.path.join(self.directory, digest + ENCODINGS[encoding][0])
+            if os.path.exists(path):
+                return path
+        return None
+
+    @staticmethod
+    def media_type(path: str) -> str:
+        for suffix, media_type in ENCODINGS.values():
+            if suffix and path.endswith(suffix):
+                return media_type
+        return ENCODINGS["identity"][1]
+
+    def manifest(self) -> Optional[Dict[str, Any]]:
+        return _read_json(self.manifest_path)
+
+    def is_current(self, source_path: str) -> bool:
+        """Whether the manifest was built from source_path as it is now."""
+        manifest = self.manifest()
+        if manifest is None:
+            return False
+        try:
+            stat = os.stat(source_path)
+        except OSError:
+            return False
+        return manifest.get("source") == [stat.st_mtime_ns, stat.st_size]
+
+    def _add_blob(self, source: str, encoding: str) -> Dict[str, Any]:
+        tmp_path = os.path.join(self.directory, f".{os.getpid()}.{encoding}.tmp")
+        _compress(source, tmp_path, encoding)
+        digest = sha256_file(tmp_path)
+        path = os.path.join(self.directory, digest + ENCODINGS[encoding][0])
+        os.replace(tmp_path, path)
+        return {"encoding": encoding, "sha256": digest, "size": os.path.getsize(path)}
+
+    def publish(self, source_path: str, encodings: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Store source_path as blobs in every encoding and make it the current manifest."""
+        os.makedirs(self.directory, exist_ok=True)
+        stat = os.stat(source_path)
+        digest = sha256_file(source_path)
+        encodings = [e for e in (encodings or available_encodings()) if e in available_encodings()]
+        if "identity" not in encodings:
+            encodings.append("identity")
+
+        current = self.manifest()
+        if current and current.get("sha256") == digest and \
+                {v["encoding"] for v in current.get("variants", [])} >= set(encodings):
+            variants = current["variants"]
+        else:
+            start = time.perf_counter()
+            variants = [self._add_blob(source_path, encoding) for encoding in encodings]
+            variants.sort(key=lambda v: v["size"])
+            logger.info("Published model artifact %s (%s) in %.2fs", digest[:16],
+                        ", ".join(f"{v['encoding']} {v['size']}" for v in variants), time.perf_counter() - start)
+
+        manifest = {
+            "format": ARTIFACT_FORMAT,
+            "version": digest[:16],
+            "name": os.path.basename(source_path),
+            "sha256": digest,
+            "size": stat.st_size,
+            "created_at": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(stat.st_mtime)),
+            "source": [stat.st_mtime_ns, stat.st_size],
+            "variants": variants,
+        }
+        _write_json(self.manifest_path, manifest)
+        return manifest
+
+
+# ==================== Client side ====================
+
+def local_manifest(model_path: str) -> Optional[Dict[str, Any]]:
+    """Manifest of the model installed at model_path by sync_artifact."""
+    return _read_json(f"{model_path}.manifest.json")
+
+
+async def _download(http, url: str, path: str, size: int, attempts: int):
+    """Download url to path, resuming from a partial file with Range requests."""
+    for attempt in range(1, attempts + 1):
+        have = os.path.getsize(path) if os.path.exists(path) else 0
+        if have >= size:
+            return
+        headers = {"Range": f"bytes={have}-"} if have else {}
+        try:
+            async with http.stream("GET", url, headers=headers) as response:
+                if response.status_code == 200:
+                    # Server ignored the range: start over
+                    have, mode = 0, "wb"
+                elif response.status_code == 206:
+                    mode = "ab"
+                else:
+                    response.raise_for_status()
+                    raise RuntimeError(f"Unexpected HTTP {response.status_code} for {url}")
+                with open(path, mode) as f:
+                    async for chunk in response.aiter_bytes(CHUNK_SIZE):
+                        f.write(chunk)
+            if os.path.getsize(path) >= size:
+                return
+        except Exception as e:
+            if attempt == attempts:
+                raise
+            logger.warning("Artifact download interrupted (%s), resuming (attempt %d/%d)", e, attempt + 1, attempts)
+            await asyncio.sleep(min(2 ** attempt, 30) * 0.1)
+
+
+async def sync_artifact(http, manifest_url: str, model_path: str, attempts: int = 5) -> Optional[Dict[str, Any]]:
+    """
+    Install the current model artifact at model_path if its version changed.
+
+    http is an httpx.AsyncClient; blob URLs in the manifest are resolved
+    against manifest_url. Returns the new manifest, or None when the local
+    model is already current.
+    """
+    import httpx
+
+    current = local_manifest(model_path)
+    headers = {"If-None-Match": f'"{current["sha256"]}"'} if current and os.path.exists(model_path) else {}
+    response = await http.get(manifest_url, headers=headers)
+    if response.status_code == 304:
+        return None
+    response.raise_for_status()
+    manifest = response.json()
+    if current and current.get("sha256") == manifest["sha256"] and os.path.exists(model_path):
+        return None
+
+    decodable = set(available_encodings())
+    variant = min((v for v in manifest["variants"] if v["encoding"] in decodable),
+                  key=lambda v: ENCODING_PREFERENCE.index(v["encoding"]))
+    directory = os.path.dirname(os.path.abspath(model_path))
+    os.makedirs(directory, exist_ok=True)
+    part_path = os.path.join(directory, f"{variant['sha256']}.part")
+    url = str(httpx.URL(manifest_url).join(variant["url"]))
+
+    start = time.perf_counter()
+    await _download(http, url, part_path, variant["size"], attempts)
+
+    def install():
+        if sha256_file(part_path) != variant["sha256"]:
+            os.remove(part_path)
+            raise ValueError(f"Artifact {variant['sha256'][:16]} failed its hash check")
+        tmp_path = f"{model_path}.tmp"
+        _decompress(part_path, tmp_path, variant["encoding"])
+        if sha256_file(tmp_path) != manifest["sha256"]:
+            os.remove(tmp_path)
+            raise ValueError(f"Decompressed model {manifest['version']} failed its hash check")
+        os.replace(tmp_path, model_path)
+        os.remove(part_path)
+        _write_json(f"{model_path}.manifest.json", manifest)
+
+    await asyncio.to_thread(install)
+    logger.info("Installed model %s (%s, %d bytes) in %.2fs", manifest["version"], variant["encoding"],
+                variant["size"], time.perf_counter() - start)
+    return manifest
@@ -0,0 +1,303 @@
+"""
+Columnar on-disk dataset format.
+
+A CSV dataset is converted once into a directory of per-column .npy files
+plus a _meta.json describing them:
+
+    synthetic_dataset.cols/
+        _meta.json
+        pressure_bar.npy        numeric columns (int64 or float64)
+        pressure_status.npy     categorical codes (int8/16/32, -1 = missing)
+        timestamp.npy           int64 nanoseconds since epoch (NaT = int64 min)
+
+Readers memory-map only the columns they ask for, so loading skips CSV
+parsing entirely and never touches unused columns.
+
+Convert with: python -m core.convert_dataset data/synthetic_dataset.csv
+"""
+
+import json
+import os
+import shutil
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+META_FILE = "_meta.json"
+FORMAT_NAME = "npy-columns"
+FORMAT_VERSION = 1
+TIMESTAMP_COLUMNS = ("timestamp",)
+DEFAULT_CHUNKSIZE = 500_000
+
+
+def columnar_path_for(csv_path: str) -> str:
+    """Return the columnar directory that corresponds to a CSV file."""
+    root, _ = os.path.splitext(csv_path)
+    return root + ".cols"
+
+
+def is_columnar(path: str) -> bool:
+    """True if path is a columnar dataset directory."""
+    return os.path.isfile(os.path.join(path, META_FILE))
+
+
+def _codes_dtype(n_categories: int):
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories <= np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def _column_kind(col: str, values: pd.Series) -> Optional[str]:
+    """Storage kind of a column from one chunk; None while it has no values yet."""
+    if col in TIMESTAMP_COLUMNS:
+        return "timestamp"
+    if values.isna().all():
+        # pandas reads an all-empty column as float whatever it holds later
+        return None
+    return "numeric" if pd.api.types.is_numeric_dtype(values) else "categorical"
+
+
+def _recode_raw(path: str, n_rows: int, chunksize: int, recode) -> None:
+    """Rewrite the float64 raw column at path as int64 codes, block by block."""
+    tmp_path = path + ".recode"
+    if n_rows:
+        raw = np.memmap(path, dtype=np.float64, mode="r", shape=(n_rows,))
+        with open(tmp_path, "wb") as out:
+            for start in range(0, n_rows, chunksize):
+                out.write(np.ascontiguousarray(recode(np.asarray(raw[start:start + chunksize]))).tobytes())
+        del raw
+    else:
+        open(tmp_path, "wb").close()
+    os.replace(tmp_path, path)
+
+
+def _numeric_to_categorical(info: dict, path: str, n_rows: int, chunksize: int) -> None:
+    """
+    Switch a column read so far as numbers to dictionary encoding (a later
+    chunk holds text). The numbers already written become categories spelled
+    as they appear in the CSV.
+    """
+    seen = set()
+    if n_rows:
+        raw = np.memmap(path, dtype=np.float64, mode="r", shape=(n_rows,))
+        for start in range(0, n_rows, chunksize):
+            block = np.asarray(raw[start:start + chunksize])
+            seen.update(np.unique(block[~np.isnan(block)]).tolist())
+        del raw
+    numbers = np.array(sorted(seen), dtype=np.float64)
+    vocab = info["vocab"]
+    # Missing values make pandas read integers as floats: 12.0 was "12" in the CSV
+    codes = np.array(
+        [vocab.setdefault(str(int(v)) if v.is_integer() else repr(v), len(vocab)) for v in numbers.tolist()],
+        dtype=np.int64
+    )
+
+    def recode(block):
+        out = np.full(len(block), -1, dtype=np.int64)
+        present = ~np.isnan(block)
+        out[present] = codes[np.searchsorted(numbers, block[present])]
+        return out
+
+    _recode_raw(path, n_rows, chunksize, recode)
+    info["kind"] = "categorical"
+
+
+def convert_csv_to_columnar(
+    csv_path: str,
+    out_dir: Optional[str] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> str:
+    """
+    Convert a CSV file to the columnar format, streaming it in chunks.
+
+    Text columns are dictionary-encoded with a sorted vocabulary, timestamps
+    are stored as int64 nanoseconds and numeric columns keep int64 when every
+    value is integral, float64 otherwise. A column's kind is settled by the
+    first chunk with values in it; a numeric column that later turns out to
+    hold text is switched to dictionary encoding. Returns the output directory.
+    """
+    out_dir = out_dir or columnar_path_for(csv_path)
+    tmp_dir = out_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+
+    columns: Dict[str, dict] = {}
+    raw_files = {}
+    n_rows = 0
+
+    def raw_file(col):
+        return os.path.join(tmp_dir, f"{col}.raw")
+
+    try:
+        for chunk in pd.read_csv(csv_path, chunksize=chunksize):
+            if not columns:
+                for col in chunk.columns:
+                    columns[col] = {"kind": _column_kind(col, chunk[col]), "integral": True, "vocab": {}}
+                    raw_files[col] = open(raw_file(col), "wb")
+
+            for col, info in columns.items():
+                values = chunk[col]
+                if info["kind"] is None:
+                    info["kind"] = _column_kind(col, values)
+                    if info["kind"] == "categorical":
+                        # Rows so far were all missing: NaN placeholders become code -1
+                        raw_files[col].close()
+                        _recode_raw(raw_file(col), n_rows, chunksize,
+                                    lambda block: np.full(len(block), -1, dtype=np.int64))
+                        raw_files[col] = open(raw_file(col), "ab")
+                elif info["kind"] == "numeric" and not values.isna().all() \
+                        and not pd.api.types.is_numeric_dtype(values):
+                    raw_files[col].close()
+                    _numeric_to_categorical(info, raw_file(col), n_rows, chunksize)
+                    raw_files[col] = open(raw_file(col), "ab")
+
+                if info["kind"] is None:
+                    data = np.full(len(values), np.nan)
+                elif info["kind"] == "timestamp":
+                    data = pd.to_datetime(values, errors="coerce").to_numpy("datetime64[ns]").view(np.int64)
+                elif info["kind"] == "numeric":
+                    if not pd.api.types.is_integer_dtype(values):
+                        info["integral"] = False
+                    data = values.to_numpy(np.float64)
+                else:
+                    # Provisional codes in first-seen order; remapped to sorted order at the end
+                    vocab = info["vocab"]
+                    codes, uniques = pd.factorize(values)
+                    local_to_global = np.array(
+                        [vocab.setdefault(u, len(vocab)) for u in uniques], dtype=np.int64
+                    )
+                    data = np.where(codes >= 0, local_to_global[codes] if len(uniques) else -1, -1)
+                raw_files[col].write(np.ascontiguousarray(data).tobytes())
+            n_rows += len(chunk)
+    finally:
+        for f in raw_files.values():
+            f.close()
+
+    for info in columns.values():
+        if info["kind"] is None:
+            # Never had a value: an all-NaN float column
+            info["kind"], info["integral"] = "numeric", False
+
+    meta = {"format": FORMAT_NAME, "version": FORMAT_VERSION, "rows": n_rows, "columns": {}}
+    for col, info in columns.items():
+        raw_path = os.path.join(tmp_dir, f"{col}.raw")
+        raw_dtype = np.float64 if info["kind"] == "numeric" else np.int64
+        raw = np.memmap(raw_path, dtype=raw_dtype, mode="r", shape=(n_rows,)) if n_rows else np.empty(0, raw_dtype)
+
+        if info["kind"] == "timestamp":
+            dtype, entry = np.int64, {"kind": "timestamp", "unit": "ns"}
+            convert = lambda block: block
+        elif info["kind"] == "numeric":
+            dtype = np.int64 if info["integral"] else np.float64
+            entry = {"kind": "numeric", "dtype": np.dtype(dtype).name}
+            convert = lambda block, dtype=dtype: block.astype(dtype)
+        else:
+            categories = sorted(info["vocab"], key=str)
+            remap = np.empty(len(categories) + 1, dtype=np.int64)
+            remap[-1] = -1
+            for new_code, value in enumerate(categories):
+                remap[info["vocab"][value]] = new_code
+            dtype = _codes_dtype(len(categories))
+            entry = {"kind": "categorical", "dtype": np.dtype(dtype).name,
+                     "categories": [str(c) for c in categories]}
+            convert = lambda block, remap=remap, dtype=dtype: remap[block].astype(dtype)
+
+        out = np.lib.format.open_memmap(
+            os.path.join(tmp_dir, f"{col}.npy"), mode="w+", dtype=dtype, shape=(n_rows,)
+        )
+        for start in range(0, n_rows, chunksize):
+            out[start:start + chunksize] = convert(np.asarray(raw[start:start + chunksize]))
+        out.flush()
+        del out, raw
+        os.remove(raw_path)
+        meta["columns"][col] = entry
+
+    with open(os.path.join(tmp_dir, META_FILE), "w") as f:
+        json.dump(meta, f, indent=2)
+
+    shutil.rmtree(out_dir, ignore_errors=True)
+    os.replace(tmp_dir, out_dir)
+    return out_dir
+
+
+def read_columnar_meta(path: str) -> dict:
+    """Load the _meta.json of a columnar dataset."""
+    with open(os.path.join(path, META_FILE)) as f:
+        meta = json.load(f)
+    if meta.get("format") != FORMAT_NAME:
+        raise ValueError(f"{path} is not a {FORMAT_NAME} dataset")
+    return meta
+
+
+def read_columnar(path: str, columns: Optional[Iterable[str]] = None, mmap: bool = True) -> pd.DataFrame:
+    """
+    Read a columnar dataset into a DataFrame.
+
+    Only the requested columns are opened; names not present in the dataset
+    are ignored, like usecols on the CSV path. Categorical columns come back
+    as pandas Categoricals built directly from the stored codes.
+    """
+    meta = read_columnar_meta(path)
+    wanted = list(meta["columns"]) if columns is None else [c for c in columns if c in meta["columns"]]
+    mmap_mode = "r" if mmap else None
+
+    data = {}
+    for col in wanted:
+        entry = meta["columns"][col]
+        arr = np.load(os.path.join(path, f"{col}.npy"), mmap_mode=mmap_mode)
+        if entry["kind"] == "timestamp":
+            data[col] = np.asarray(arr).view("datetime64[ns]")
+        elif entry["kind"] == "categorical":
+            data[col] = pd.Categorical.from_codes(np.asarray(arr), categories=entry["categories"])
+        else:
+            data[col] = np.asarray(arr)
+    return pd.DataFrame(data, columns=wanted)
+
+
+def fresh_columnar_for(csv_path: str) -> Optional[str]:
+    """Return the columnar copy of csv_path if it exists and is not older than the CSV."""
+    cols_path = columnar_path_for(csv_path)
+    if not is_columnar(cols_path):
+        return None
+    meta_path = os.path.join(cols_path, META_FILE)
+    if os.path.exists(csv_path) and os.path.getmtime(meta_path) < os.path.getmtime(csv_path):
+        # CSV was edited after conversion; don't serve stale data
+        return None
+    return cols_path
+
+
+def read_dataset(path: str, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Load a dataset, preferring the columnar copy.
+
+    path may be a columnar directory or a CSV file; for a CSV, an up-to-date
+    sibling .cols directory is used when present. Only `columns` are read.
+    """
+    columns = list(columns) if columns is not None else None
+    if is_columnar(path):
+        return read_columnar(path, columns)
+    cols_path = fresh_columnar_for(path)
+    if cols_path is not None:
+        return read_columnar(cols_path, columns)
+    if columns is None:
+        return pd.read_csv(path)
+    wanted = set(columns)
+    return pd.read_csv(path, usecols=lambda c: c in wanted)
+
+
+def dataset_columns(path: str) -> List[str]:
+    """Return a dataset's column names without loading any data."""
+    if is_columnar(path):
+        return list(read_columnar_meta(path)["columns"])
+    cols_path = fresh_columnar_for(path)
+    if cols_path is not None:
+        return list(read_columnar_meta(cols_path)["columns"])
+    return list(pd.read_csv(path, nrows=0).columns)
+
+
+def dataset_exists(path: str) -> bool:
+    """True if path is a CSV file or a columnar dataset directory."""
+    return os.path.isfile(path) or is_columnar(path)
+
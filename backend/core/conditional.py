@@ -0,0 +1,106 @@
+"""
+Conditional GET support (ETag / Last-Modified / 304).
+
+Read-mostly endpoints return the same bytes until some version changes: a
+file's mtime and size, an in-memory version counter, an event log version.
+The ETag is a hash of those version parts (plus anything else the body
+depends on), so it can be checked before the body is built:
+
+    return conditional_response(request, etag_for("history", version), build_body)
+
+build is only called when the client's If-None-Match / If-Modified-Since do
+not match; otherwise the response is an empty 304 with the same validators.
+Counters restart with the process, so every ETag also includes BOOT_ID.
+"""
+
+import hashlib
+import os
+import uuid
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Callable, Optional, Tuple
+
+from fastapi import Request, Response
+
+# Distinguishes version counters of this process from those of a previous run
+BOOT_ID = uuid.uuid4().hex[:8]
+
+# Cached copies must be revalidated before reuse
+CACHE_CONTROL = "no-cache"
+
+
+def etag_for(*parts: Any) -> str:
+    """Strong ETag of the version parts the response body depends on."""
+    digest = hashlib.blake2b(repr((BOOT_ID,) + parts).encode(), digest_size=12).hexdigest()
+    return f'"{digest}"'
+
+
+def file_version(path: str) -> Optional[Tuple[int, int]]:
+    """(mtime_ns, size) of a file, or None if it does not exist."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def http_date(timestamp: float) -> str:
+    return formatdate(timestamp, usegmt=True)
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as If-None-Match requires
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def is_not_modified(request: Request, etag: Optional[str], last_modified: Optional[float] = None) -> bool:
+    """
+    True if the request's validators match. If-None-Match takes precedence;
+    If-Modified-Since is only consulted without it (RFC 9110).
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag is not None and _etag_matches(if_none_match, etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(last_modified) <= since
+    return False
+
+
+def validator_headers(etag: Optional[str], last_modified: Optional[float] = None,
+                      cache_control: str = CACHE_CONTROL) -> dict:
+    headers = {"Cache-Control": cache_control}
+    if etag is not None:
+        headers["ETag"] = etag
+    if last_modified is not None:
+        headers["Last-Modified"] = http_date(last_modified)
+    return headers
+
+
+def conditional_response(
+    request: Request,
+    etag: Optional[str],
+    build: Callable[[], Response],
+    last_modified: Optional[float] = None,
+    cache_control: str = CACHE_CONTROL,
+) -> Response:
+    """304 if the request's validators match, else build() with ETag/Last-Modified set."""
+    headers = validator_headers(etag, last_modified, cache_control)
+    if is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+    response = build()
+    for name, value in headers.items():
+        response.headers[name] = value
+    return response
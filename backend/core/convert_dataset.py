@@ -0,0 +1,28 @@
+"""
+Convert CSV datasets to the columnar .npy format.
+
+Run from backend/: python -m core.convert_dataset data/synthetic_dataset.csv
+"""
+
+import argparse
+import sys
+
+from core.columnar import DEFAULT_CHUNKSIZE, convert_csv_to_columnar, read_columnar_meta
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert CSV datasets to the columnar .npy format")
+    parser.add_argument("csv", nargs="+", help="CSV file(s) to convert")
+    parser.add_argument("--out", help="Output directory (single input only)")
+    parser.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    args = parser.parse_args()
+
+    if args.out and len(args.csv) > 1:
+        sys.exit("--out can only be used with a single input file")
+    for csv_path in args.csv:
+        out = convert_csv_to_columnar(csv_path, args.out, args.chunksize)
+        print(f"✓ {csv_path} -> {out} ({read_columnar_meta(out)['rows']} rows)")
+
+
+if __name__ == "__main__":
+    main()
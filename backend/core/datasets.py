@@ -0,0 +1,230 @@
+"""
+Schema-normalizing dataset loader.
+
+The bundled CSVs disagree on column names (flow_rate_L_min vs flow_rate_lpm,
+temperature_C vs temperature_c, ...). This module maps every known alias to
+one canonical schema, reads any mix of CSV files and columnar copies from a
+file, directory or glob in chunks, and returns a single DataFrame together
+with per-device row-index shards.
+
+load_dataset() counts rows first and fills one preallocated array per
+column, so the result is never held twice (no list of chunks plus a
+concatenated copy). Callers that can stream use iter_dataset_chunks().
+"""
+
+import glob
+import itertools
+import os
+from typing import Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .columnar import (
+    TIMESTAMP_COLUMNS, dataset_columns, fresh_columnar_for, is_columnar, read_columnar, read_columnar_meta,
+)
+
+# Canonical schema (synthetic_dataset.csv naming)
+CANONICAL_COLUMNS = [
+    'timestamp', 'device_id',
+    'pressure_bar', 'pressure_status',
+    'flow_rate_L_min', 'total_volume_L',
+    'tds_ppm', 'tds_status',
+    'ph', 'ph_status',
+    'temperature_C', 'wifi_status', 'signal_strength_dBm',
+    'sensor_status', 'alert',
+]
+
+# Known aliases (compared case-insensitively) -> canonical name
+COLUMN_ALIASES = {
+    **{c.lower(): c for c in CANONICAL_COLUMNS},
+    'flow_rate_lpm': 'flow_rate_L_min',
+    'total_volume_l': 'total_volume_L',
+    'temperature_c': 'temperature_C',
+    'signal_strength_dbm': 'signal_strength_dBm',
+}
+
+# Model inputs
+NUMERICAL_FEATURES = ['pressure_bar', 'flow_rate_L_min', 'total_volume_L',
+                      'tds_ppm', 'ph', 'temperature_C', 'signal_strength_dBm']
+CATEGORICAL_FEATURES = ['pressure_status', 'tds_status', 'ph_status',
+                        'wifi_status', 'sensor_status']
+
+# Fixed category vocabularies (sorted). One-hot encoding drops the first
+# category of each, matching pd.get_dummies(drop_first=True) on full data.
+CATEGORY_VOCABULARY = {
+    'pressure_status': ['High', 'Low', 'Normal'],
+    'tds_status': ['Good', 'Moderate', 'Poor'],
+    'ph_status': ['Acidic', 'Alkaline', 'Neutral'],
+    'wifi_status': ['Connected', 'Disconnected'],
+    'sensor_status': ['Fault', 'OK'],
+}
+
+DEFAULT_CHUNKSIZE = 250_000
+
+
+def canonical_column(name: str) -> str:
+    """Map a column name to its canonical spelling (unknown names pass through)."""
+    return COLUMN_ALIASES.get(name.strip().lower(), name)
+
+
+def resolve_dataset_paths(source: str) -> List[str]:
+    """
+    Expand a dataset source into a sorted list of dataset paths.
+
+    source may be a CSV file, a columnar .cols directory, a directory holding
+    either, or a glob pattern. A CSV and its .cols copy count as one dataset.
+    """
+    if is_columnar(source) or os.path.isfile(source):
+        return [source]
+    if os.path.isdir(source):
+        candidates = glob.glob(os.path.join(source, "*.csv")) + glob.glob(os.path.join(source, "*.cols"))
+    else:
+        candidates = glob.glob(source)
+
+    paths = []
+    for path in sorted(candidates):
+        if path.endswith(".cols"):
+            # Covered by its CSV when both exist
+            if not is_columnar(path) or os.path.exists(path[:-len(".cols")] + ".csv"):
+                continue
+        elif not os.path.isfile(path):
+            continue
+        paths.append(path)
+    return paths
+
+
+def _iter_file_chunks(path: str, columns: Optional[List[str]], chunksize: int) -> Iterator[pd.DataFrame]:
+    """Yield canonically named chunks of one dataset file."""
+    rename = {c: canonical_column(c) for c in dataset_columns(path)}
+    if columns is not None:
+        wanted = set(columns)
+        rename = {src: dst for src, dst in rename.items() if dst in wanted}
+    usecols = list(rename)
+
+    cols_path = path if is_columnar(path) else fresh_columnar_for(path)
+    if cols_path is not None:
+        # Memory-mapped already; one chunk avoids slicing copies
+        yield read_columnar(cols_path, usecols).rename(columns=rename)
+        return
+
+    for chunk in pd.read_csv(path, usecols=usecols, chunksize=chunksize):
+        chunk = chunk.rename(columns=rename)
+        # Parsed like the columnar copy, so CSV and columnar chunks share a dtype
+        for col in TIMESTAMP_COLUMNS:
+            if col in chunk.columns:
+                chunk[col] = pd.to_datetime(chunk[col], errors="coerce").astype("datetime64[ns]")
+        yield chunk
+
+
+def iter_dataset_chunks(
+    source: str,
+    columns: Optional[Iterable[str]] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Iterator[pd.DataFrame]:
+    """
+    Lazily yield chunks from every dataset under source with canonical column names
+    and datetime64[ns] timestamps.
+
+    columns are canonical names; each file contributes whichever it has. Rows of
+    files without a device_id column are tagged with the file's name so every
+    row belongs to a device.
+    """
+    columns = list(columns) if columns is not None else None
+    for path in resolve_dataset_paths(source):
+        device_tag = os.path.splitext(os.path.basename(path.rstrip(os.sep)))[0]
+        for chunk in _iter_file_chunks(path, columns, chunksize):
+            if (columns is None or 'device_id' in columns) and 'device_id' not in chunk.columns:
+                chunk['device_id'] = device_tag
+            yield chunk
+
+
+def _count_rows(path: str, chunksize: int) -> int:
+    """Rows of one dataset file (columnar metadata, or a one-column CSV scan)."""
+    cols_path = path if is_columnar(path) else fresh_columnar_for(path)
+    if cols_path is not None:
+        return read_columnar_meta(cols_path)["rows"]
+    return sum(len(chunk) for chunk in pd.read_csv(path, usecols=[0], chunksize=chunksize))
+
+
+# NumPy dtype kinds stored in a typed buffer; anything else goes to an object buffer
+_NATIVE_KINDS = "biufM"
+
+
+def _column_buffer(values: pd.Series, n_rows: int, missing_rows: int) -> np.ndarray:
+    """Output array for a column first seen after missing_rows rows without it."""
+    dtype = values.dtype
+    if not isinstance(dtype, np.dtype) or dtype.kind not in _NATIVE_KINDS:
+        dtype = np.dtype(object)
+    elif missing_rows and dtype.kind in "biu":
+        # Earlier files lack the column: their rows are NaN
+        dtype = np.dtype(np.float64)
+    buffer = np.empty(n_rows, dtype=dtype)
+    if missing_rows:
+        buffer[:missing_rows] = np.datetime64("NaT") if dtype.kind == "M" else np.nan
+    return buffer
+
+
+def _store(buffer: np.ndarray, values: Optional[pd.Series], start: int, end: int) -> np.ndarray:
+    """
+    Write values (None = column missing) into buffer[start:end], widening the
+    buffer (int -> float -> object) when the values do not fit its dtype.
+    Returns the buffer, which is a new array only after widening.
+    """
+    if values is None:
+        if buffer.dtype.kind in "biu":
+            buffer = buffer.astype(np.float64)
+        buffer[start:end] = np.datetime64("NaT") if buffer.dtype.kind == "M" else np.nan
+        return buffer
+    dtype = values.dtype
+    if buffer.dtype != object and dtype != buffer.dtype:
+        if buffer.dtype.kind == "M" and isinstance(dtype, np.dtype) and dtype.kind == "M":
+            pass  # another resolution; converted on assignment
+        elif isinstance(dtype, np.dtype) and dtype.kind in "iuf" and buffer.dtype.kind in "iuf":
+            buffer = buffer.astype(np.result_type(buffer.dtype, dtype, np.float64))
+        else:
+            buffer = buffer.astype(object)
+    buffer[start:end] = values.to_numpy(buffer.dtype) if buffer.dtype != object else values.to_numpy(object)
+    return buffer
+
+
+def load_dataset(
+    source: str,
+    columns: Optional[Iterable[str]] = None,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+) -> Optional[pd.DataFrame]:
+    """
+    Load all datasets under source into one canonically named DataFrame (None if empty).
+
+    Like preprocessing's streaming pass, rows are counted first and every
+    chunk is copied once into per-column arrays of the final size; a single
+    chunk (e.g. one columnar file) is returned as is.
+    """
+    n_rows = sum(_count_rows(path, chunksize) for path in resolve_dataset_paths(source))
+    if n_rows == 0:
+        return None
+    chunks = iter_dataset_chunks(source, columns, chunksize)
+    first = next(chunks)
+    if len(first) == n_rows:
+        return first.reset_index(drop=True)
+
+    buffers: Dict[str, np.ndarray] = {}
+    offset = 0
+    for chunk in itertools.chain([first], chunks):
+        end = offset + len(chunk)
+        for col in chunk.columns:
+            if col not in buffers:
+                buffers[col] = _column_buffer(chunk[col], n_rows, offset)
+            buffers[col] = _store(buffers[col], chunk[col], offset, end)
+        for col in buffers.keys() - set(chunk.columns):
+            buffers[col] = _store(buffers[col], None, offset, end)
+        offset = end
+    return pd.DataFrame(buffers, copy=False)
+
+
+def device_shards(df: pd.DataFrame) -> Dict[str, np.ndarray]:
+    """Map each device_id to the (sorted) row positions of its readings."""
+    if 'device_id' not in df.columns:
+        return {"all": np.arange(len(df))}
+    groups = df.groupby('device_id', sort=True, observed=True).indices
+    return {str(device): idx for device, idx in groups.items()}
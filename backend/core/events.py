@@ -0,0 +1,105 @@
+"""
+Versioned progress event log.
+
+Every published event gets the next version number. Readers remember the
+last version they saw and ask for what came after it, either immediately
+(delta polling) or by waiting until something new arrives (long-poll/SSE),
+so each update costs O(new events) instead of a full state snapshot.
+
+The log keeps a bounded window of recent events; a reader whose version
+fell out of the window (or predates a server restart) is told to resync
+from a full snapshot.
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+
+class EventLog:
+    """Bounded, versioned event log with async waiters."""
+
+    def __init__(self, max_events: int = 5000):
+        self._events = deque(maxlen=max_events)
+        self._version = 0
+        self._lock = threading.Lock()
+        self._changed: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def publish(self, event_type: str, data: Optional[Dict[str, Any]] = None, **extra) -> Dict[str, Any]:
+        """Append an event and wake waiting readers. Safe to call from any thread."""
+        with self._lock:
+            self._version += 1
+            event = {
+                "version": self._version,
+                "type": event_type,
+                "time": time.time(),
+                "data": data if data is not None else {},
+                **extra,
+            }
+            self._events.append(event)
+        self._notify()
+        return event
+
+    def since(self, version: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        Events newer than version, oldest first.
+
+        Returns None when the reader can't be brought up to date from the log
+        (its version was evicted or is ahead of this process) and must resync.
+        """
+        with self._lock:
+            if version > self._version:
+                return None
+            if version == self._version:
+                return []
+            oldest = self._events[0]["version"] if self._events else self._version + 1
+            if version < oldest - 1:
+                return None
+            # Versions are contiguous, so the position is arithmetic
+            start = version - oldest + 1
+            return [self._events[i] for i in range(start, len(self._events))]
+
+    async def wait_since(self, version: int, timeout: float) -> Optional[List[Dict[str, Any]]]:
+        """Like since(), but waits up to timeout seconds for at least one new event."""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._changed = asyncio.Event()
+        deadline = loop.time() + timeout
+        while True:
+            changed = self._changed
+            events = self.since(version)
+            if events is None or events:
+                return events
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return []
+            try:
+                await asyncio.wait_for(changed.wait(), remaining)
+            except asyncio.TimeoutError:
+                return []
+
+    def _wake(self):
+        changed, self._changed = self._changed, asyncio.Event()
+        if changed is not None:
+            changed.set()
+
+    def _notify(self):
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._wake()
+        else:
+            loop.call_soon_threadsafe(self._wake)
@@ -0,0 +1,148 @@
+"""
+Feature specification and encoder shared by training, clients and prediction.
+
+A FeatureSpec fixes the model input layout: the numerical columns with their
+scaler statistics, then one-hot columns for every categorical vocabulary
+(first category dropped). It is persisted as JSON next to the model so every
+component encodes readings into identical vectors, regardless of which
+categories happen to appear in its data. Encoding works on plain NumPy
+arrays or dicts; pandas is not needed.
+"""
+
+import json
+import os
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+
+from .datasets import CATEGORICAL_FEATURES, CATEGORY_VOCABULARY, NUMERICAL_FEATURES
+
+FEATURE_SPEC_FORMAT = 1
+
+
+class FeatureSpec:
+    """Column order, categorical vocabularies and scaling of the model input."""
+
+    def __init__(
+        self,
+        numerical: List[str],
+        vocabulary: Dict[str, List[str]],
+        mean: Optional[List[float]] = None,
+        scale: Optional[List[float]] = None,
+    ):
+        self.numerical = list(numerical)
+        self.vocabulary = {col: list(values) for col, values in vocabulary.items()}
+        self.mean = np.asarray(mean if mean is not None else np.zeros(len(numerical)), dtype=np.float64)
+        self.scale = np.asarray(scale if scale is not None else np.ones(len(numerical)), dtype=np.float64)
+        self._lookups = {
+            col: {value: code for code, value in enumerate(values)}
+            for col, values in self.vocabulary.items()
+        }
+
+    @classmethod
+    def default(cls) -> "FeatureSpec":
+        """The standard water-quality layout, unscaled."""
+        return cls(NUMERICAL_FEATURES, {c: CATEGORY_VOCABULARY[c] for c in CATEGORICAL_FEATURES})
+
+    def with_scaler(self, scaler) -> "FeatureSpec":
+        """Copy of this spec using a fitted StandardScaler's mean_/scale_."""
+        return FeatureSpec(self.numerical, self.vocabulary, scaler.mean_, scaler.scale_)
+
+    @property
+    def features(self) -> List[str]:
+        """Names of the encoded columns, in order."""
+        return self.numerical + [
+            f"{col}_{value}" for col, values in self.vocabulary.items() for value in values[1:]
+        ]
+
+    @property
+    def n_features(self) -> int:
+        return len(self.numerical) + sum(len(v) - 1 for v in self.vocabulary.values())
+
+    # ---------- persistence ----------
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "format": FEATURE_SPEC_FORMAT,
+            "numerical": self.numerical,
+            "vocabulary": self.vocabulary,
+            "mean": self.mean.tolist(),
+            "scale": self.scale.tolist(),
+            "features": self.features,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any]) -> "FeatureSpec":
+        if data.get("format") != FEATURE_SPEC_FORMAT:
+            raise ValueError(f"Unsupported feature spec format: {data.get('format')}")
+        return cls(data["numerical"], data["vocabulary"], data["mean"], data["scale"])
+
+    def save(self, path: str):
+        """Write the spec as JSON (via a temp file, so readers never see a partial file)."""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> "FeatureSpec":
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    # ---------- encoding ----------
+
+    def _codes(self, col: str, values) -> np.ndarray:
+        """Vocabulary codes for a column of values (-1 for unknown or missing)."""
+        categories = getattr(values, "categories", None)
+        if categories is not None:
+            # Dictionary-encoded input (e.g. a columnar Categorical): remap the small vocabulary only
+            uniques, inverse = np.asarray(categories).astype(str), np.asarray(values.codes)
+        else:
+            uniques, inverse = np.unique(np.asarray(values).astype(str), return_inverse=True)
+        lookup = self._lookups[col]
+        # Trailing -1 so that input code -1 (missing) maps to -1
+        mapped = np.array([lookup.get(u, -1) for u in uniques] + [-1], dtype=np.int64)
+        return mapped[inverse.reshape(-1)]
+
+    def encode_columns(self, columns: Mapping[str, Any], out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Encode column arrays into a float32 (n, n_features) matrix.
+
+        columns maps names to array-likes of equal length; missing numerical
+        columns become NaN, missing categorical columns all-zero. If out is
+        given (e.g. a row slice of a memmap) it is filled in place.
+        """
+        n = len(next(iter(columns.values()))) if columns else 0
+        if out is None:
+            out = np.empty((n, self.n_features), dtype=np.float32)
+
+        n_num = len(self.numerical)
+        for j, col in enumerate(self.numerical):
+            if col in columns:
+                values = np.asarray(columns[col], dtype=np.float64)
+                out[:, j] = (values - self.mean[j]) / self.scale[j]
+            else:
+                out[:, j] = np.nan
+
+        out[:, n_num:] = 0.0
+        rows = np.arange(n)
+        offset = n_num
+        for col, values in self.vocabulary.items():
+            if col in columns:
+                codes = self._codes(col, columns[col])
+                hit = codes > 0
+                out[rows[hit], offset + codes[hit] - 1] = 1.0
+            offset += len(values) - 1
+        return out
+
+    def encode_records(self, records: Iterable[Mapping[str, Any]], out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Encode a sequence of reading dicts (e.g. API payloads)."""
+        records = list(records)
+        columns = {
+            name: [r.get(name) for r in records]
+            for name in self.numerical + list(self.vocabulary)
+            if any(name in r for r in records)
+        }
+        if not columns:
+            columns = {self.numerical[0]: [None] * len(records)}
+        return self.encode_columns(columns, out)
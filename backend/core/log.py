@@ -0,0 +1,192 @@
+"""
+Structured, non-blocking logging.
+
+configure_logging() routes every stdlib logger through a QueueHandler: the
+calling thread only merges the message and enqueues the record, and a
+QueueListener thread formats it (JSON lines or plain text) and writes it to
+stderr, so request handlers and training loops never wait on terminal or
+pipe I/O, and stdout stays clean for command output (benchmark reports).
+
+Each record carries the current request ID. RequestIdMiddleware takes it
+from an incoming X-Request-ID header (or generates one), exposes it to log
+records through a context variable and echoes it in the response headers.
+
+Production mode (LOG_PRODUCTION=true) calls logging.disable(DEBUG), so
+logger.debug(...) returns at its first check without building a record.
+Use %-style arguments (logger.debug("x=%s", x)) so that skipped calls don't
+format their message either.
+
+Settings (environment): LOG_LEVEL, LOG_FORMAT (json|text), LOG_PRODUCTION.
+"""
+
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import os
+import queue
+import sys
+import time
+import uuid
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+REQUEST_ID_HEADER = b"x-request-id"
+
+request_id_var: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else was passed via extra= and is
+# emitted as a structured field
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "request_id"}
+
+_listener: Optional[QueueListener] = None
+
+
+def get_request_id() -> Optional[str]:
+    """The request ID of the current request/task context, if any."""
+    return request_id_var.get()
+
+
+class RequestIdFilter(logging.Filter):
+    """Stamps records with the current request ID (runs in the logging thread's caller)."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: ts, level, logger, msg, request_id, extra fields, exc."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Human-readable lines with the request ID when there is one."""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s%(rid)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        request_id = getattr(record, "request_id", None)
+        record.rid = f" [{request_id}]" if request_id else ""
+        return super().format(record)
+
+
+class _EnqueueHandler(QueueHandler):
+    """QueueHandler that does the minimum in the caller: merge args and render the traceback."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def configure_logging(
+    level: Optional[str] = None,
+    fmt: Optional[str] = None,
+    production: Optional[bool] = None,
+) -> None:
+    """
+    Install queue-based logging on the root logger (idempotent).
+
+    Arguments default to LOG_LEVEL (DEBUG when DEBUG=true, else INFO),
+    LOG_FORMAT (json) and LOG_PRODUCTION (false).
+    """
+    global _listener
+
+    if production is None:
+        production = os.getenv("LOG_PRODUCTION", "false").lower() == "true"
+    if level is None:
+        level = os.getenv("LOG_LEVEL") or ("DEBUG" if os.getenv("DEBUG", "True").lower() == "true" else "INFO")
+    if fmt is None:
+        fmt = os.getenv("LOG_FORMAT", "json")
+
+    level_no = logging.getLevelName(level.upper()) if isinstance(level, str) else level
+    if not isinstance(level_no, int):
+        level_no = logging.INFO
+    if production:
+        level_no = max(level_no, logging.INFO)
+        logging.disable(logging.DEBUG)
+
+    root = logging.getLogger()
+    root.setLevel(level_no)
+
+    if _listener is not None:
+        # Already configured: only the level/format may change
+        for handler in _listener.handlers:
+            handler.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+        return
+
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(JsonFormatter() if fmt == "json" else TextFormatter())
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    enqueue = _EnqueueHandler(log_queue)
+    enqueue.addFilter(RequestIdFilter())
+
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(enqueue)
+
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class RequestIdMiddleware:
+    """ASGI middleware assigning each HTTP request an ID for its log records."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope.get("headers", ()):
+            if name == REQUEST_ID_HEADER:
+                request_id = value.decode("latin-1")[:64]
+                break
+        request_id = request_id or uuid.uuid4().hex[:16]
+        token = request_id_var.set(request_id)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + [(REQUEST_ID_HEADER, request_id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
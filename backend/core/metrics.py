@@ -0,0 +1,312 @@
+"""
+Prometheus-format runtime metrics.
+
+A small in-process registry of counters, gauges and histograms rendered in
+the Prometheus text exposition format (version 0.0.4), plus an ASGI
+middleware that records request count, latency and in-flight requests per
+route template. install_metrics(app) adds the middleware and a GET /metrics
+endpoint to a FastAPI app; both the admin and the client server use it.
+
+Collectors registered with REGISTRY.register_collector() are called at scrape
+time for values that live elsewhere (e.g. the database pool telemetry).
+"""
+
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from starlette.responses import Response
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+# (name, labels, value) tuples of one metric family
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _escape_label(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_sample(name: str, labels: Dict[str, str], value: float) -> str:
+    if labels:
+        label_str = ",".join(f'{k}="{_escape_label(v)}"' for k, v in labels.items())
+        return f"{name}{{{label_str}}} {_format_value(value)}"
+    return f"{name} {_format_value(value)}"
+
+
+def render_family(name: str, metric_type: str, documentation: str, samples: Iterable[Sample]) -> List[str]:
+    """Exposition lines of one metric family."""
+    lines = [
+        f"# HELP {name} {_escape_help(documentation)}",
+        f"# TYPE {name} {metric_type}",
+    ]
+    lines.extend(_format_sample(*sample) for sample in samples)
+    return lines
+
+
+class Registry:
+    """Holds metrics and scrape-time collectors; render() produces the exposition text."""
+
+    def __init__(self):
+        self._metrics: Dict[str, "_Metric"] = {}
+        self._collectors: List[Callable[[], List[str]]] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: "_Metric"):
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} already registered")
+            self._metrics[metric.name] = metric
+
+    def register_collector(self, collector: Callable[[], List[str]]):
+        """Add a function returning exposition lines (see render_family), called on every scrape."""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        for metric in metrics:
+            lines.extend(metric.render())
+        for collector in collectors:
+            try:
+                lines.extend(collector())
+            except Exception as e:
+                lines.append(f"# collector error: {type(e).__name__}: {e}".replace("\n", " "))
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+
+class _Metric:
+    metric_type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 registry: Optional[Registry] = REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[tuple, object] = {}
+        self._lock = threading.Lock()
+        if registry is not None:
+            registry.register(self)
+
+    def _key(self, labels: Dict[str, object]) -> tuple:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        try:
+            return tuple(str(labels[name]) for name in self.labelnames)
+        except KeyError:
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+
+    def _labels(self, key: tuple) -> Dict[str, str]:
+        return dict(zip(self.labelnames, key))
+
+    def samples(self) -> List[Sample]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        return render_family(self.name, self.metric_type, self.documentation, self.samples())
+
+
+class Counter(_Metric):
+    """Monotonically increasing count."""
+
+    metric_type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            items = list(self._values.items())
+        return [(self.name, self._labels(key), value) for key, value in items]
+
+
+class Gauge(_Metric):
+    """Value that goes up and down."""
+
+    metric_type = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            items = list(self._values.items())
+        if not items and not self.labelnames:
+            items = [((), 0.0)]
+        return [(self.name, self._labels(key), value) for key, value in items]
+
+
+class Histogram(_Metric):
+    """Distribution of observations in cumulative buckets (plus _sum and _count)."""
+
+    metric_type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS, registry: Optional[Registry] = REGISTRY):
+        self.buckets = tuple(sorted(float(b) for b in buckets if not math.isinf(b)))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [per-bucket counts (last = +Inf), sum]
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall time of the with-block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            items = [(key, (list(state[0]), state[1])) for key, state in self._values.items()]
+        samples: List[Sample] = []
+        for key, (counts, total) in items:
+            labels = self._labels(key)
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+            samples.append((f"{self.name}_sum", labels, total))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+# ==================== Shared metrics ====================
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests handled", ("method", "route", "status"))
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "HTTP request latency", ("method", "route"))
+HTTP_IN_FLIGHT = Gauge(
+    "http_requests_in_flight", "HTTP requests currently being handled")
+
+MODEL_INFERENCE_DURATION = Histogram(
+    "model_inference_duration_seconds", "Model predict() latency per request", ("endpoint",),
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5))
+MODEL_SAVE_DURATION = Histogram(
+    "model_save_duration_seconds", "Time to write a trained model in one format", ("format",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30))
+MODEL_LOAD_DURATION = Histogram(
+    "model_load_duration_seconds", "Time to load a saved model, by the format it was loaded from", ("format",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30))
+TRAINING_ROUND_DURATION = Histogram(
+    "training_round_duration_seconds", "Duration of one federated training round", ("mode",),
+    buckets=(0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800))
+CLIENT_FANOUT_REQUEST_DURATION = Histogram(
+    "client_fanout_request_duration_seconds", "Latency of one admin-to-client request during a fan-out",
+    # No client_id: anyone can register clients, so its values are unbounded
+    ("operation", "outcome"))
+CLIENT_FANOUT_DURATION = Histogram(
+    "client_fanout_duration_seconds", "Total duration of a fan-out across all registered clients",
+    ("operation",))
+PREDICTION_CACHE_REQUESTS = Counter(
+    "prediction_cache_requests_total", "Prediction cache lookups per reading", ("endpoint", "result"))
+PREDICTION_CACHE_ENTRIES = Gauge(
+    "prediction_cache_entries", "Readings currently held in the prediction cache")
+SHADOW_PREDICTIONS = Counter(
+    "shadow_predictions_total", "Readings offered to the shadow model, by outcome", ("version", "outcome"))
+SHADOW_INFERENCE_DURATION = Histogram(
+    "shadow_inference_duration_seconds", "Shadow model predict() latency per batch", ("version",),
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5))
+SHADOW_QUEUE_DEPTH = Gauge(
+    "shadow_queue_depth", "Prediction samples waiting for the shadow model")
+
+
+# ==================== ASGI middleware ====================
+
+class MetricsMiddleware:
+    """
+    Records http_requests_total, http_request_duration_seconds and
+    http_requests_in_flight. Routes are labelled by their path template
+    (e.g. /api/clients/{client_id}); unmatched paths share one label so
+    scanners can't blow up label cardinality.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"code": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            HTTP_IN_FLIGHT.dec()
+            route = scope.get("route")
+            route_label = getattr(route, "path", None) or "unmatched"
+            method = scope.get("method", "")
+            HTTP_REQUESTS.inc(method=method, route=route_label, status=status["code"])
+            HTTP_REQUEST_DURATION.observe(elapsed, method=method, route=route_label)
+
+
+def metrics_response(registry: Registry = REGISTRY) -> Response:
+    """Current metrics as a Prometheus text-format response."""
+    return Response(registry.render(), media_type=CONTENT_TYPE)
+
+
+def install_metrics(app, path: str = "/metrics"):
+    """Add MetricsMiddleware and a GET `path` scrape endpoint to a FastAPI app."""
+    app.add_middleware(MetricsMiddleware)
+
+    @app.get(path, include_in_schema=False)
+    async def metrics():
+        return metrics_response()
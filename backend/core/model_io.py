@@ -0,0 +1,142 @@
+"""
+Saving and loading trained models.
+
+save_model_files() writes a Keras model into a directory in each requested
+format. Every file goes to a temp file first and is os.replace()d into
+place:
+
+    h5     model.h5      legacy HDF5; the file artifacts, downloads and clients use
+    keras  model.keras   native Keras archive
+    npz    weights.npz   architecture JSON plus the raw weight arrays (no HDF5,
+                         no optimizer state): the fastest to load for serving
+
+load_model_files() loads the fastest format present. A model loaded from
+weights.npz is not compiled, which is all predict() needs.
+
+Training saves on the single model writer thread (run_in_writer), so disk
+I/O never blocks the event loop. Save and load times are recorded per
+format in model_save_duration_seconds / model_load_duration_seconds.
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .metrics import MODEL_LOAD_DURATION, MODEL_SAVE_DURATION
+from .registry import FEATURES_FILE, KERAS_FILE, MODEL_FILE, SCALER_FILE, WEIGHTS_FILE, ModelRegistry
+
+logger = logging.getLogger(__name__)
+
+SAVE_FORMATS = {"h5": MODEL_FILE, "keras": KERAS_FILE, "npz": WEIGHTS_FILE}
+# Fastest to load first
+LOAD_PREFERENCE = ["npz", "keras", "h5"]
+
+_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-writer")
+
+
+def parse_formats(value: str) -> List[str]:
+    """Formats from a comma-separated setting; h5 is always included."""
+    formats = [f.strip().lower() for f in value.split(",") if f.strip()]
+    unknown = [f for f in formats if f not in SAVE_FORMATS]
+    if unknown:
+        raise ValueError(f"Unknown model format(s) {unknown}; choose from {sorted(SAVE_FORMATS)}")
+    return ["h5"] + [f for f in dict.fromkeys(formats) if f != "h5"]
+
+
+def _temp_path(path: str) -> str:
+    # Keep the extension: Keras and NumPy pick the format from it
+    base, ext = os.path.splitext(path)
+    return f"{base}.{uuid.uuid4().hex[:8]}.tmp{ext}"
+
+
+def atomic_save(save: Callable[[str], Any], path: str):
+    """Call save(temp_path), then rename the result over path."""
+    tmp_path = _temp_path(path)
+    try:
+        save(tmp_path)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _save_npz(model, path: str):
+    weights = {f"w{i}": w for i, w in enumerate(model.get_weights())}
+    with open(path, "wb") as f:
+        np.savez(f, architecture=np.array(model.to_json()), **weights)
+
+
+def _load_npz(path: str):
+    from keras.models import model_from_json
+    with np.load(path) as data:
+        model = model_from_json(str(data["architecture"]))
+        model.set_weights([data[f"w{i}"] for i in range(len(data.files) - 1)])
+    return model
+
+
+def save_model_files(model, directory: str, formats: List[str]) -> Dict[str, float]:
+    """Write model into directory in each format; returns the seconds each took."""
+    seconds = {}
+    for fmt in formats:
+        path = os.path.join(directory, SAVE_FORMATS[fmt])
+        start = time.perf_counter()
+        if fmt == "npz":
+            atomic_save(lambda tmp: _save_npz(model, tmp), path)
+        else:
+            atomic_save(model.save, path)
+        seconds[fmt] = time.perf_counter() - start
+        MODEL_SAVE_DURATION.observe(seconds[fmt], format=fmt)
+    return seconds
+
+
+def load_model_files(directory: str):
+    """Load the model in directory from the fastest format present."""
+    for fmt in LOAD_PREFERENCE:
+        path = os.path.join(directory, SAVE_FORMATS[fmt])
+        if not os.path.exists(path):
+            continue
+        start = time.perf_counter()
+        if fmt == "npz":
+            model = _load_npz(path)
+        else:
+            from keras.models import load_model
+            model = load_model(path)
+        elapsed = time.perf_counter() - start
+        MODEL_LOAD_DURATION.observe(elapsed, format=fmt)
+        logger.info("Loaded %s in %.3fs", path, elapsed)
+        return model
+    raise FileNotFoundError(f"No saved model in {directory}")
+
+
+def save_version(registry: ModelRegistry, model, scaler, feature_spec, formats: List[str],
+                 metadata: Optional[Dict[str, Any]] = None) -> Tuple[str, Dict[str, float]]:
+    """
+    Write model, scaler and feature spec as a new registry version (blocking;
+    run it with run_in_writer). Returns the version and per-file write seconds,
+    which are also stored in its metadata as save_seconds.
+    """
+    import joblib
+
+    with registry.stage() as staged:
+        seconds = save_model_files(model, staged.directory, formats)
+        start = time.perf_counter()
+        atomic_save(lambda tmp: joblib.dump(scaler, tmp), staged.path(SCALER_FILE))
+        seconds["scaler"] = time.perf_counter() - start
+        if feature_spec is not None:
+            feature_spec.save(staged.path(FEATURES_FILE))
+        version = staged.commit({**(metadata or {}), "save_seconds": seconds})
+    return version, seconds
+
+
+async def run_in_writer(func: Callable, *args, **kwargs):
+    """Run func on the model writer thread and await it; writes run one at a time, in order."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_writer, functools.partial(func, *args, **kwargs))
@@ -0,0 +1,189 @@
+"""
+Federated data partitioning.
+
+Partitioners assign rows of one shared feature matrix to simulated clients
+and return only row indices; client data is gathered from the shared arrays
+on demand, so memory per client is O(indices) rather than O(data).
+Contiguous index ranges are stored as slices, which NumPy serves as views.
+
+Strategies:
+    contiguous  equal consecutive index ranges (previous behaviour)
+    device      one client per device_id (devices merged when clients < devices)
+    dirichlet   label-skewed non-IID split with Dirichlet(alpha) class proportions
+    time        consecutive time windows ordered by timestamp
+"""
+
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+PARTITION_STRATEGIES = ("contiguous", "device", "dirichlet", "time")
+
+Index = Union[slice, np.ndarray]
+
+
+def _index_dtype(n: int):
+    return np.int32 if n < np.iinfo(np.int32).max else np.int64
+
+
+def _compact(indices: np.ndarray) -> Index:
+    """Turn a sorted run of consecutive indices into a slice (zero-copy view)."""
+    if len(indices) and indices[-1] - indices[0] == len(indices) - 1:
+        return slice(int(indices[0]), int(indices[-1]) + 1)
+    return indices.astype(_index_dtype(int(indices[-1]) + 1 if len(indices) else 0), copy=False)
+
+
+class ClientShard:
+    """The rows of a shared X/y that belong to one simulated client."""
+
+    __slots__ = ("client_id", "index", "devices", "_X", "_y")
+
+    def __init__(self, client_id: str, index: Index, X: np.ndarray, y: np.ndarray, devices=None):
+        self.client_id = client_id
+        self.index = index
+        self.devices = devices or []
+        self._X = X
+        self._y = y
+
+    def __len__(self) -> int:
+        if isinstance(self.index, slice):
+            return self.index.stop - self.index.start
+        return len(self.index)
+
+    @property
+    def indices(self) -> np.ndarray:
+        """Row positions in the shared arrays (materialized for slices)."""
+        if isinstance(self.index, slice):
+            return np.arange(self.index.start, self.index.stop, dtype=_index_dtype(self.index.stop))
+        return self.index
+
+    @property
+    def X(self) -> np.ndarray:
+        """Client features; a view for slice shards, a gathered copy otherwise."""
+        return self._X[self.index]
+
+    @property
+    def y(self) -> np.ndarray:
+        return self._y[self.index]
+
+    def take(self, rows: np.ndarray):
+        """Gather (X, y) for a subset of this client's global row indices."""
+        return self._X[rows], self._y[rows]
+
+
+def partition_contiguous(n: int, num_clients: int) -> Dict[str, Index]:
+    """Split range(n) into num_clients consecutive slices; the last takes the remainder."""
+    per_client = n // num_clients
+    parts = {}
+    for i in range(num_clients):
+        start = i * per_client
+        end = n if i == num_clients - 1 else (i + 1) * per_client
+        parts[f"client_{i+1}"] = slice(start, end)
+    return parts
+
+
+def partition_by_device(device_shards: Dict[str, np.ndarray], num_clients: Optional[int] = None):
+    """
+    One client per device. With fewer clients than devices, devices are merged
+    greedily (largest first onto the least-loaded client) to balance row counts.
+
+    Returns (parts, devices_per_client).
+    """
+    devices = sorted(device_shards, key=lambda d: len(device_shards[d]), reverse=True)
+    n_clients = len(devices) if not num_clients else min(num_clients, len(devices))
+
+    members = [[] for _ in range(n_clients)]
+    loads = np.zeros(n_clients, dtype=np.int64)
+    for device in devices:
+        target = int(np.argmin(loads))
+        members[target].append(device)
+        loads[target] += len(device_shards[device])
+
+    parts, owners = {}, {}
+    for i, group in enumerate(members):
+        idx = np.sort(np.concatenate([device_shards[d] for d in group]))
+        parts[f"client_{i+1}"] = _compact(idx)
+        owners[f"client_{i+1}"] = sorted(group)
+    return parts, owners
+
+
+def partition_dirichlet(
+    y: np.ndarray,
+    num_clients: int,
+    alpha: float = 0.5,
+    seed: int = 42,
+    min_samples: int = 10,
+    max_attempts: int = 100,
+) -> Dict[str, Index]:
+    """
+    Non-IID split: each class is divided among clients with proportions drawn
+    from Dirichlet(alpha). Smaller alpha gives more skewed label mixes.
+    Redraws until every client has at least min_samples rows.
+    """
+    rng = np.random.default_rng(seed)
+    labels = np.asarray(y).astype(np.int64, copy=False)
+    classes = np.unique(labels)
+    by_class = [rng.permutation(np.flatnonzero(labels == c)) for c in classes]
+
+    for _ in range(max_attempts):
+        buckets = [[] for _ in range(num_clients)]
+        for idx in by_class:
+            proportions = rng.dirichlet(np.full(num_clients, alpha))
+            cuts = (np.cumsum(proportions)[:-1] * len(idx)).astype(np.int64)
+            for client, part in enumerate(np.split(idx, cuts)):
+                buckets[client].append(part)
+        sizes = [sum(len(p) for p in b) for b in buckets]
+        if min(sizes) >= min_samples:
+            break
+    else:
+        raise ValueError(
+            f"Could not give each of {num_clients} clients {min_samples} samples "
+            f"with alpha={alpha}; use fewer clients or a larger alpha"
+        )
+
+    return {
+        f"client_{i+1}": _compact(np.sort(np.concatenate(b)))
+        for i, b in enumerate(buckets)
+    }
+
+
+def partition_time_windows(timestamps: np.ndarray, num_clients: int) -> Dict[str, Index]:
+    """Split rows into num_clients consecutive windows of (roughly) equal size in time order."""
+    order = np.argsort(timestamps, kind="stable")
+    return {
+        f"client_{i+1}": _compact(np.sort(window))
+        for i, window in enumerate(np.array_split(order, num_clients))
+    }
+
+
+def partition(
+    strategy: str,
+    X: np.ndarray,
+    y: np.ndarray,
+    num_clients: int,
+    device_shards: Optional[Dict[str, np.ndarray]] = None,
+    timestamps: Optional[np.ndarray] = None,
+    alpha: float = 0.5,
+    seed: int = 42,
+) -> Dict[str, ClientShard]:
+    """Partition the shared X/y among clients with the given strategy."""
+    owners = {}
+    if strategy == "contiguous":
+        parts = partition_contiguous(len(X), num_clients)
+    elif strategy == "device":
+        if not device_shards:
+            raise ValueError("device partitioning needs device_shards")
+        parts, owners = partition_by_device(device_shards, num_clients)
+    elif strategy == "dirichlet":
+        parts = partition_dirichlet(y, num_clients, alpha=alpha, seed=seed)
+    elif strategy == "time":
+        if timestamps is None:
+            raise ValueError("time partitioning needs timestamps")
+        parts = partition_time_windows(timestamps, num_clients)
+    else:
+        raise ValueError(f"Unknown partition strategy '{strategy}'. Choose from {PARTITION_STRATEGIES}")
+
+    return {
+        client_id: ClientShard(client_id, index, X, y, owners.get(client_id))
+        for client_id, index in parts.items()
+    }
@@ -0,0 +1,84 @@
+"""
+LRU cache of model predictions for repeated sensor readings.
+
+Devices report values at a fixed decimal precision, and an idle device
+sends the same pressure, TDS and pH again and again. The predict endpoints
+look each reading up by a key made of the serving model generation and the
+reading's values, with floats rounded to `decimals` places. Hits skip
+encoding and inference. Because the key includes the model generation, an
+entry can never be served for a different model, and clear() on every
+model swap frees the old entries at once.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
+
+from .metrics import PREDICTION_CACHE_ENTRIES, PREDICTION_CACHE_REQUESTS
+
+
+class PredictionCache:
+    """Bounded LRU map from (model generation, quantized reading) to unsafe probability."""
+
+    def __init__(self, capacity: int = 10_000, decimals: int = 3):
+        self.capacity = capacity
+        self.decimals = decimals
+        self._entries: "OrderedDict[Hashable, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.capacity > 0
+
+    def key(self, generation: Any, record: Dict[str, Any]) -> Tuple:
+        decimals = self.decimals
+        return (generation,) + tuple(
+            round(value, decimals) if isinstance(value, float) else value for value in record.values()
+        )
+
+    def get_many(self, keys: List[Hashable], endpoint: str) -> List[Optional[float]]:
+        """Cached probability of each key, None for misses."""
+        with self._lock:
+            entries = self._entries
+            values = [entries.get(key) for key in keys]
+            for key, value in zip(keys, values):
+                if value is not None:
+                    entries.move_to_end(key)
+        hits = sum(value is not None for value in values)
+        self.hits += hits
+        self.misses += len(keys) - hits
+        if hits:
+            PREDICTION_CACHE_REQUESTS.inc(hits, endpoint=endpoint, result="hit")
+        if hits < len(keys):
+            PREDICTION_CACHE_REQUESTS.inc(len(keys) - hits, endpoint=endpoint, result="miss")
+        return values
+
+    def put_many(self, keys: List[Hashable], values: Iterable[float]):
+        with self._lock:
+            entries = self._entries
+            for key, value in zip(keys, values):
+                entries[key] = value
+                entries.move_to_end(key)
+            while len(entries) > self.capacity:
+                entries.popitem(last=False)
+            size = len(entries)
+        PREDICTION_CACHE_ENTRIES.set(size)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        PREDICTION_CACHE_ENTRIES.set(0)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "capacity": self.capacity,
+            "decimals": self.decimals,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else None,
+        }
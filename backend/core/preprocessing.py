@@ -0,0 +1,133 @@
+"""
+Chunked streaming preprocessing.
+
+Builds the float32 feature matrix in two passes over the dataset chunks
+instead of materializing a DataFrame, a scaled copy and a one-hot copy:
+
+    pass 1  fit the StandardScaler with partial_fit (running moments) and count rows
+    pass 2  encode each chunk with the FeatureSpec encoder (fixed category
+            vocabulary and column order) straight into a preallocated (or
+            memory-mapped) float32 matrix
+
+Peak memory is the output matrix plus one chunk, so histories larger than
+RAM can be prepared by passing out_dir (X/y are then .npy memmaps on disk).
+"""
+
+import os
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import StandardScaler
+
+from .datasets import CATEGORICAL_FEATURES, DEFAULT_CHUNKSIZE, NUMERICAL_FEATURES, iter_dataset_chunks
+from .features import FeatureSpec
+
+
+def compute_unsafe(df: pd.DataFrame) -> np.ndarray:
+    """Vectorized create_target over a whole DataFrame (1 = unsafe)."""
+    unsafe = np.zeros(len(df), dtype=bool)
+    if 'alert' in df.columns:
+        unsafe |= df['alert'].notna().to_numpy()
+    for col, values in [
+        ('pressure_status', ['High', 'Low']),
+        ('tds_status', ['Poor']),
+        ('ph_status', ['Acidic', 'Alkaline']),
+        ('sensor_status', ['Fault']),
+    ]:
+        if col in df.columns:
+            unsafe |= df[col].isin(values).to_numpy()
+    return unsafe.astype(np.int64)
+
+
+def feature_names() -> list:
+    """Column order of the prepared feature matrix."""
+    return FeatureSpec.default().features
+
+
+def _allocate(shape, out_dir: Optional[str], name: str):
+    if out_dir is None:
+        return np.empty(shape, dtype=np.float32)
+    return np.lib.format.open_memmap(os.path.join(out_dir, f"{name}.npy"), mode="w+",
+                                     dtype=np.float32, shape=shape)
+
+
+def _encode_chunk(chunk: pd.DataFrame, spec: FeatureSpec, X_block: np.ndarray):
+    """Scale and one-hot encode one chunk into X_block (a row slice of X)."""
+    columns = {c: chunk[c].values for c in NUMERICAL_FEATURES + CATEGORICAL_FEATURES if c in chunk.columns}
+    spec.encode_columns(columns, out=X_block)
+
+
+def prepare_features_streaming(
+    source: str,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    out_dir: Optional[str] = None,
+    collect_timestamps: bool = False,
+) -> Optional[Dict[str, Any]]:
+    """
+    Stream a dataset (file, directory or glob) into a float32 feature matrix.
+
+    Returns X, y, the fitted scaler and FeatureSpec, feature names, per-device
+    row shards and (optionally) int64 nanosecond timestamps, or None if there
+    is no data.
+    """
+    # Pass 1: running mean/variance for the scaler
+    scaler = StandardScaler()
+    n_rows = 0
+    for chunk in iter_dataset_chunks(source, NUMERICAL_FEATURES, chunksize):
+        numeric = np.column_stack([
+            chunk[c].to_numpy(np.float64, na_value=np.nan) if c in chunk.columns else np.full(len(chunk), np.nan)
+            for c in NUMERICAL_FEATURES
+        ])
+        scaler.partial_fit(numeric)
+        n_rows += len(chunk)
+    if n_rows == 0:
+        return None
+
+    spec = FeatureSpec.default().with_scaler(scaler)
+    features = spec.features
+    if out_dir is not None:
+        os.makedirs(out_dir, exist_ok=True)
+    X = _allocate((n_rows, len(features)), out_dir, "X")
+    y = _allocate((n_rows,), out_dir, "y")
+    device_codes = np.empty(n_rows, dtype=np.int32)
+    device_names: Dict[str, int] = {}
+    timestamps = np.empty(n_rows, dtype=np.int64) if collect_timestamps else None
+
+    # Pass 2: encode chunk by chunk straight into the output buffers
+    columns = ['timestamp', 'device_id'] + NUMERICAL_FEATURES + CATEGORICAL_FEATURES + ['alert']
+    offset = 0
+    for chunk in iter_dataset_chunks(source, columns, chunksize):
+        end = offset + len(chunk)
+        _encode_chunk(chunk, spec, X[offset:end])
+        y[offset:end] = compute_unsafe(chunk)
+
+        codes, uniques = pd.factorize(chunk['device_id'].astype(str))
+        lookup = np.array([device_names.setdefault(u, len(device_names)) for u in uniques], dtype=np.int32)
+        device_codes[offset:end] = lookup[codes]
+
+        if timestamps is not None:
+            ts = pd.to_datetime(chunk['timestamp'], errors='coerce') if 'timestamp' in chunk.columns \
+                else pd.Series(pd.NaT, index=chunk.index)
+            timestamps[offset:end] = ts.to_numpy('datetime64[ns]').view(np.int64)
+        offset = end
+
+    if out_dir is not None:
+        X.flush()
+        y.flush()
+
+    # Per-device row shards from the device codes
+    order = np.argsort(device_codes, kind='stable')
+    counts = np.bincount(device_codes, minlength=len(device_names))
+    splits = np.split(order, np.cumsum(counts)[:-1])
+    shards = {name: splits[code] for name, code in sorted(device_names.items())}
+
+    return {
+        "X": X,
+        "y": y,
+        "scaler": scaler,
+        "feature_spec": spec,
+        "features": features,
+        "device_shards": shards,
+        "timestamps": timestamps,
+    }
@@ -0,0 +1,312 @@
+"""
+Opt-in profiling for request handlers and training runs.
+
+Two modes:
+
+    cprofile  deterministic cProfile per phase; writes <phase>.prof files
+              (pstats format: snakeviz, flameprof, `python -m pstats`) and a
+              merged all.prof
+    sample    a background thread samples the profiled thread's stack every
+              PROFILE_SAMPLE_INTERVAL_MS and writes stacks.collapsed in the
+              folded format read by flamegraph.pl, speedscope and inferno,
+              with the phase name as the root frame
+
+Each profile is written to its own directory under PROFILE_DIR together with
+summary.txt (wall time per phase, top functions) and profile.json.
+
+Profiles are switched on per request with an `X-Profile: cprofile|sample`
+header, per training run with `X-Profile-Training` on POST
+/api/training/start, or for every training run with PROFILE_TRAINING.
+Headers are honored only when PROFILING_ENABLED=true and the request carries
+an admin access token (see configure_profiling).
+
+Profiler.phase() profiles the calling thread; Profiler.call() profiles a
+function in whatever thread runs it, so work handed to asyncio.to_thread is
+captured too. Profiling on the event loop thread also records other
+coroutines that run while the phase is open.
+"""
+
+import asyncio
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ("cprofile", "sample")
+PROFILE_HEADER = b"x-profile"
+
+DEFAULT_PROFILE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "profiles")
+
+_settings = {
+    "enabled": False,
+    "directory": DEFAULT_PROFILE_DIR,
+    "interval": 0.005,
+    "authorize": None,
+}
+
+# cProfile has one active profiler per thread; a second enable() would
+# silently replace the first, so overlapping cprofile phases are skipped
+_cprofile_lock = threading.Lock()
+
+
+def configure_profiling(
+    enabled: bool = False,
+    directory: Optional[str] = None,
+    sample_interval_ms: float = 5.0,
+    authorize: Optional[Callable[[Optional[str]], bool]] = None,
+):
+    """
+    Set up header-driven profiling.
+
+    authorize receives the request's Authorization header value and returns
+    whether it may turn profiling on; without it, headers are ignored.
+    """
+    _settings["enabled"] = enabled
+    _settings["directory"] = directory or DEFAULT_PROFILE_DIR
+    _settings["interval"] = max(sample_interval_ms, 0.1) / 1000.0
+    _settings["authorize"] = authorize
+
+
+def header_mode(value: Optional[str], authorization: Optional[str]) -> Optional[str]:
+    """The profiling mode a request asked for, or None if it isn't allowed or valid."""
+    if not value or not _settings["enabled"] or _settings["authorize"] is None:
+        return None
+    mode = value.strip().lower()
+    if mode not in PROFILE_MODES:
+        return None
+    try:
+        allowed = _settings["authorize"](authorization)
+    except Exception:
+        allowed = False
+    return mode if allowed else None
+
+
+def _frame_name(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _collapse(frame) -> str:
+    names = []
+    while frame is not None:
+        names.append(_frame_name(frame.f_code).replace(";", ":"))
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class _Sampler(threading.Thread):
+    """Samples the stacks of registered threads into folded-stack counts."""
+
+    def __init__(self, interval: float):
+        super().__init__(name="profile-sampler", daemon=True)
+        self.interval = interval
+        self.targets: Dict[int, str] = {}
+        self.stacks: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            targets = list(self.targets.items())
+            if not targets:
+                continue
+            frames = sys._current_frames()
+            for thread_id, phase in targets:
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    self.stacks[f"{phase};{_collapse(frame)}"] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class Profiler:
+    """Collects one profile (a request or a training run), split into named phases."""
+
+    def __init__(self, mode: str, label: str):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profiling mode: {mode}")
+        self.mode = mode
+        self.label = label
+        self.started = time.time()
+        self.phase_seconds: Dict[str, float] = {}
+        self.skipped_phases: Counter = Counter()
+        self._profiles: Dict[str, cProfile.Profile] = {}
+        self._sampler: Optional[_Sampler] = None
+        if mode == "sample":
+            self._sampler = _Sampler(_settings["interval"])
+            self._sampler.start()
+
+    @contextmanager
+    def phase(self, name: str):
+        """Profile the current thread for the duration of the with-block."""
+        start = time.perf_counter()
+        if self.mode == "cprofile":
+            if not _cprofile_lock.acquire(blocking=False):
+                self.skipped_phases[name] += 1
+                try:
+                    yield
+                finally:
+                    self._add_time(name, start)
+                return
+            profile = self._profiles.setdefault(name, cProfile.Profile())
+            profile.enable()
+            try:
+                yield
+            finally:
+                profile.disable()
+                _cprofile_lock.release()
+                self._add_time(name, start)
+        else:
+            thread_id = threading.get_ident()
+            previous = self._sampler.targets.get(thread_id)
+            self._sampler.targets[thread_id] = name
+            try:
+                yield
+            finally:
+                if previous is None:
+                    self._sampler.targets.pop(thread_id, None)
+                else:
+                    self._sampler.targets[thread_id] = previous
+                self._add_time(name, start)
+
+    def call(self, name: str, func: Callable, *args, **kwargs):
+        """Run func(*args, **kwargs) inside phase `name` in the calling thread."""
+        with self.phase(name):
+            return func(*args, **kwargs)
+
+    def _add_time(self, name: str, start: float):
+        self.phase_seconds[name] = self.phase_seconds.get(name, 0.0) + time.perf_counter() - start
+
+    def save(self, directory: Optional[str] = None) -> str:
+        """Stop sampling and write the profile; returns its directory."""
+        if self._sampler is not None:
+            self._sampler.stop()
+
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started))
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", self.label).strip("_")[:80] or "profile"
+        out_dir = os.path.join(directory or _settings["directory"], f"{stamp}-{slug}-{self.mode}")
+        suffix = 1
+        while os.path.exists(out_dir):
+            suffix += 1
+            out_dir = os.path.join(directory or _settings["directory"], f"{stamp}-{slug}-{self.mode}-{suffix}")
+        os.makedirs(out_dir)
+
+        files = []
+        summary = io.StringIO()
+        summary.write(f"{self.label} ({self.mode})\n\nWall seconds per phase:\n")
+        for name, seconds in sorted(self.phase_seconds.items(), key=lambda item: -item[1]):
+            summary.write(f"  {name:<12} {seconds:10.3f}\n")
+        if self.skipped_phases:
+            summary.write(f"\nNot profiled (another cProfile was active): {dict(self.skipped_phases)}\n")
+
+        if self.mode == "cprofile":
+            merged = None
+            for name, profile in self._profiles.items():
+                path = os.path.join(out_dir, f"{name}.prof")
+                profile.dump_stats(path)
+                files.append(os.path.basename(path))
+                if merged is None:
+                    merged = pstats.Stats(profile)
+                else:
+                    merged.add(profile)
+            if merged is not None:
+                merged.dump_stats(os.path.join(out_dir, "all.prof"))
+                files.append("all.prof")
+                summary.write("\nTop functions by cumulative time:\n")
+                merged.stream = summary
+                merged.sort_stats("cumulative").print_stats(30)
+        else:
+            stacks = self._sampler.stacks
+            with open(os.path.join(out_dir, "stacks.collapsed"), "w") as f:
+                for stack, count in sorted(stacks.items()):
+                    f.write(f"{stack} {count}\n")
+            files.append("stacks.collapsed")
+            leaves = Counter()
+            for stack, count in stacks.items():
+                leaves[stack.rsplit(";", 1)[-1]] += count
+            total = sum(stacks.values())
+            summary.write(f"\n{total} samples every {_settings['interval'] * 1000:g} ms; top leaf frames:\n")
+            for frame, count in leaves.most_common(30):
+                summary.write(f"  {count:8d}  {100.0 * count / total:5.1f}%  {frame}\n")
+
+        with open(os.path.join(out_dir, "summary.txt"), "w") as f:
+            f.write(summary.getvalue())
+        files.append("summary.txt")
+
+        with open(os.path.join(out_dir, "profile.json"), "w") as f:
+            json.dump({
+                "label": self.label,
+                "mode": self.mode,
+                "started": self.started,
+                "phase_seconds": self.phase_seconds,
+                "samples": sum(self._sampler.stacks.values()) if self._sampler is not None else None,
+                "files": files,
+            }, f, indent=2)
+
+        return out_dir
+
+
+class NullProfiler:
+    """Profiler stand-in when profiling is off; phases cost a no-op context manager."""
+
+    mode = None
+
+    @contextmanager
+    def phase(self, name: str):
+        yield
+
+    def call(self, name: str, func: Callable, *args, **kwargs):
+        return func(*args, **kwargs)
+
+    def save(self, directory: Optional[str] = None) -> Optional[str]:
+        return None
+
+
+def create_profiler(mode: Optional[str], label: str):
+    """A Profiler for mode, or a NullProfiler when mode is empty."""
+    return Profiler(mode, label) if mode else NullProfiler()
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware profiling single requests that carry an authorized
+    X-Profile header. Other requests pass straight through.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _settings["enabled"]:
+            await self.app(scope, receive, send)
+            return
+
+        value = authorization = None
+        for name, header in scope.get("headers", ()):
+            if name == PROFILE_HEADER:
+                value = header.decode("latin-1")
+            elif name == b"authorization":
+                authorization = header.decode("latin-1")
+        mode = header_mode(value, authorization)
+        if mode is None:
+            await self.app(scope, receive, send)
+            return
+
+        profiler = Profiler(mode, f"{scope.get('method', '')} {scope.get('path', '')}")
+        try:
+            with profiler.phase("request"):
+                await self.app(scope, receive, send)
+        finally:
+            path = await asyncio.to_thread(profiler.save)
+            logger.info("Request profile written to %s", path, extra={"profile_mode": mode})
@@ -0,0 +1,127 @@
+"""
+Per-epoch progress reporting for local client fits.
+
+FitProgressReporter is a Keras callback that times every epoch of one
+client's local fit and records a fixed-schema summary:
+
+    schema_version       FIT_PROGRESS_SCHEMA_VERSION
+    client_id, round
+    train_samples        rows actually trained on (after validation_split)
+    batch_size, steps_per_epoch
+    epochs_planned, epochs_completed
+    early_stopped        True if EarlyStopping ended the fit before epochs_planned
+    stopped_epoch        1-based epoch EarlyStopping stopped at (None otherwise)
+    best_epoch           1-based epoch with the lowest val_loss
+    best_val_loss
+    final_loss, final_val_loss
+    total_seconds, mean_epoch_seconds, samples_per_second
+    epochs               per epoch: epoch, loss, val_loss, accuracy, val_accuracy,
+                         seconds, samples_per_second
+
+Comparing samples_per_second across clients shows slow ones; epochs_completed
+against epochs_planned (and early_stopped) shows whether epochs_per_round is
+too high, and seconds per step how batch_size affects throughput.
+"""
+
+import math
+import time
+from typing import Callable, Dict, List, Optional
+
+try:
+    from keras.callbacks import Callback
+    TF_AVAILABLE = True
+except ImportError:
+    Callback = object
+    TF_AVAILABLE = False
+
+FIT_PROGRESS_SCHEMA_VERSION = 1
+
+EPOCH_KEYS = ("loss", "val_loss", "accuracy", "val_accuracy")
+
+
+def _metric(logs: dict, key: str) -> Optional[float]:
+    value = logs.get(key)
+    return float(value) if value is not None else None
+
+
+class FitProgressReporter(Callback):
+    """Keras callback recording per-epoch loss, wall time and throughput of one client fit."""
+
+    def __init__(
+        self,
+        client_id: str,
+        round_num: int,
+        n_samples: int,
+        batch_size: int,
+        epochs: int,
+        validation_split: float = 0.0,
+        early_stopping=None,
+        on_epoch: Optional[Callable[[str, int, Dict], None]] = None,
+    ):
+        super().__init__()
+        self.client_id = client_id
+        self.round_num = round_num
+        # Keras trains on the first int(n * (1 - validation_split)) rows
+        self.train_samples = int(n_samples * (1 - validation_split))
+        self.batch_size = batch_size
+        self.epochs_planned = epochs
+        self.early_stopping = early_stopping
+        self.on_epoch = on_epoch
+        self.epochs: List[Dict] = []
+        self._fit_start = None
+        self._epoch_start = None
+        self._fit_seconds = 0.0
+
+    def on_train_begin(self, logs=None):
+        self.epochs = []
+        self._fit_start = time.perf_counter()
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._epoch_start = time.perf_counter()
+
+    def on_epoch_end(self, epoch, logs=None):
+        logs = logs or {}
+        seconds = time.perf_counter() - self._epoch_start
+        record = {"epoch": epoch + 1}
+        record.update({key: _metric(logs, key) for key in EPOCH_KEYS})
+        record["seconds"] = seconds
+        record["samples_per_second"] = self.train_samples / seconds if seconds > 0 else None
+        self.epochs.append(record)
+        if self.on_epoch is not None:
+            self.on_epoch(self.client_id, self.round_num, record)
+
+    def on_train_end(self, logs=None):
+        if self._fit_start is not None:
+            self._fit_seconds = time.perf_counter() - self._fit_start
+
+    def summary(self) -> Dict:
+        """The fixed-schema summary of this fit (see module docstring)."""
+        completed = len(self.epochs)
+        epoch_seconds = sum(e["seconds"] for e in self.epochs)
+        val_losses = [(e["val_loss"], e["epoch"]) for e in self.epochs if e["val_loss"] is not None]
+        best_val_loss, best_epoch = min(val_losses) if val_losses else (None, None)
+
+        stopped_epoch = getattr(self.early_stopping, "stopped_epoch", 0) or 0
+        early_stopped = stopped_epoch > 0 and completed < self.epochs_planned
+
+        last = self.epochs[-1] if self.epochs else {}
+        return {
+            "schema_version": FIT_PROGRESS_SCHEMA_VERSION,
+            "client_id": self.client_id,
+            "round": self.round_num,
+            "train_samples": self.train_samples,
+            "batch_size": self.batch_size,
+            "steps_per_epoch": math.ceil(self.train_samples / self.batch_size) if self.batch_size else None,
+            "epochs_planned": self.epochs_planned,
+            "epochs_completed": completed,
+            "early_stopped": early_stopped,
+            "stopped_epoch": stopped_epoch + 1 if early_stopped else None,
+            "best_epoch": best_epoch,
+            "best_val_loss": best_val_loss,
+            "final_loss": last.get("loss"),
+            "final_val_loss": last.get("val_loss"),
+            "total_seconds": self._fit_seconds or epoch_seconds,
+            "mean_epoch_seconds": epoch_seconds / completed if completed else None,
+            "samples_per_second": (self.train_samples * completed / epoch_seconds) if epoch_seconds > 0 else None,
+            "epochs": self.epochs,
+        }
@@ -0,0 +1,139 @@
+"""
+Append-only binary log of ingested reading batches.
+
+Each batch is one frame:
+
+    magic (2 bytes) | payload length (uint32) | CRC32 of payload (uint32) | payload
+
+with the payload a JSON list of reading dicts. append() writes a frame and
+returns the log offset after it; commit(offset) waits until the log is
+fsynced at least that far. Concurrent writers share fsyncs (group commit):
+the first waiter opens a short batching window, then one fsync covers every
+frame written before it.
+
+replay() reads the log back on startup. A torn or corrupt frame at the tail
+(a crash mid-write) ends the replay and is truncated away, so the next
+append starts from the last complete batch.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import struct
+import threading
+import zlib
+from typing import Any, Dict, Iterator, List, Optional
+
+from .responses import dumps_json
+
+logger = logging.getLogger(__name__)
+
+FRAME_MAGIC = b"RL"
+FRAME_HEADER = struct.Struct("<2sII")
+
+
+class ReadingsLog:
+    """Append-only, CRC-framed log of reading batches with batched fsync."""
+
+    def __init__(self, path: str, fsync_interval_ms: float = 10.0):
+        self.path = path
+        self.fsync_interval = fsync_interval_ms / 1000.0
+        self._file = None
+        self._lock = threading.Lock()
+        self._written = 0
+        self._synced = 0
+        self._sync_task: Optional[asyncio.Task] = None
+        self.stats = {"batches": 0, "rows": 0, "bytes": 0, "fsyncs": 0, "replayed_rows": 0,
+                      "truncated_bytes": 0}
+
+    @property
+    def size(self) -> int:
+        return self._written
+
+    def replay(self) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Yield the batches in the log, oldest first, then open it for appending.
+        A trailing partial or corrupt frame is truncated.
+        """
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        good = 0
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as f:
+                while True:
+                    header = f.read(FRAME_HEADER.size)
+                    if len(header) < FRAME_HEADER.size:
+                        break
+                    magic, length, crc = FRAME_HEADER.unpack(header)
+                    if magic != FRAME_MAGIC:
+                        break
+                    payload = f.read(length)
+                    if len(payload) < length or zlib.crc32(payload) != crc:
+                        break
+                    good = f.tell()
+                    batch = json.loads(payload)
+                    self.stats["replayed_rows"] += len(batch)
+                    yield batch
+                end = f.seek(0, os.SEEK_END)
+            if end > good:
+                logger.warning("Truncating %d bytes of incomplete log tail in %s", end - good, self.path)
+                self.stats["truncated_bytes"] += end - good
+                with open(self.path, "r+b") as f:
+                    f.truncate(good)
+                    os.fsync(f.fileno())
+        self._open(good)
+
+    def _open(self, offset: int):
+        if self._file is None:
+            self._file = open(self.path, "ab")
+            self._written = self._synced = offset
+
+    def append(self, records: List[Dict[str, Any]]) -> int:
+        """Write one batch frame (not yet durable) and return the log offset after it."""
+        if self._file is None:
+            self._open(os.path.getsize(self.path) if os.path.exists(self.path) else 0)
+        payload = dumps_json(records)
+        frame = FRAME_HEADER.pack(FRAME_MAGIC, len(payload), zlib.crc32(payload)) + payload
+        with self._lock:
+            self._file.write(frame)
+            self._file.flush()
+            self._written += len(frame)
+            self.stats["batches"] += 1
+            self.stats["rows"] += len(records)
+            self.stats["bytes"] += len(frame)
+            return self._written
+
+    def _fsync(self) -> int:
+        with self._lock:
+            target = self._written
+            fileno = self._file.fileno()
+        os.fsync(fileno)
+        return target
+
+    async def _sync(self):
+        try:
+            if self.fsync_interval:
+                # Batching window: let concurrent writers append before the fsync
+                await asyncio.sleep(self.fsync_interval)
+            target = await asyncio.to_thread(self._fsync)
+            self._synced = max(self._synced, target)
+            self.stats["fsyncs"] += 1
+        finally:
+            self._sync_task = None
+
+    async def commit(self, offset: int):
+        """Wait until the log is durable up to offset."""
+        while self._synced < offset:
+            if self._sync_task is None:
+                self._sync_task = asyncio.ensure_future(self._sync())
+            await asyncio.shield(self._sync_task)
+
+    def close(self):
+        if self._file is not None:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._synced = self._written
+            self._file.close()
+            self._file = None
@@ -0,0 +1,217 @@
+"""
+Versioned model registry.
+
+Every trained model becomes an immutable version directory:
+
+    <registry>/versions/v0007/
+        model.h5  scaler.pkl  features.json  metadata.json
+        (model.keras / weights.npz when saved in those formats too)
+
+Files are written into a staging directory first, and the whole directory
+is renamed into versions/ in one step. A version is therefore either
+complete or absent, and it is never rewritten. metadata.json holds the
+version, creation time, metrics, training config and file hashes.
+
+The serving version is named by the CURRENT pointer file. Promotion writes
+a temp file and os.replace()s it over CURRENT, so readers see the old
+version or the new one, never a mix. Every promotion is appended to
+promotions.jsonl. rollback() promotes the version that was serving before
+the current one; the log is replayed as a stack (promotions push, rollbacks
+pop), so repeated rollbacks keep going further back. promote() can bring
+back any version.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+VERSIONS_DIR = "versions"
+CURRENT_FILE = "CURRENT"
+PROMOTIONS_FILE = "promotions.jsonl"
+METADATA_FILE = "metadata.json"
+
+# Files of a version
+MODEL_FILE = "model.h5"
+KERAS_FILE = "model.keras"
+WEIGHTS_FILE = "weights.npz"
+SCALER_FILE = "scaler.pkl"
+FEATURES_FILE = "features.json"
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _atomic_write(path: str, data: str):
+    tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class StagedVersion:
+    """A version being written; commit() publishes it under the next version number."""
+
+    def __init__(self, registry: "ModelRegistry"):
+        self.registry = registry
+        self.directory = os.path.join(registry.directory, f".staging-{uuid.uuid4().hex[:12]}")
+        os.makedirs(self.directory)
+        self.version: Optional[str] = None
+
+    def path(self, name: str) -> str:
+        """Where to write a file of this version."""
+        return os.path.join(self.directory, name)
+
+    def commit(self, metadata: Optional[Dict[str, Any]] = None) -> str:
+        files = {
+            name: {"sha256": _sha256(self.path(name)), "size": os.path.getsize(self.path(name))}
+            for name in sorted(os.listdir(self.directory))
+        }
+        self.version = self.registry._publish(self.directory, files, metadata or {})
+        return self.version
+
+    def discard(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.version is None:
+            self.discard()
+        return False
+
+
+class ModelRegistry:
+    """Immutable model versions plus an atomically swapped CURRENT pointer."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.versions_dir = os.path.join(directory, VERSIONS_DIR)
+        self._lock = threading.Lock()
+
+    # ---------- versions ----------
+
+    def stage(self) -> StagedVersion:
+        """Start a new version: write its files under staged.path(name), then commit()."""
+        os.makedirs(self.versions_dir, exist_ok=True)
+        return StagedVersion(self)
+
+    def _next_number(self) -> int:
+        numbers = [int(v[1:]) for v in os.listdir(self.versions_dir) if v.startswith("v") and v[1:].isdigit()]
+        return max(numbers, default=0) + 1
+
+    def _publish(self, staging_dir: str, files: Dict[str, Any], metadata: Dict[str, Any]) -> str:
+        with self._lock:
+            while True:
+                version = f"v{self._next_number():04d}"
+                record = {
+                    "version": version,
+                    "created_at": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                    "files": files,
+                    **metadata,
+                }
+                _atomic_write(os.path.join(staging_dir, METADATA_FILE), json.dumps(record, indent=2))
+                try:
+                    # Directory rename: the version appears complete or not at all
+                    os.rename(staging_dir, os.path.join(self.versions_dir, version))
+                    return version
+                except OSError:
+                    if not os.path.exists(os.path.join(self.versions_dir, version)):
+                        raise
+                    # Another process took this number; try the next one
+
+    def versions(self) -> List[str]:
+        """Committed versions, oldest first."""
+        if not os.path.isdir(self.versions_dir):
+            return []
+        names = [v for v in os.listdir(self.versions_dir) if v.startswith("v") and v[1:].isdigit()]
+        return sorted(names, key=lambda v: int(v[1:]))
+
+    def exists(self, version: str) -> bool:
+        return version in self.versions()
+
+    def metadata(self, version: str) -> Dict[str, Any]:
+        with open(os.path.join(self.versions_dir, version, METADATA_FILE)) as f:
+            return json.load(f)
+
+    def version_dir(self, version: str) -> str:
+        return os.path.join(self.versions_dir, version)
+
+    def path(self, version: str, name: str) -> str:
+        return os.path.join(self.versions_dir, version, name)
+
+    # ---------- serving pointer ----------
+
+    def current(self) -> Optional[str]:
+        """The version CURRENT points at, or None before the first promotion."""
+        try:
+            with open(os.path.join(self.directory, CURRENT_FILE)) as f:
+                version = f.read().strip()
+        except OSError:
+            return None
+        return version or None
+
+    def promote(self, version: str, reason: str = "promote") -> Dict[str, Any]:
+        """Point CURRENT at version (atomic) and record the promotion."""
+        if not self.exists(version):
+            raise KeyError(version)
+        with self._lock:
+            previous = self.current()
+            _atomic_write(os.path.join(self.directory, CURRENT_FILE), version + "\n")
+            event = {"version": version, "previous": previous, "reason": reason,
+                     "at": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())}
+            with open(os.path.join(self.directory, PROMOTIONS_FILE), "a") as f:
+                f.write(json.dumps(event) + "\n")
+        return event
+
+    def promotions(self) -> List[Dict[str, Any]]:
+        try:
+            with open(os.path.join(self.directory, PROMOTIONS_FILE)) as f:
+                return [json.loads(line) for line in f if line.strip()]
+        except OSError:
+            return []
+
+    def history(self) -> List[str]:
+        """
+        Serving history, oldest first, ending with the serving version:
+        promotions push their version and rollbacks pop the one rolled back from.
+        """
+        stack: List[str] = []
+        for event in self.promotions():
+            version = event["version"]
+            if event.get("reason") == "rollback" and stack:
+                stack.pop()
+            if not stack or stack[-1] != version:
+                stack.append(version)
+        return stack
+
+    def previous(self) -> Optional[str]:
+        """The version that served before the current one (skipping versions rolled back from)."""
+        current = self.current()
+        earlier = [v for v in self.history() if v != current]
+        return earlier[-1] if earlier else None
+
+    def rollback(self) -> Dict[str, Any]:
+        """Promote the version that served before the current one."""
+        previous = self.previous()
+        if previous is None:
+            raise LookupError("No earlier version to roll back to")
+        return self.promote(previous, reason="rollback")
+
+    def export(self, version: str, name: str, target: str):
+        """Copy a version's file to target via a temp file and rename (for legacy fixed paths)."""
+        tmp_path = f"{target}.{uuid.uuid4().hex[:8]}.tmp"
+        shutil.copyfile(self.path(version, name), tmp_path)
+        os.replace(tmp_path, target)
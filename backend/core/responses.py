@@ -0,0 +1,67 @@
+"""
+Fast NaN-safe JSON responses.
+
+FastJSONResponse serializes a payload in one pass with orjson: NaN/Inf
+become null, NumPy scalars and arrays are written natively, and anything
+else orjson does not know (pandas NA/NaT/Timestamps, object arrays, sets)
+goes through a small default hook. Returning the response directly from an
+endpoint also skips FastAPI's recursive jsonable_encoder walk.
+
+Without orjson installed it falls back to clean_for_json + json.dumps.
+"""
+
+import datetime
+import decimal
+import json
+import math
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+def _default(obj: Any):
+    """Serialize values orjson/json can't handle natively (or raise TypeError)."""
+    if isinstance(obj, np.ndarray):
+        # Object/non-contiguous arrays; NaN floats in the list become null
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    if obj is pd.NaT or obj is pd.NA:
+        return None
+    if isinstance(obj, pd.Timestamp):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if isinstance(obj, decimal.Decimal):
+        value = float(obj)
+        return value if math.isfinite(value) else None
+    if isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps_json(content: Any) -> bytes:
+    """Serialize content to JSON bytes with NaN/Inf as null."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+
+    from .utils import clean_for_json
+    return json.dumps(
+        clean_for_json(content), default=_default, allow_nan=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with dumps_json (NaN-safe, NumPy-aware)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
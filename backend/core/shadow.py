@@ -0,0 +1,196 @@
+"""
+Shadow evaluation of a candidate model on live prediction traffic.
+
+The predict endpoints hand a sampled share of their requests (the reading
+records plus the serving model's probabilities and latency) to
+ShadowEvaluator.submit(). That call only does a put_nowait on a bounded
+queue. When the queue is full the sample is dropped and counted, never
+waited on, so the response path cost stays constant. A background thread
+drains the queue in batches, scores the readings with the shadow model
+(encoded with the shadow version's own feature spec) and
+records how often it agrees with the serving model (same safe/unsafe
+label), the mean absolute probability difference and the shadow model's
+latency next to the serving model's.
+
+Counts are exported as Prometheus metrics (shadow_predictions_total,
+shadow_inference_duration_seconds, shadow_queue_depth) and summarized by
+stats().
+"""
+
+import logging
+import queue
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+from .metrics import SHADOW_INFERENCE_DURATION, SHADOW_PREDICTIONS, SHADOW_QUEUE_DEPTH
+
+logger = logging.getLogger(__name__)
+
+# Label threshold shared with the serving model's results
+UNSAFE_THRESHOLD = 0.5
+# Most queued samples scored in one shadow predict() call
+MAX_DRAIN = 64
+
+
+class ShadowEvaluator:
+    """
+    Scores sampled predictions with a shadow model on a background thread.
+
+    load_predictor(version) returns a function mapping a list of reading
+    dicts to unsafe probabilities; it runs on the worker thread, so loading
+    a model never blocks a request.
+    """
+
+    def __init__(self, load_predictor: Callable[[str], Callable[[List[Dict[str, Any]]], np.ndarray]],
+                 queue_size: int = 1000):
+        self._load_predictor = load_predictor
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self.version: Optional[str] = None
+        self.sample_rate = 0.0
+        self._predictor = None
+        self._predictor_version: Optional[str] = None
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self._stats = {
+            "requests": 0, "sampled": 0, "dropped": 0, "errors": 0,
+            "scored": 0, "agree": 0, "abs_diff_sum": 0.0,
+            "primary_seconds": 0.0, "primary_rows": 0,
+            "shadow_seconds": 0.0, "shadow_rows": 0,
+            "submit_seconds": 0.0, "started_at": time.strftime('%Y-%m-%d %H:%M:%S'),
+        }
+
+    # ---------- configuration ----------
+
+    @property
+    def enabled(self) -> bool:
+        return self.version is not None and self.sample_rate > 0
+
+    def configure(self, version: Optional[str], sample_rate: float):
+        """Shadow `version` on `sample_rate` of requests (None disables). Resets the statistics."""
+        with self._lock:
+            self.version = version
+            self.sample_rate = max(0.0, min(1.0, sample_rate)) if version else 0.0
+            self._reset_stats()
+        if self.enabled:
+            self._ensure_worker()
+        logger.info("Shadow evaluation %s", f"of {version} on {self.sample_rate:.0%} of requests"
+                    if self.enabled else "disabled")
+
+    def _ensure_worker(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="shadow-eval", daemon=True)
+            self._thread.start()
+
+    # ---------- response path ----------
+
+    def submit(self, records: List[Dict[str, Any]], primary: np.ndarray, primary_seconds: float) -> bool:
+        """
+        Offer one request's readings and serving-model probabilities.
+        Never blocks: returns False when the request was not sampled or the
+        queue is full.
+        """
+        start = time.perf_counter()
+        version = self.version
+        stats = self._stats
+        stats["requests"] += 1
+        if version is None or random.random() >= self.sample_rate:
+            return False
+        stats["sampled"] += 1
+        try:
+            self._queue.put_nowait((version, records, np.asarray(primary, dtype=np.float64).reshape(-1), primary_seconds))
+            queued = True
+        except queue.Full:
+            stats["dropped"] += len(records)
+            SHADOW_PREDICTIONS.inc(len(records), version=version, outcome="dropped")
+            queued = False
+        stats["submit_seconds"] += time.perf_counter() - start
+        return queued
+
+    # ---------- worker ----------
+
+    def _predictor_for(self, version: str):
+        if self._predictor_version != version:
+            self._predictor = self._load_predictor(version)
+            self._predictor_version = version
+        return self._predictor
+
+    def _run(self):
+        while True:
+            items = [self._queue.get()]
+            while len(items) < MAX_DRAIN:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            SHADOW_QUEUE_DEPTH.set(self._queue.qsize())
+            # Samples queued before a reconfiguration are scored against their own version
+            for version in dict.fromkeys(item[0] for item in items):
+                self._score(version, [item for item in items if item[0] == version])
+
+    def _score(self, version: str, items):
+        rows = sum(len(item[1]) for item in items)
+        try:
+            predict = self._predictor_for(version)
+            records = [record for item in items for record in item[1]]
+            start = time.perf_counter()
+            shadow = np.asarray(predict(records), dtype=np.float64).reshape(-1)
+            elapsed = time.perf_counter() - start
+        except Exception:
+            logger.exception("Shadow model %s failed", version)
+            if version == self.version:
+                self._stats["errors"] += rows
+            SHADOW_PREDICTIONS.inc(rows, version=version, outcome="error")
+            return
+
+        primary = np.concatenate([item[2] for item in items])
+        agree = int(((shadow > UNSAFE_THRESHOLD) == (primary > UNSAFE_THRESHOLD)).sum())
+        SHADOW_INFERENCE_DURATION.observe(elapsed, version=version)
+        SHADOW_PREDICTIONS.inc(agree, version=version, outcome="agree")
+        SHADOW_PREDICTIONS.inc(rows - agree, version=version, outcome="disagree")
+        if version != self.version:
+            return
+        stats = self._stats
+        stats["scored"] += rows
+        stats["agree"] += agree
+        stats["abs_diff_sum"] += float(np.abs(shadow - primary).sum())
+        stats["shadow_seconds"] += elapsed
+        stats["shadow_rows"] += rows
+        stats["primary_seconds"] += sum(item[3] for item in items)
+        stats["primary_rows"] += rows
+
+    # ---------- reporting ----------
+
+    def stats(self) -> Dict[str, Any]:
+        s = dict(self._stats)
+        scored = s["scored"]
+
+        def per_row_ms(seconds, rows):
+            return seconds / rows * 1000 if rows else None
+
+        primary_ms = per_row_ms(s["primary_seconds"], s["primary_rows"])
+        shadow_ms = per_row_ms(s["shadow_seconds"], s["shadow_rows"])
+        return {
+            "enabled": self.enabled,
+            "version": self.version,
+            "sample_rate": self.sample_rate,
+            "since": s["started_at"],
+            "requests": s["requests"],
+            "sampled_requests": s["sampled"],
+            "scored": scored,
+            "dropped": s["dropped"],
+            "errors": s["errors"],
+            "queue_depth": self._queue.qsize(),
+            "agreement_rate": s["agree"] / scored if scored else None,
+            "mean_abs_probability_diff": s["abs_diff_sum"] / scored if scored else None,
+            "primary_ms_per_reading": primary_ms,
+            "shadow_ms_per_reading": shadow_ms,
+            "shadow_latency_ratio": shadow_ms / primary_ms if primary_ms and shadow_ms is not None else None,
+            "submit_us_per_request": s["submit_seconds"] / s["requests"] * 1e6 if s["requests"] else None,
+        }
@@ -0,0 +1,128 @@
+"""
+Incrementally maintained data summaries.
+
+A client's local-data endpoint reports column means, safe/unsafe counts and
+the latest readings. Instead of recomputing them over the whole history on
+every request, ReadingsSummary keeps running moments per column (count, sum,
+sum of squares), the unsafe count and a ring buffer of the most recent
+readings, and folds in each new batch as it arrives. Reading the summary is
+O(columns + ring size) regardless of how many readings came before.
+"""
+
+import math
+import threading
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+class RunningStats:
+    """Count, sum and sum of squares of one column's non-missing values."""
+
+    __slots__ = ("count", "total", "total_sq")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+
+    def add(self, values: np.ndarray):
+        values = values[~np.isnan(values)]
+        self.count += int(values.size)
+        self.total += float(values.sum())
+        self.total_sq += float(np.square(values).sum())
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    @property
+    def std(self) -> Optional[float]:
+        """Population standard deviation."""
+        if not self.count:
+            return None
+        mean = self.total / self.count
+        return math.sqrt(max(0.0, self.total_sq / self.count - mean * mean))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"count": self.count, "sum": self.total, "sum_sq": self.total_sq,
+                "mean": self.mean, "std": self.std}
+
+
+def _latest_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Rows as JSON-ready dicts: timestamps formatted, missing values as ''."""
+    if pd.api.types.is_datetime64_any_dtype(df.get('timestamp')):
+        df = df.assign(timestamp=df['timestamp'].dt.strftime('%Y-%m-%d %H:%M:%S'))
+    return df.astype(object).fillna('').to_dict(orient='records')
+
+
+class ReadingsSummary:
+    """
+    Running summary of a readings table with an 'unsafe' column.
+
+    add_frame() folds in a batch of rows; the summary never looks at earlier
+    rows again. version increases with every batch, so callers can cache
+    anything derived from a snapshot until it changes.
+    """
+
+    def __init__(self, columns: Iterable[str], latest_size: int = 10):
+        self.columns = list(columns)
+        self.stats = {col: RunningStats() for col in self.columns}
+        self.total = 0
+        self.unsafe = 0
+        self.latest = deque(maxlen=latest_size)
+        self.version = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, columns: Iterable[str], latest_size: int = 10) -> "ReadingsSummary":
+        summary = cls(columns, latest_size)
+        summary.add_frame(df)
+        return summary
+
+    def copy(self) -> "ReadingsSummary":
+        """Independent summary starting from this one's state."""
+        other = ReadingsSummary(self.columns, self.latest.maxlen)
+        with self._lock:
+            for col, stats in self.stats.items():
+                copied = other.stats[col]
+                copied.count, copied.total, copied.total_sq = stats.count, stats.total, stats.total_sq
+            other.total, other.unsafe, other.version = self.total, self.unsafe, self.version
+            other.latest.extend(self.latest)
+        return other
+
+    def add_frame(self, df: pd.DataFrame):
+        """Fold a batch of readings into the summary (cost proportional to the batch)."""
+        if df.empty:
+            return
+        arrays = {
+            col: pd.to_numeric(df[col], errors='coerce').to_numpy(np.float64)
+            for col in self.columns if col in df.columns
+        }
+        unsafe = int(np.asarray(df['unsafe']).sum())
+        latest = _latest_records(df.tail(self.latest.maxlen))
+        with self._lock:
+            for col, values in arrays.items():
+                self.stats[col].add(values)
+            self.total += len(df)
+            self.unsafe += unsafe
+            self.latest.extend(latest)
+            self.version += 1
+
+    def mean(self, column: str) -> Optional[float]:
+        stats = self.stats.get(column)
+        return stats.mean if stats is not None else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Totals, per-column moments and the latest readings at this point in time."""
+        with self._lock:
+            return {
+                "version": self.version,
+                "total": self.total,
+                "safe": self.total - self.unsafe,
+                "unsafe": self.unsafe,
+                "columns": {col: stats.to_dict() for col, stats in self.stats.items()},
+                "latest": list(self.latest),
+            }
@@ -2,12 +2,17 @@
 Core utility functions for federated learning server.
 """
 
+import logging
 import math
 import numpy as np
 import pandas as pd
-from sklearn.preprocessing import StandardScaler
-from typing import Optional, Dict, Any
-import os
+from typing import Any, Dict, List, Optional
+
+from .datasets import DEFAULT_CHUNKSIZE
+from .partitioning import partition
+from .preprocessing import prepare_features_streaming
+
+logger = logging.getLogger(__name__)
 
 try:
     import tensorflow as tf
@@ -68,6 +73,11 @@ def create_model(input_shape: int):
     return model
 
 
+def federated_average(client_weights: List[List[np.ndarray]]) -> List[np.ndarray]:
+    """FedAvg: the layer-by-layer mean of each client's model weights."""
+    return [np.mean(layer_weights, axis=0) for layer_weights in zip(*client_weights)]
+
+
 def create_target(row):
     """Create target variable: 1 if unsafe, 0 if safe"""
     if pd.notna(row.get('alert')):
@@ -83,57 +93,46 @@ def create_target(row):
     return 0
 
 
-def load_and_prepare_data(data_path: str, num_clients: int = 5) -> Optional[Dict[str, Any]]:
-    """Load dataset and prepare federated data splits"""
-    if not os.path.exists(data_path):
-        print(f"Data file not found at {data_path}")
-        return None
-    
-    df = pd.read_csv(data_path)
-    df['unsafe'] = df.apply(create_target, axis=1)
-    
-    # Define columns
-    numerical_cols = ['pressure_bar', 'flow_rate_L_min', 'total_volume_L', 
-                     'tds_ppm', 'ph', 'temperature_C', 'signal_strength_dBm']
-    categorical_cols = ['pressure_status', 'tds_status', 'ph_status', 
-                       'wifi_status', 'sensor_status']
+def load_and_prepare_data(
+    data_path: str,
+    num_clients: int = 5,
+    strategy: str = "contiguous",
+    alpha: float = 0.5,
+    seed: int = 42,
+    chunksize: int = DEFAULT_CHUNKSIZE,
+    memmap_dir: Optional[str] = None,
+) -> Optional[Dict[str, Any]]:
+    """
+    Load dataset and prepare federated data splits.
     
-    # Scale numerical features
-    scaler = StandardScaler()
-    existing_numerical = [c for c in numerical_cols if c in df.columns]
-    df[existing_numerical] = scaler.fit_transform(df[existing_numerical])
-    
-    # Encode categorical variables
-    existing_categorical = [c for c in categorical_cols if c in df.columns]
-    df_encoded = pd.get_dummies(df, columns=existing_categorical, drop_first=True)
-    
-    # Get feature columns
-    feature_cols = existing_numerical + [col for col in df_encoded.columns 
-                                         if any(col.startswith(c) for c in categorical_cols)]
-    features = [f for f in feature_cols if f in df_encoded.columns]
-    
-    X = df_encoded[features].values.astype(np.float32)
-    y = df_encoded['unsafe'].values.astype(np.float32)
+    data_path may be a single file, a directory or a glob; column name
+    variants across files are normalized to one schema. Features are built
+    chunk by chunk into one float32 matrix (memory-mapped under memmap_dir
+    if given). Clients are partitioned with `strategy` (see
+    core.partitioning) and hold row indices into the shared X/y.
+    """
+    prepared = prepare_features_streaming(
+        data_path, chunksize=chunksize, out_dir=memmap_dir,
+        collect_timestamps=(strategy == "time")
+    )
+    if prepared is None:
+        logger.warning("Data file not found at %s", data_path)
+        return None
     
-    # Split data among clients
-    client_data = {}
-    samples_per_client = len(X) // num_clients
+    X, y = prepared["X"], prepared["y"]
     
-    for i in range(num_clients):
-        start_idx = i * samples_per_client
-        if i == num_clients - 1:
-            end_idx = len(X)
-        else:
-            end_idx = (i + 1) * samples_per_client
-        
-        client_data[f"client_{i+1}"] = {
-            "X": X[start_idx:end_idx],
-            "y": y[start_idx:end_idx]
-        }
+    # Split data among clients as index shards over the shared X/y
+    client_data = partition(
+        strategy, X, y, num_clients,
+        device_shards=prepared["device_shards"], timestamps=prepared["timestamps"],
+        alpha=alpha, seed=seed
+    )
     
     return {
-        "scaler": scaler,
-        "features": features,
+        "scaler": prepared["scaler"],
+        "feature_spec": prepared["feature_spec"],
+        "features": prepared["features"],
         "client_data": client_data,
+        "device_shards": prepared["device_shards"],
         "full_data": {"X": X, "y": y}
     }
@@ -5,6 +5,7 @@ API routes module.
 from .clients import router as clients_router
 from .data import router as data_router
 from .model import router as model_router
+from .readings import router as readings_router
 from .training import router as training_router
 from .users import router as users_router
 
@@ -12,6 +13,7 @@ __all__ = [
     "clients_router",
     "data_router",
     "model_router",
+    "readings_router",
     "training_router",
     "users_router",
 ]
@@ -4,10 +4,12 @@ Client management routes.
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 import httpx
 import time
 
+from core.metrics import CLIENT_FANOUT_DURATION, CLIENT_FANOUT_REQUEST_DURATION
+
 router = APIRouter(prefix="/api/clients", tags=["Client Management"])
 
 # Client storage
@@ -18,6 +20,8 @@ class ClientCreate(BaseModel):
     id: str
     ip: str
     port: int = 5001
+    # Path prefix of a tenant hosted by a multi-tenant client process, e.g. /clients/sensor_1
+    base_path: str = ""
 
 
 @router.get("")
@@ -35,15 +39,19 @@ async def add_client(client: ClientCreate):
     if not client.ip or not client.id:
         raise HTTPException(status_code=400, detail="IP and ID are required")
     
-    # Check if client already exists
+    base_path = normalize_base_path(client.base_path)
+
+    # Check if client already exists (several clients may share a host on different ports,
+    # or one port under different base paths)
     for c in CLIENTS:
-        if c['ip'] == client.ip or c['id'] == client.id:
+        if (c['ip'], c['port'], c.get('base_path', '')) == (client.ip, client.port, base_path) or c['id'] == client.id:
             raise HTTPException(status_code=409, detail="Client already registered")
     
     new_client = {
         "id": client.id,
         "ip": client.ip,
         "port": client.port,
+        "base_path": base_path,
         "status": "unknown",
         "last_seen": None
     }
@@ -70,11 +78,12 @@ async def remove_client(client_id: str):
 async def check_all_clients_health():
     """Check health status of all registered clients"""
     results = []
+    fanout_start = time.perf_counter()
     
     async with httpx.AsyncClient(timeout=5.0) as client:
         for c in CLIENTS:
             try:
-                response = await client.get(f"http://{c['ip']}:{c['port']}/api/health")
+                response = await fanout_get(client, client_url(c, "/api/health"), "health")
                 if response.status_code == 200:
                     c['status'] = 'online'
                     c['last_seen'] = time.strftime('%Y-%m-%d %H:%M:%S')
@@ -112,6 +121,7 @@ async def check_all_clients_health():
                     "error": str(e)
                 })
     
+    CLIENT_FANOUT_DURATION.observe(time.perf_counter() - fanout_start, operation="health")
     online_count = sum(1 for r in results if r['status'] == 'online')
     
     return {
@@ -121,6 +131,47 @@ async def check_all_clients_health():
     }
 
 
+def normalize_base_path(base_path: str) -> str:
+    """'clients/a/' -> '/clients/a'; empty for clients served at the root."""
+    base_path = base_path.strip().strip("/")
+    return f"/{base_path}" if base_path else ""
+
+
+def client_url(c: Dict[str, Any], path: str) -> str:
+    """URL of `path` on a registered client, including its base path."""
+    return f"http://{c['ip']}:{c['port']}{c.get('base_path', '')}{path}"
+
+
+def _fanout_outcome(response: Optional[httpx.Response], error: Optional[Exception]) -> str:
+    if error is not None:
+        if isinstance(error, httpx.TimeoutException):
+            return "timeout"
+        if isinstance(error, httpx.ConnectError):
+            return "connect_error"
+        return "error"
+    if response.status_code == 304:
+        return "not_modified"
+    return "ok" if response.status_code == 200 else "http_error"
+
+
+async def fanout_get(http: httpx.AsyncClient, url: str, operation: str,
+                     headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+    """GET one client during a fan-out, recording its latency and outcome."""
+    start = time.perf_counter()
+    response, error = None, None
+    try:
+        response = await http.get(url, headers=headers)
+        return response
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        CLIENT_FANOUT_REQUEST_DURATION.observe(
+            time.perf_counter() - start,
+            operation=operation, outcome=_fanout_outcome(response, error)
+        )
+
+
 def get_clients():
     """Get the global CLIENTS list"""
     return CLIENTS
@@ -2,19 +2,32 @@
 Data fetching and statistics routes.
 """
 
-from fastapi import APIRouter, HTTPException
-from typing import Dict, Any
+from fastapi import APIRouter, HTTPException, Request
+from typing import Dict, Any, Optional, Tuple
 import httpx
-import pandas as pd
+import logging
 import os
+import time
 
-from core.utils import create_target, clean_for_json
-from routes.clients import get_clients
+from core.conditional import conditional_response, etag_for, file_version
+from core.responses import FastJSONResponse
+from core.preprocessing import compute_unsafe
+from core.columnar import dataset_columns, dataset_exists
+from core.datasets import canonical_column, load_dataset
+from core.metrics import CLIENT_FANOUT_DURATION
+from routes.clients import client_url, fanout_get, get_clients
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api", tags=["Data"])
 
 DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "synthetic_dataset.csv")
 
+# Last /api/local-data body of each client with its ETag, revalidated with If-None-Match
+_client_data_cache: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+# /data/statistics body for the dataset version it was computed from
+_statistics_cache: Optional[Tuple[Any, Dict[str, Any]]] = None
+
 
 @router.get("/remote-data")
 async def fetch_single_client_data(ip: str, port: int = 5001, endpoint: str = "/api/local-data"):
@@ -46,35 +59,52 @@ async def fetch_all_clients_data():
     CLIENTS = get_clients()
     results = []
     
-    print(f"\n[DEBUG] Fetching data from {len(CLIENTS)} clients...")
+    logger.debug("Fetching data from %d clients", len(CLIENTS))
+    fanout_start = time.perf_counter()
     
     async with httpx.AsyncClient(timeout=10.0) as client:
         for c in CLIENTS:
             try:
-                print(f"[DEBUG] Connecting to {c['id']} at {c['ip']}:{c['port']}...")
-                response = await client.get(f"http://{c['ip']}:{c['port']}/api/local-data")
-                print(f"[DEBUG] Response status: {response.status_code}")
+                cached = _client_data_cache.get(c['id'])
+                headers = {"If-None-Match": cached[0]} if cached else None
+                response = await fanout_get(client, client_url(c, "/api/local-data"), "local-data",
+                                            headers=headers)
                 
-                if response.status_code == 200:
+                if response.status_code == 304 and cached:
+                    # Unchanged since the last poll: reuse the parsed body
+                    data = {**cached[1], 'connection_status': 'connected'}
+                    results.append(data)
+                elif response.status_code == 200:
                     data = response.json()
+                    etag = response.headers.get("etag")
+                    if etag:
+                        _client_data_cache[c['id']] = (etag, data.copy())
                     data['connection_status'] = 'connected'
-                    print(f"[DEBUG] Got data from {c['id']}: {len(data.get('latest_readings', []))} readings")
+                    logger.debug("Got data from %s (%s:%s): %d readings", c['id'], c['ip'], c['port'],
+                                 len(data.get('latest_readings', [])))
                     results.append(data)
                 else:
-                    print(f"[DEBUG] Error from {c['id']}: HTTP {response.status_code}")
+                    logger.debug("Error from %s: HTTP %d", c['id'], response.status_code)
                     results.append({
                         "client_id": c['id'],
                         "connection_status": 'error',
                         "error": f"HTTP {response.status_code}"
                     })
             except Exception as e:
-                print(f"[DEBUG] Exception for {c['id']}: {str(e)}")
+                logger.debug("Exception for %s: %s", c['id'], e)
                 results.append({
                     "client_id": c['id'],
                     "connection_status": 'failed',
                     "error": str(e)
                 })
     
+    CLIENT_FANOUT_DURATION.observe(time.perf_counter() - fanout_start, operation="local-data")
+    
+    # Forget cached bodies of clients that are no longer registered
+    registered = {c['id'] for c in CLIENTS}
+    for client_id in [k for k in _client_data_cache if k not in registered]:
+        del _client_data_cache[client_id]
+    
     # Calculate aggregated statistics
     connected_clients = [r for r in results if r.get('connection_status') == 'connected']
     
@@ -108,11 +138,12 @@ async def fetch_all_clients_metrics():
     
     CLIENTS = get_clients()
     results = []
+    fanout_start = time.perf_counter()
     
     async with httpx.AsyncClient(timeout=10.0) as client:
         for c in CLIENTS:
             try:
-                response = await client.get(f"http://{c['ip']}:{c['port']}/api/model-metrics")
+                response = await fanout_get(client, client_url(c, "/api/model-metrics"), "model-metrics")
                 if response.status_code == 200:
                     metrics = response.json()
                     metrics['connection_status'] = 'connected'
@@ -129,6 +160,8 @@ async def fetch_all_clients_metrics():
                     "error": str(e)
                 })
     
+    CLIENT_FANOUT_DURATION.observe(time.perf_counter() - fanout_start, operation="model-metrics")
+    
     # Calculate average metrics
     connected = [r for r in results if r.get('connection_status') == 'connected']
     avg_metrics = None
@@ -149,27 +182,42 @@ async def fetch_all_clients_metrics():
 
 
 @router.get("/data/statistics")
-async def get_data_statistics():
-    """Get statistics about the training data"""
-    if not os.path.exists(DATA_PATH):
+async def get_data_statistics(request: Request):
+    """Get statistics about the training data (computed once per dataset version)"""
+    if not dataset_exists(DATA_PATH):
         raise HTTPException(status_code=404, detail="Dataset not found")
     
+    version = file_version(DATA_PATH)
+    return conditional_response(
+        request,
+        etag_for("data-statistics", version),
+        lambda: FastJSONResponse(_data_statistics(version)),
+        last_modified=version[0] / 1e9 if version else None
+    )
+
+
+def _data_statistics(version) -> Dict[str, Any]:
+    global _statistics_cache
+    if _statistics_cache is not None and _statistics_cache[0] == version:
+        return _statistics_cache[1]
+    
     try:
-        df = pd.read_csv(DATA_PATH)
-        df['unsafe'] = df.apply(create_target, axis=1)
+        numerical_cols = ['pressure_bar', 'flow_rate_L_min', 'total_volume_L', 
+                         'tds_ppm', 'ph', 'temperature_C', 'signal_strength_dBm']
+        label_cols = ['pressure_status', 'tds_status', 'ph_status', 'sensor_status', 'alert']
+        
+        df = load_dataset(DATA_PATH, columns=numerical_cols + label_cols)
+        df['unsafe'] = compute_unsafe(df)
         
         stats = {
             "total_records": len(df),
             "safe_count": int((df['unsafe'] == 0).sum()),
             "unsafe_count": int((df['unsafe'] == 1).sum()),
             "unsafe_percentage": float(df['unsafe'].mean() * 100),
-            "columns": list(df.columns),
+            "columns": [canonical_column(c) for c in dataset_columns(DATA_PATH)] + ['unsafe'],
             "numerical_stats": {}
         }
         
-        numerical_cols = ['pressure_bar', 'flow_rate_L_min', 'total_volume_L', 
-                         'tds_ppm', 'ph', 'temperature_C', 'signal_strength_dBm']
-        
         for col in numerical_cols:
             if col in df.columns:
                 stats['numerical_stats'][col] = {
@@ -179,6 +227,7 @@ async def get_data_statistics():
                     "max": float(df[col].max())
                 }
         
-        return clean_for_json(stats)
+        _statistics_cache = (version, stats)
+        return stats
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
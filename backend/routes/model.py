@@ -1,24 +1,79 @@
 """
 Model operation routes.
+
+Trained models live in a versioned registry (core.registry). The serving
+model is one immutable ServingModel snapshot (version, model, scaler,
+feature spec) replaced in a single assignment: requests read the snapshot
+once, so they never mix a model and scaler from different versions, and a
+new version is loaded off the request path before it is swapped in.
+
+Predictions are cached per reading (core.prediction_cache), keyed on the
+rounded reading values and the model generation; the cache is cleared on
+every swap.
+
+Another registry version can be shadowed (core.shadow): a sampled share of
+predict requests is queued, without waiting, for a background thread that
+scores them with that version and compares the results with the serving
+model's.
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from fastapi.responses import FileResponse
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List, NamedTuple, Optional
+import asyncio
+import logging
 import numpy as np
 import os
+import time
+
+from core.artifacts import ArtifactStore
+from core.conditional import conditional_response, etag_for, file_version
+from core.features import FeatureSpec
+from core.model_io import load_model_files
+from core.prediction_cache import PredictionCache
+from core.registry import FEATURES_FILE, MODEL_FILE, SCALER_FILE, ModelRegistry
+from core.responses import FastJSONResponse
+from core.shadow import ShadowEvaluator
+from core.metrics import MODEL_INFERENCE_DURATION
+from config import settings
 
-from core.utils import clean_for_json
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/model", tags=["Model"])
 
 MODEL_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "federated_water_quality_model.h5")
 SCALER_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "water_quality_scaler.pkl")
+FEATURE_SPEC_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "water_quality_features.json")
+
+REGISTRY_DIR = settings.MODEL_REGISTRY_DIR or os.path.join(os.path.dirname(__file__), "..", "models")
+ARTIFACTS_DIR = settings.MODEL_ARTIFACTS_DIR or os.path.join(os.path.dirname(__file__), "..", "artifacts")
+# Blobs are named by content hash and never change
+ARTIFACT_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Largest batch accepted by /predict/batch
+MAX_BATCH_PREDICT = 10_000
+
 
-# Module-level variables
-_global_model = None
-_scaler = None
-_features = []
+class ServingModel(NamedTuple):
+    version: Optional[str]
+    model: Any
+    scaler: Any
+    features: List[str]
+    feature_spec: Optional[FeatureSpec]
+
+
+# The serving snapshot; replaced as a whole, never mutated
+_serving = ServingModel(None, None, None, [], None)
+_registry = ModelRegistry(REGISTRY_DIR)
+_registry_bootstrapped = False
+# Serializes loads and promotions (requests keep using the old snapshot meanwhile)
+_swap_lock = asyncio.Lock()
+# Bumped whenever set_model_data installs a new model (part of /info's ETag)
+_model_version = 0
+_prediction_cache = PredictionCache(settings.PREDICT_CACHE_SIZE, settings.PREDICT_CACHE_DECIMALS)
+_artifacts = ArtifactStore(ARTIFACTS_DIR)
+_publish_lock = asyncio.Lock()
 
 
 class PredictionInput(BaseModel):
@@ -33,25 +88,155 @@ class PredictionInput(BaseModel):
     tds_status: str = "Good"
     ph_status: str = "Neutral"
     wifi_status: str = "Connected"
-    sensor_status: str = "Normal"
+    sensor_status: str = "OK"
+
 
+class BatchPredictionInput(BaseModel):
+    readings: List[PredictionInput] = Field(..., min_length=1, max_length=MAX_BATCH_PREDICT)
 
-def set_model_data(model, scaler, features):
-    """Set global model, scaler, and features"""
-    global _global_model, _scaler, _features
-    _global_model = model
-    _scaler = scaler
-    _features = features
+
+def set_model_data(model, scaler, features, feature_spec=None, version=None):
+    """Swap in a new serving snapshot (model, scaler, features, feature spec, registry version)"""
+    global _serving, _model_version
+    current = _serving
+    _serving = ServingModel(
+        version if version is not None else current.version,
+        model, scaler, features,
+        feature_spec if feature_spec is not None else current.feature_spec
+    )
+    _model_version += 1
+    _prediction_cache.clear()
 
 
 def get_model_data():
     """Get global model, scaler, and features"""
-    return _global_model, _scaler, _features
+    serving = _serving
+    return serving.model, serving.scaler, serving.features
+
+
+def get_registry() -> ModelRegistry:
+    return _registry
+
+
+def _bootstrap_registry():
+    """Import a model trained before the registry existed as its first version."""
+    global _registry_bootstrapped
+    if _registry_bootstrapped:
+        return
+    _registry_bootstrapped = True
+    if _registry.current() is not None or not os.path.exists(MODEL_PATH):
+        return
+    import shutil
+    with _registry.stage() as staged:
+        for source, name in ((MODEL_PATH, MODEL_FILE), (SCALER_PATH, SCALER_FILE), (FEATURE_SPEC_PATH, FEATURES_FILE)):
+            if os.path.exists(source):
+                shutil.copyfile(source, staged.path(name))
+        version = staged.commit({"source": "imported", "metrics": None})
+    _registry.promote(version, reason="import")
+    logger.info("Imported %s into the model registry as %s", MODEL_PATH, version)
+
+
+def model_files() -> Optional[Dict[str, str]]:
+    """Version and file paths of the current registry version, or None before any model exists."""
+    _bootstrap_registry()
+    version = _registry.current()
+    if version is None:
+        return None
+    return {
+        "version": version,
+        "model": _registry.path(version, MODEL_FILE),
+        "scaler": _registry.path(version, SCALER_FILE),
+        "features": _registry.path(version, FEATURES_FILE),
+    }
+
+
+def _load_feature_spec(features_path: str, scaler) -> Optional[FeatureSpec]:
+    """
+    The spec a model was trained with. Models saved before the spec existed
+    fall back to the default layout with the saved scaler's statistics,
+    which is the layout training has always produced.
+    """
+    if os.path.exists(features_path):
+        return FeatureSpec.load(features_path)
+    if scaler is None:
+        return None
+    return FeatureSpec.default().with_scaler(scaler)
+
+
+def load_version(version: str, load_keras_model: bool = True) -> ServingModel:
+    """Read a registry version into a ServingModel (blocking; run it in a worker thread)."""
+    import joblib
+
+    scaler_path = _registry.path(version, SCALER_FILE)
+    scaler = joblib.load(scaler_path) if os.path.exists(scaler_path) else None
+    feature_spec = _load_feature_spec(_registry.path(version, FEATURES_FILE), scaler)
+    model = load_model_files(_registry.version_dir(version)) if load_keras_model else None
+    return ServingModel(version, model, scaler, feature_spec.features if feature_spec else [], feature_spec)
+
+
+def _tensorflow_available() -> bool:
+    try:
+        import tensorflow as tf
+        return True
+    except ImportError:
+        return False
+
+
+def _export_legacy_files(version: str):
+    """Mirror the serving version to the fixed legacy paths (each replaced atomically)."""
+    for name, target in ((MODEL_FILE, MODEL_PATH), (SCALER_FILE, SCALER_PATH), (FEATURES_FILE, FEATURE_SPEC_PATH)):
+        if os.path.exists(_registry.path(version, name)):
+            _registry.export(version, name, target)
+
+
+async def activate_version(version: str, reason: str = "promote", loaded: Optional[ServingModel] = None) -> Dict[str, Any]:
+    """
+    Make version the serving model: load it (unless already loaded), move
+    the CURRENT pointer, then swap the in-memory snapshot. Requests keep
+    being served by the previous snapshot until the swap.
+    """
+    async with _swap_lock:
+        if loaded is None:
+            loaded = await asyncio.to_thread(load_version, version, _tensorflow_available())
+        event = await asyncio.to_thread(_registry.promote, version, reason)
+        set_model_data(loaded.model, loaded.scaler, loaded.features, loaded.feature_spec, version)
+        await asyncio.to_thread(_export_legacy_files, version)
+    logger.info("Serving model %s (%s, previously %s)", version, reason, event["previous"])
+    return event
+
+
+def get_feature_spec():
+    """
+    Get the feature spec the serving model was trained with, loading it
+    from the current registry version on first use.
+    """
+    serving = _serving
+    if serving.feature_spec is not None:
+        return serving.feature_spec
+    files = model_files()
+    if files is None:
+        return None
+    scaler = serving.scaler
+    if scaler is None and os.path.exists(files["scaler"]):
+        import joblib
+        scaler = joblib.load(files["scaler"])
+    feature_spec = _load_feature_spec(files["features"], scaler)
+    if feature_spec is not None and _serving is serving and serving.version in (None, files["version"]):
+        set_model_data(serving.model, serving.scaler, serving.features, feature_spec, files["version"])
+    return feature_spec
 
 
 @router.get("/info")
-async def get_model_info():
-    """Get information about the current global model"""
+async def get_model_info(request: Request):
+    """Get information about the current global model (304 while the model is unchanged)"""
+    files = model_files()
+    model_file = file_version(files["model"]) if files else None
+    etag = etag_for("model-info", files and files["version"], model_file, _model_version)
+    return conditional_response(request, etag, lambda: _model_info(files),
+                                last_modified=model_file[0] / 1e9 if model_file else None)
+
+
+def _model_info(files: Optional[Dict[str, str]]):
     try:
         import tensorflow as tf
         from keras.models import load_model
@@ -59,11 +244,13 @@ async def get_model_info():
     except ImportError:
         TF_AVAILABLE = False
     
-    model_exists = os.path.exists(MODEL_PATH)
+    model_path = files["model"] if files else MODEL_PATH
+    model_exists = os.path.exists(model_path)
     global_model, _, features = get_model_data()
     
     info = {
-        "model_path": MODEL_PATH,
+        "model_path": model_path,
+        "model_version": files["version"] if files else None,
         "model_exists": model_exists,
         "tensorflow_available": TF_AVAILABLE,
         "features_count": len(features),
@@ -73,7 +260,7 @@ async def get_model_info():
     
     if model_exists and TF_AVAILABLE:
         try:
-            model = load_model(MODEL_PATH)
+            model = load_model(model_path)
             info['model_summary'] = {
                 "layers": len(model.layers),
                 "total_params": int(model.count_params()),
@@ -82,38 +269,157 @@ async def get_model_info():
         except Exception as e:
             info['model_load_error'] = str(e)
     
-    return clean_for_json(info)
+    return FastJSONResponse(info)
 
 
 @router.get("/download")
-async def download_model():
-    """Download the trained model file"""
-    if not os.path.exists(MODEL_PATH):
+async def download_model(request: Request):
+    """Download the trained model file (304 if the client's copy is current)"""
+    files = model_files()
+    model_file = file_version(files["model"]) if files else None
+    if model_file is None:
         raise HTTPException(
             status_code=404, 
             detail="Model file not found. Train the model first."
         )
     
-    return FileResponse(
-        MODEL_PATH,
-        media_type='application/octet-stream',
-        filename='federated_water_quality_model.h5'
+    return conditional_response(
+        request,
+        etag_for("model-file", files["version"], model_file),
+        lambda: FileResponse(
+            files["model"],
+            media_type='application/octet-stream',
+            filename='federated_water_quality_model.h5'
+        ),
+        last_modified=model_file[0] / 1e9
+    )
+
+
+async def publish_model_artifacts():
+    """Publish the serving model as content-addressed artifacts unless the manifest is already current."""
+    files = model_files()
+    if files is None:
+        return None
+    async with _publish_lock:
+        if _artifacts.is_current(files["model"]):
+            return _artifacts.manifest()
+        encodings = [e.strip() for e in settings.MODEL_ARTIFACT_ENCODINGS.split(",") if e.strip()]
+        return await asyncio.to_thread(_artifacts.publish, files["model"], encodings)
+
+
+@router.get("/artifacts/manifest")
+async def get_artifact_manifest(request: Request):
+    """
+    Manifest of the current model artifact: version, SHA-256 and the
+    precompressed variants with their hashes and URLs. The ETag is the
+    model's SHA-256, so clients poll with If-None-Match and only download
+    when the version changed.
+    """
+    manifest = await publish_model_artifacts()
+    if manifest is None:
+        raise HTTPException(status_code=404, detail="Model file not found. Train the model first.")
+    manifest = {
+        **{k: v for k, v in manifest.items() if k != "source"},
+        "variants": [{**v, "url": f"/api/model/artifacts/{v['sha256']}"} for v in manifest["variants"]]
+    }
+    return conditional_response(request, f'"{manifest["sha256"]}"', lambda: FastJSONResponse(manifest))
+
+
+@router.get("/artifacts/{digest}")
+async def download_artifact(digest: str, request: Request):
+    """Download an artifact blob by SHA-256; supports Range / If-Range for resumable downloads."""
+    path = _artifacts.blob_path(digest)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Artifact not found")
+    etag = f'"{digest}"'
+    return conditional_response(
+        request,
+        etag,
+        lambda: FileResponse(
+            path,
+            media_type=ArtifactStore.media_type(path),
+            filename=os.path.basename(path),
+            headers={"ETag": etag}
+        ),
+        cache_control=ARTIFACT_CACHE_CONTROL
     )
 
 
+async def _load_predictor():
+    """
+    The serving model and its feature spec (one consistent snapshot),
+    loading the current registry version on first use. Returns None without
+    TensorFlow (predictions are simulated).
+    """
+    serving = _serving
+    if serving.model is None:
+        if not _tensorflow_available():
+            return None
+        async with _swap_lock:
+            serving = _serving
+            if serving.model is None:
+                files = model_files()
+                if files is None:
+                    raise HTTPException(status_code=404, detail="Model not trained yet")
+                serving = await asyncio.to_thread(load_version, files["version"])
+                set_model_data(serving.model, serving.scaler, serving.features, serving.feature_spec,
+                               serving.version)
+    
+    # Feature spec (column layout + scaling) the model was trained with
+    if serving.feature_spec is None:
+        raise HTTPException(status_code=404, detail="Feature spec not found")
+    
+    return serving.model, serving.feature_spec
+
+
+def _prediction_result(prediction_prob: float) -> dict:
+    return {
+        "prediction": "Unsafe" if prediction_prob > 0.5 else "Safe",
+        "unsafe_probability": prediction_prob,
+        "safe_probability": 1 - prediction_prob,
+        "risk_level": "High" if prediction_prob > 0.7 else "Medium" if prediction_prob > 0.3 else "Low"
+    }
+
+
+def _predict_records(global_model, feature_spec, records: List[Dict[str, Any]], endpoint: str) -> List[float]:
+    """
+    Unsafe probability of each reading. Cached readings skip encoding and
+    inference; the rest go to the model in one call (and on to the shadow
+    model, if one is configured).
+    """
+    cache = _prediction_cache
+    if cache.enabled:
+        # No await since _load_predictor(): _model_version still names this snapshot
+        keys = [cache.key(_model_version, record) for record in records]
+        probabilities = cache.get_many(keys, endpoint)
+    else:
+        keys, probabilities = None, [None] * len(records)
+    
+    missing = [i for i, p in enumerate(probabilities) if p is None]
+    if missing:
+        pending = records if len(missing) == len(records) else [records[i] for i in missing]
+        start = time.perf_counter()
+        # Encode the full feature vectors (scaled numerics + one-hot statuses)
+        input_matrix = feature_spec.encode_records(pending)
+        with MODEL_INFERENCE_DURATION.time(endpoint=endpoint):
+            predicted = global_model.predict(input_matrix, batch_size=1024, verbose=0)[:, 0].tolist()
+        elapsed = time.perf_counter() - start
+        
+        for i, p in zip(missing, predicted):
+            probabilities[i] = p
+        if keys is not None:
+            cache.put_many([keys[i] for i in missing], predicted)
+        if _shadow.enabled:
+            _shadow.submit(pending, predicted, elapsed)
+    return probabilities
+
+
 @router.post("/predict")
 async def predict_water_quality(data: PredictionInput):
     """Make a prediction using the trained model"""
-    try:
-        import tensorflow as tf
-        from keras.models import load_model
-        TF_AVAILABLE = True
-    except ImportError:
-        TF_AVAILABLE = False
-    
-    global_model, scaler, features = get_model_data()
+    predictor = await _load_predictor()
     
-    if not TF_AVAILABLE:
+    if predictor is None:
         # Return simulated prediction
         risk_score = np.random.random()
         return {
@@ -123,42 +429,128 @@ async def predict_water_quality(data: PredictionInput):
             "simulated": True
         }
     
-    # Load model if not in memory
-    if global_model is None:
-        if os.path.exists(MODEL_PATH):
-            global_model = load_model(MODEL_PATH)
-            set_model_data(global_model, scaler, features)
-        else:
-            raise HTTPException(status_code=404, detail="Model not trained yet")
+    global_model, feature_spec = predictor
     
-    # Load scaler if not in memory
-    if scaler is None:
-        if os.path.exists(SCALER_PATH):
-            import joblib
-            scaler = joblib.load(SCALER_PATH)
-            set_model_data(global_model, scaler, features)
-        else:
-            raise HTTPException(status_code=404, detail="Scaler not found")
+    try:
+        prediction_prob = _predict_records(global_model, feature_spec, [data.model_dump()], "predict")[0]
+        return _prediction_result(prediction_prob)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/predict/batch")
+async def predict_water_quality_batch(data: BatchPredictionInput):
+    """
+    Predict many readings at once: one encode and one model call for the
+    whole batch instead of one request per reading.
+    """
+    predictor = await _load_predictor()
+    
+    if predictor is None:
+        risk_scores = np.random.random(len(data.readings))
+        return {
+            "predictions": [
+                {**_prediction_result(float(p)), "simulated": True} for p in risk_scores
+            ],
+            "count": len(data.readings),
+            "simulated": True
+        }
+    
+    global_model, feature_spec = predictor
     
     try:
-        # Prepare input data
-        numerical_values = np.array([[
-            data.pressure_bar, data.flow_rate_L_min, data.total_volume_L,
-            data.tds_ppm, data.ph, data.temperature_C, data.signal_strength_dBm
-        ]])
-        
-        # Scale numerical values
-        scaled_values = scaler.transform(numerical_values)
-        
-        # Make prediction
-        prediction_prob = float(global_model.predict(scaled_values, verbose=0)[0][0])
-        prediction = "Unsafe" if prediction_prob > 0.5 else "Safe"
-        
+        probabilities = _predict_records(
+            global_model, feature_spec, [r.model_dump() for r in data.readings], "predict_batch"
+        )
         return {
-            "prediction": prediction,
-            "unsafe_probability": prediction_prob,
-            "safe_probability": 1 - prediction_prob,
-            "risk_level": "High" if prediction_prob > 0.7 else "Medium" if prediction_prob > 0.3 else "Low"
+            "predictions": [_prediction_result(float(p)) for p in probabilities],
+            "count": len(probabilities)
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/cache")
+async def get_prediction_cache_stats():
+    """Prediction cache size and hit rate since startup"""
+    return {"model_generation": _model_version, **_prediction_cache.stats()}
+
+
+# ==================== Shadow evaluation ====================
+
+class ShadowConfig(BaseModel):
+    version: Optional[str] = None
+    sample_rate: float = Field(0.1, ge=0.0, le=1.0)
+
+
+def _load_shadow_predictor(version: str):
+    """Predict function of a registry version for the shadow worker (runs on its thread)."""
+    shadow = load_version(version)
+    if shadow.feature_spec is None:
+        raise ValueError(f"Model version {version} has no feature spec")
+    return lambda records: shadow.model.predict(
+        shadow.feature_spec.encode_records(records), batch_size=1024, verbose=0
+    )[:, 0]
+
+
+_shadow = ShadowEvaluator(_load_shadow_predictor, settings.SHADOW_QUEUE_SIZE)
+if settings.SHADOW_MODEL_VERSION:
+    _shadow.configure(settings.SHADOW_MODEL_VERSION, settings.SHADOW_SAMPLE_RATE)
+
+
+@router.get("/shadow")
+async def get_shadow_status():
+    """Agreement and latency of the shadow model against the serving model since it was configured"""
+    return {"serving": _serving.version, **_shadow.stats()}
+
+
+@router.post("/shadow")
+async def configure_shadow(config: ShadowConfig):
+    """Shadow a registry version on sample_rate of predict requests (version null turns it off)"""
+    if config.version is not None:
+        if not _registry.exists(config.version):
+            raise HTTPException(status_code=404, detail=f"Model version {config.version} not found")
+        if not _tensorflow_available():
+            raise HTTPException(status_code=503, detail="Shadow evaluation needs TensorFlow")
+    _shadow.configure(config.version, config.sample_rate)
+    return {"serving": _serving.version, **_shadow.stats()}
+
+
+# ==================== Model registry ====================
+
+@router.get("/versions")
+async def list_model_versions():
+    """Registered model versions with their metadata and metrics, and recent promotions"""
+    files = await asyncio.to_thread(model_files)
+    versions = await asyncio.to_thread(lambda: [_registry.metadata(v) for v in _registry.versions()])
+    return {
+        "current": files["version"] if files else None,
+        "serving": _serving.version,
+        "versions": versions[::-1],
+        "promotions": _registry.promotions()[-20:][::-1]
+    }
+
+
+@router.post("/versions/{version}/promote")
+async def promote_model_version(version: str):
+    """Serve a registered version (also used to roll back to any earlier version)"""
+    if not _registry.exists(version):
+        raise HTTPException(status_code=404, detail=f"Model version {version} not found")
+    try:
+        event = await activate_version(version, reason="promote")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Could not load {version}: {e}")
+    return {"message": f"Serving {version}", **event}
+
+
+@router.post("/rollback")
+async def rollback_model():
+    """Serve the version that was serving before the current one (repeat to step further back)"""
+    previous = _registry.previous()
+    if previous is None:
+        raise HTTPException(status_code=400, detail="No earlier version to roll back to")
+    try:
+        event = await activate_version(previous, reason="rollback")
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Could not load {previous}: {e}")
+    return {"message": f"Rolled back to {previous}", **event}
@@ -0,0 +1,300 @@
+"""
+Sensor reading ingestion routes.
+
+ESP32 devices POST batches of readings in the synthetic_dataset.csv schema.
+Readings are buffered in memory and written to the partitioned
+sensor_readings table with one COPY per batch, either when READINGS_BATCH_SIZE
+rows are pending or every READINGS_FLUSH_INTERVAL_SECONDS.
+
+A failed COPY is retried with the rows kept in order. Connection errors are
+retried until the database is back (the full buffer answers 503 meanwhile).
+Other errors, such as a row the table rejects, are retried
+READINGS_MAX_FLUSH_ATTEMPTS times; then the batch is split in halves until
+the failing rows are isolated. Those rows go to the dead-letter file
+(READINGS_DEAD_LETTER_FILE, one JSON object per line) and the rest are
+written. While flushes keep failing the loop backs off exponentially (up to
+READINGS_MAX_FLUSH_BACKOFF_SECONDS) and only the first failure is logged
+with a traceback.
+"""
+
+from fastapi import APIRouter, HTTPException, status
+from pydantic import BaseModel, Field
+from typing import List, Optional
+from datetime import datetime, timezone
+import asyncio
+import asyncpg
+import json
+import logging
+import os
+import time
+
+from auth.database import SENSOR_READING_COLUMNS, insert_sensor_readings, query_sensor_readings
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/api/readings", tags=["Sensor Readings"])
+
+DEAD_LETTER_FILE = settings.READINGS_DEAD_LETTER_FILE or os.path.join(
+    os.path.dirname(__file__), "..", "data", "readings_dead_letter.jsonl"
+)
+
+# Failures worth waiting out: the rows are fine, the database is not reachable
+TRANSIENT_ERRORS = (
+    OSError,
+    asyncio.TimeoutError,
+    asyncpg.InterfaceError,
+    asyncpg.PostgresConnectionError,
+    asyncpg.TooManyConnectionsError,
+    asyncpg.CannotConnectNowError,
+)
+
+
+class SensorReading(BaseModel):
+    timestamp: datetime
+    device_id: str
+    pressure_bar: Optional[float] = None
+    pressure_status: Optional[str] = None
+    flow_rate_L_min: Optional[float] = None
+    total_volume_L: Optional[float] = None
+    tds_ppm: Optional[float] = None
+    tds_status: Optional[str] = None
+    ph: Optional[float] = None
+    ph_status: Optional[str] = None
+    temperature_C: Optional[float] = None
+    wifi_status: Optional[str] = None
+    signal_strength_dBm: Optional[float] = None
+    sensor_status: Optional[str] = None
+    alert: Optional[str] = None
+
+
+class ReadingsBatch(BaseModel):
+    readings: List[SensorReading] = Field(..., min_length=1)
+
+
+# Table columns are lowercase; queries answer with the field names POST accepts
+FIELD_BY_COLUMN = {name.lower(): name for name in SensorReading.model_fields}
+
+
+# Pending rows, as tuples in SENSOR_READING_COLUMNS order
+_buffer: List[tuple] = []
+_flush_requested = asyncio.Event()
+_flush_lock = asyncio.Lock()
+_flush_task: Optional[asyncio.Task] = None
+_stopping = False
+# Consecutive non-transient flush failures of the rows at the head of the buffer
+_failed_attempts = 0
+# Consecutive failed flushes of any kind (drives the backoff)
+_failed_flushes = 0
+
+ingest_stats = {
+    "rows_received": 0,
+    "rows_written": 0,
+    "batches_written": 0,
+    "rows_rejected": 0,
+    "rows_dead_lettered": 0,
+    "last_flush_rows": 0,
+    "last_flush_seconds": 0.0,
+    "last_error": None,
+}
+
+
+def _to_record(r: SensorReading) -> tuple:
+    # Naive timestamps are UTC; others are converted, so partitions are chosen by UTC time
+    ts = r.timestamp.astimezone(timezone.utc) if r.timestamp.tzinfo else r.timestamp.replace(tzinfo=timezone.utc)
+    alert = r.alert if r.alert not in (None, "", "None") else None
+    return (
+        ts, r.device_id,
+        r.pressure_bar, r.pressure_status,
+        r.flow_rate_L_min, r.total_volume_L,
+        r.tds_ppm, r.tds_status,
+        r.ph, r.ph_status,
+        r.temperature_C, r.wifi_status, r.signal_strength_dBm,
+        r.sensor_status, alert,
+    )
+
+
+def _dead_letter(rows: List[tuple]):
+    """Append rejected rows with their errors to the dead-letter file (blocking)."""
+    at = datetime.now(timezone.utc).isoformat()
+    os.makedirs(os.path.dirname(os.path.abspath(DEAD_LETTER_FILE)), exist_ok=True)
+    with open(DEAD_LETTER_FILE, "a") as f:
+        for record, error in rows:
+            row = dict(zip(SENSOR_READING_COLUMNS, record))
+            row["timestamp"] = row["timestamp"].isoformat()
+            f.write(json.dumps({"at": at, "error": error, "reading": row}) + "\n")
+
+
+async def _write_isolating(batch: List[tuple]):
+    """
+    Write batch, halving any part that fails until single bad rows are left.
+    Returns (rows written, [(bad row, error)], rows still to retry after a
+    transient error).
+    """
+    written, bad = 0, []
+    parts = [batch]
+    while parts:
+        part = parts.pop()
+        try:
+            written += await insert_sensor_readings(part)
+        except TRANSIENT_ERRORS:
+            return written, bad, [row for p in [part] + parts[::-1] for row in p]
+        except Exception as e:
+            if len(part) == 1:
+                bad.append((part[0], str(e)))
+            else:
+                mid = len(part) // 2
+                parts += [part[mid:], part[:mid]]
+    return written, bad, []
+
+
+def _clear_failures():
+    global _failed_attempts, _failed_flushes
+    if _failed_flushes:
+        logger.info("Sensor reading writes recovered after %d failed flushes", _failed_flushes)
+    _failed_attempts = _failed_flushes = 0
+
+
+def _flush_delay(interval: float) -> float:
+    """Seconds until the next flush: interval, doubled per consecutive failure up to the cap."""
+    if not _failed_flushes:
+        return interval
+    return min(interval * 2 ** min(_failed_flushes, 32), settings.READINGS_MAX_FLUSH_BACKOFF_SECONDS)
+
+
+async def flush_readings() -> int:
+    """Write all buffered readings in one COPY. Returns the number of rows written."""
+    global _buffer, _failed_attempts, _failed_flushes
+    async with _flush_lock:
+        if not _buffer:
+            return 0
+        batch, _buffer = _buffer, []
+        start = time.perf_counter()
+        try:
+            if _failed_attempts >= settings.READINGS_MAX_FLUSH_ATTEMPTS:
+                written, bad, retry = await _write_isolating(batch)
+                if bad:
+                    await asyncio.to_thread(_dead_letter, bad)
+                    ingest_stats["rows_dead_lettered"] += len(bad)
+                    logger.error("Moved %d sensor readings that failed %d writes to %s: %s",
+                                 len(bad), _failed_attempts, DEAD_LETTER_FILE, bad[0][1])
+                if retry:
+                    _buffer = retry + _buffer
+                    ingest_stats["last_error"] = "database unavailable while isolating failed rows"
+                    _failed_flushes += 1
+                    if not written:
+                        return 0
+                else:
+                    _clear_failures()
+            else:
+                written = await insert_sensor_readings(batch)
+                _clear_failures()
+        except BaseException as e:
+            # Keep the rows (ahead of anything that arrived meanwhile) for the next attempt
+            _buffer = batch + _buffer
+            if not isinstance(e, Exception):
+                # Cancelled mid-COPY: the rows are back in the buffer for the final flush
+                raise
+            if not isinstance(e, TRANSIENT_ERRORS):
+                _failed_attempts += 1
+            _failed_flushes += 1
+            ingest_stats["last_error"] = str(e)
+            if _failed_flushes == 1:
+                logger.exception("Failed to write %d sensor readings, retrying with backoff", len(batch))
+            else:
+                logger.debug("Sensor reading write failed again (%d in a row): %s", _failed_flushes, e)
+            return 0
+        ingest_stats["rows_written"] += written
+        ingest_stats["batches_written"] += 1
+        ingest_stats["last_flush_rows"] = written
+        ingest_stats["last_flush_seconds"] = time.perf_counter() - start
+        if not _failed_attempts:
+            ingest_stats["last_error"] = None
+        return written
+
+
+async def _flush_loop(interval: float):
+    while not _stopping:
+        try:
+            await asyncio.wait_for(_flush_requested.wait(), timeout=_flush_delay(interval))
+        except asyncio.TimeoutError:
+            pass
+        _flush_requested.clear()
+        await flush_readings()
+
+
+def start_readings_flusher():
+    """Start the background batch writer (call on app startup)."""
+    global _flush_task, _stopping
+    if _flush_task is None:
+        _stopping = False
+        _flush_task = asyncio.create_task(_flush_loop(settings.READINGS_FLUSH_INTERVAL_SECONDS))
+
+
+async def stop_readings_flusher():
+    """Stop the batch writer and flush whatever is still buffered (call on app shutdown)."""
+    global _flush_task, _stopping
+    if _flush_task is not None:
+        # Let the loop finish a COPY in flight instead of cancelling it mid-write
+        _stopping = True
+        _flush_requested.set()
+        await _flush_task
+        _flush_task = None
+    await flush_readings()
+
+
+@router.post("", status_code=status.HTTP_202_ACCEPTED)
+async def ingest_readings(batch: ReadingsBatch):
+    """Accept a batch of device readings for asynchronous, batched persistence"""
+    if len(_buffer) + len(batch.readings) > settings.READINGS_MAX_BUFFERED:
+        ingest_stats["rows_rejected"] += len(batch.readings)
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Ingestion buffer full, retry later",
+            headers={"Retry-After": "1"},
+        )
+
+    _buffer.extend(_to_record(r) for r in batch.readings)
+    ingest_stats["rows_received"] += len(batch.readings)
+
+    # A full batch flushes early, unless writes are failing and the loop is backing off
+    if len(_buffer) >= settings.READINGS_BATCH_SIZE and not _failed_flushes:
+        _flush_requested.set()
+
+    return {
+        "accepted": len(batch.readings),
+        "buffered": len(_buffer)
+    }
+
+
+@router.get("")
+async def get_readings(
+    device_id: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    limit: int = 1000,
+):
+    """Query stored readings by device and time range (newest first)"""
+    if limit < 1 or limit > 10000:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 10000")
+    rows = await query_sensor_readings(device_id=device_id, start=start, end=end, limit=limit)
+    return {
+        "readings": [
+            {FIELD_BY_COLUMN.get(col, col): value.isoformat() if col == "timestamp" else value
+             for col, value in r.items()}
+            for r in rows
+        ],
+        "count": len(rows)
+    }
+
+
+@router.get("/stats")
+async def get_ingest_stats():
+    """Ingestion buffer and batch writer statistics"""
+    return {
+        **ingest_stats,
+        "buffered": len(_buffer),
+        "failed_flushes": _failed_flushes,
+        "batch_size": settings.READINGS_BATCH_SIZE,
+        "max_buffered": settings.READINGS_MAX_BUFFERED
+    }
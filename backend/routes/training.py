@@ -2,21 +2,35 @@
 Federated learning training routes.
 """
 
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from pydantic import BaseModel
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Header, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import Literal, Optional
 import numpy as np
 import asyncio
+import logging
 import time
 import os
 
-from core.utils import clean_for_json, create_model, load_and_prepare_data
-from routes.model import set_model_data
+from core.conditional import conditional_response, etag_for
+from core.events import EventLog
+from core.metrics import TRAINING_ROUND_DURATION
+from core.model_io import parse_formats, run_in_writer, save_version
+from core.profiling import PROFILE_MODES, create_profiler, header_mode
+from core.progress import FitProgressReporter
+from core.responses import FastJSONResponse, dumps_json
+from core.utils import create_model, federated_average, load_and_prepare_data
+from routes.model import ServingModel, activate_version, get_registry, publish_model_artifacts
+from config import settings
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/training", tags=["Federated Training"])
 
-MODEL_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "federated_water_quality_model.h5")
-SCALER_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "water_quality_scaler.pkl")
-DATA_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "synthetic_dataset.csv")
+DATA_DIR = os.path.join(os.path.dirname(__file__), "..", "data")
+DATA_PATH = os.path.join(DATA_DIR, "synthetic_dataset.csv")
+# Validated at import so a bad MODEL_SAVE_FORMATS fails at startup, not after training
+SAVE_FORMATS = parse_formats(settings.MODEL_SAVE_FORMATS)
 
 # Training status
 training_status = {
@@ -26,37 +40,199 @@ training_status = {
     "client_metrics": [],
     "global_metrics": None,
     "last_updated": None,
-    "round_history": []
+    "round_history": [],
+    "client_progress": {}
 }
 
+# Progress events for delta polling, long-polling and the SSE stream
+training_events = EventLog(max_events=settings.TRAINING_EVENTS_BUFFER)
+
 
 class TrainingConfig(BaseModel):
     rounds: int = 5
     epochs_per_round: int = 20
     batch_size: int = 32
     num_clients: int = 5
+    # File name, glob (e.g. "*.csv") or "." for every dataset in backend/data
+    dataset: Optional[str] = None
+    # How rows are assigned to clients (see core.partitioning)
+    partition_strategy: Literal["contiguous", "device", "dirichlet", "time"] = "contiguous"
+    dirichlet_alpha: float = Field(0.5, gt=0)
+
+
+def resolve_training_source(dataset: Optional[str]) -> str:
+    """Resolve a dataset name/glob relative to the data directory."""
+    if not dataset:
+        return DATA_PATH
+    data_dir = os.path.abspath(DATA_DIR)
+    source = os.path.abspath(os.path.join(data_dir, dataset))
+    if source != data_dir and not source.startswith(data_dir + os.sep):
+        raise HTTPException(status_code=400, detail="Dataset must be inside the data directory")
+    return source
+
+
+def _status_summary() -> dict:
+    """The small part of training_status that every progress event carries."""
+    return {
+        "is_training": training_status.get('is_training'),
+        "current_round": training_status.get('current_round'),
+        "total_rounds": training_status.get('total_rounds'),
+        "last_updated": training_status.get('last_updated')
+    }
+
+
+def publish_training_event(event_type: str, data: Optional[dict] = None):
+    """Record a progress event for delta, long-poll and SSE readers."""
+    return training_events.publish(event_type, data, status=_status_summary())
+
+
+def _rounds_since(since: int):
+    """
+    Rounds completed after version `since`.
+
+    Returns (rounds, version, reset). reset is True when the rounds replace
+    the reader's history rather than extend it: a new run started, or the
+    reader is too far behind and gets the full history.
+    """
+    version = training_events.version
+    events = training_events.since(since)
+    if events is None:
+        return training_status.get('round_history', []), version, True
+    if not events:
+        return [], since, False
+    
+    reset = False
+    rounds = []
+    for event in events:
+        if event['type'] == 'training_started':
+            rounds, reset = [], True
+        elif event['type'] == 'round_completed':
+            rounds.append(event['data'])
+    return rounds, events[-1]['version'], reset
+
+
+def record_epoch_progress(client_id: str, round_num: int, epoch: dict):
+    """FitProgressReporter hook: latest epoch of each client's fit (runs in the fit thread)."""
+    training_status.setdefault('client_progress', {})[client_id] = {
+        'round': round_num,
+        'epochs_planned': training_status.get('config', {}).get('epochs_per_round'),
+        **epoch
+    }
+    publish_training_event("client_epoch", {"client_id": client_id, "round": round_num, "epoch": epoch})
 
 
 @router.get("/status")
-async def get_training_status():
-    """Get current federated training status"""
-    return clean_for_json(training_status)
+async def get_training_status(since: Optional[int] = Query(None, ge=0)):
+    """
+    Get current federated training status.
+    
+    With since=<version> (from a previous response), round_history holds only
+    the rounds completed after that version.
+    """
+    if since is None:
+        return FastJSONResponse({**training_status, "version": training_events.version})
+    
+    rounds, version, reset = _rounds_since(since)
+    return FastJSONResponse({**training_status, "round_history": rounds, "version": version, "reset": reset})
 
 
 @router.get("/history")
-async def get_training_history():
-    """Get history of all training rounds"""
-    return clean_for_json({
-        "round_history": training_status.get('round_history', []),
-        "total_rounds_completed": len(training_status.get('round_history', [])),
-        "global_metrics": training_status.get('global_metrics')
+async def get_training_history(request: Request, since: Optional[int] = Query(None, ge=0)):
+    """
+    Get history of all training rounds (only rounds after `since` when given).
+
+    Every change to the history publishes an event, so the event log version
+    is the ETag's content version.
+    """
+    def build():
+        if since is None:
+            rounds, version, reset = training_status.get('round_history', []), training_events.version, True
+        else:
+            rounds, version, reset = _rounds_since(since)
+        return FastJSONResponse({
+            "round_history": rounds,
+            "total_rounds_completed": len(training_status.get('round_history', [])),
+            "global_metrics": training_status.get('global_metrics'),
+            "version": version,
+            "reset": reset
+        })
+
+    return conditional_response(request, etag_for("training-history", since, training_events.version), build)
+
+
+@router.get("/events")
+async def get_training_events(
+    since: int = Query(0, ge=0),
+    timeout: float = Query(25.0, ge=0, le=60)
+):
+    """
+    Long-poll for progress events after version `since`.
+    
+    Returns as soon as there is at least one new event, or with an empty list
+    after `timeout` seconds. resync=True means the events are gone; reload
+    /status and continue from its version.
+    """
+    events = await training_events.wait_since(since, timeout)
+    if events is None:
+        return FastJSONResponse({"version": training_events.version, "events": [], "resync": True})
+    return FastJSONResponse({
+        "version": events[-1]['version'] if events else since,
+        "events": events,
+        "resync": False
     })
 
 
-async def run_federated_training(num_rounds: int, epochs_per_round: int, batch_size: int, num_clients: int):
+@router.get("/stream")
+async def stream_training_events(
+    request: Request,
+    since: Optional[int] = Query(None, ge=0),
+    last_event_id: Optional[str] = Header(None)
+):
+    """
+    Server-Sent Events stream of training progress.
+    
+    Each message is one event (id = version). Starts after `since`, or after
+    the Last-Event-ID header when the browser reconnects, or from now. A
+    'resync' event tells the reader to reload /status.
+    """
+    if last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+    if since is None:
+        since = training_events.version
+    heartbeat = settings.TRAINING_STREAM_HEARTBEAT_SECONDS
+    
+    async def event_stream():
+        version = since
+        yield "retry: 3000\n\n"
+        while not await request.is_disconnected():
+            events = await training_events.wait_since(version, heartbeat)
+            if events is None:
+                version = training_events.version
+                resync = {"version": version, "type": "resync", "data": {}, "status": _status_summary()}
+                yield f"id: {version}\ndata: {dumps_json(resync).decode()}\n\n"
+            elif not events:
+                yield ": keep-alive\n\n"
+            else:
+                for event in events:
+                    yield f"id: {event['version']}\ndata: {dumps_json(event).decode()}\n\n"
+                version = events[-1]['version']
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def run_federated_training(num_rounds: int, epochs_per_round: int, batch_size: int, num_clients: int,
+                                 data_source: str = DATA_PATH, partition_strategy: str = "contiguous",
+                                 dirichlet_alpha: float = 0.5, profile_mode: Optional[str] = None):
     """Run actual federated learning training rounds"""
     global training_status
     
+    # Profiles the load, split, fit, evaluate, aggregate and save phases when requested
+    profiler = create_profiler(profile_mode, "training")
+    
     try:
         from sklearn.model_selection import train_test_split
         from keras.callbacks import EarlyStopping
@@ -66,12 +242,20 @@ async def run_federated_training(num_rounds: int, epochs_per_round: int, batch_s
     
     try:
         # Load and prepare data
-        print(f"\n[FEDERATED] Starting federated learning with {num_clients} clients...")
-        prepared_data = load_and_prepare_data(DATA_PATH, num_clients)
+        logger.info("Starting federated learning with %d clients", num_clients,
+                    extra={"rounds": num_rounds, "partition_strategy": partition_strategy})
+        # Chunked read, scaling and sharding run off the event loop too
+        prepared_data = await asyncio.to_thread(
+            profiler.call, "load", load_and_prepare_data,
+            data_source, num_clients, strategy=partition_strategy, alpha=dirichlet_alpha,
+            chunksize=settings.TRAINING_CHUNKSIZE,
+            memmap_dir=settings.TRAINING_MEMMAP_DIR or None
+        )
         
         if prepared_data is None:
             training_status['is_training'] = False
             training_status['error'] = "Failed to load training data"
+            publish_training_event("training_failed", {"error": training_status['error']})
             return
         
         if not TF_AVAILABLE:
@@ -80,22 +264,27 @@ async def run_federated_training(num_rounds: int, epochs_per_round: int, batch_s
             return
         
         scaler = prepared_data["scaler"]
+        feature_spec = prepared_data["feature_spec"]
         features = prepared_data["features"]
         client_data_raw = prepared_data["client_data"]
         
-        # Split client data into train/test
+        # Split each client's row indices into train/test; rows are gathered
+        # from the shared arrays only while that client is being trained
         client_data = {}
-        for client_id, data in client_data_raw.items():
-            X_train, X_test, y_train, y_test = train_test_split(
-                data['X'], data['y'], test_size=0.2, random_state=42,
-                stratify=data['y'] if len(np.unique(data['y'])) > 1 else None
-            )
-            client_data[client_id] = {
-                'X_train': X_train,
-                'X_test': X_test,
-                'y_train': y_train,
-                'y_test': y_test
-            }
+        with profiler.phase("split"):
+            for client_id, shard in client_data_raw.items():
+                rows = shard.indices
+                y_rows = shard.y
+                class_counts = np.unique(y_rows, return_counts=True)[1]
+                train_rows, test_rows = train_test_split(
+                    rows, test_size=0.2, random_state=42,
+                    stratify=y_rows if len(class_counts) > 1 and class_counts.min() >= 2 else None
+                )
+                client_data[client_id] = {
+                    'shard': shard,
+                    'train_rows': np.sort(train_rows),
+                    'test_rows': np.sort(test_rows)
+                }
         
         # Initialize global model
         input_shape = len(features)
@@ -105,15 +294,20 @@ async def run_federated_training(num_rounds: int, epochs_per_round: int, batch_s
         training_status['round_history'] = []
         
         for round_num in range(1, num_rounds + 1):
-            print(f"\n--- Federated Round {round_num}/{num_rounds} ---")
+            logger.info("Federated round %d/%d", round_num, num_rounds)
             training_status['current_round'] = round_num
             training_status['last_updated'] = time.strftime('%Y-%m-%d %H:%M:%S')
+            publish_training_event("round_started", {"round": round_num})
+            round_start = time.perf_counter()
             
             # Train on each client and collect weights
             client_weights_list = []
             round_metrics = []
             
             for client_id, data in client_data.items():
+                X_train, y_train = data['shard'].take(data['train_rows'])
+                X_test, y_test = data['shard'].take(data['test_rows'])
+                
                 # Create local model and set global weights
                 local_model = create_model(input_shape)
                 local_model.set_weights(global_weights)
@@ -126,44 +320,60 @@ async def run_federated_training(num_rounds: int, epochs_per_round: int, batch_s
                     min_delta=0.001
                 )
                 
-                history = local_model.fit(
-                    data['X_train'], data['y_train'],
+                reporter = FitProgressReporter(
+                    client_id, round_num, len(X_train), batch_size, epochs_per_round,
+                    validation_split=0.2, early_stopping=early_stop,
+                    on_epoch=record_epoch_progress
+                )
+                
+                # Fit off the event loop so the API and progress stream stay responsive
+                history = await asyncio.to_thread(
+                    profiler.call, "fit", local_model.fit,
+                    X_train, y_train,
                     epochs=epochs_per_round,
                     batch_size=batch_size,
                     validation_split=0.2,
-                    callbacks=[early_stop],
+                    callbacks=[early_stop, reporter],
                     verbose=0
                 )
+                fit_summary = reporter.summary()
                 
                 # Collect weights
                 client_weights_list.append(local_model.get_weights())
                 
                 # Evaluate locally
-                loss, accuracy, precision, recall = local_model.evaluate(
-                    data['X_test'], data['y_test'], verbose=0
+                loss, accuracy, precision, recall = await asyncio.to_thread(
+                    profiler.call, "evaluate", local_model.evaluate, X_test, y_test, verbose=0
                 )
                 f1 = 2 * (precision * recall) / (precision + recall) if (precision + recall) > 0 else 0
                 
                 metrics = {
                     'client_id': client_id,
+                    'samples': len(data['shard']),
                     'accuracy': float(accuracy),
                     'precision': float(precision),
                     'recall': float(recall),
                     'f1_score': float(f1),
-                    'loss': float(loss)
+                    'loss': float(loss),
+                    'fit': fit_summary
                 }
                 round_metrics.append(metrics)
-                print(f"  {client_id}: Acc={accuracy:.4f}, Prec={precision:.4f}, Rec={recall:.4f}, F1={f1:.4f}")
+                publish_training_event("client_completed", {"round": round_num, "metrics": metrics})
+                logger.info(
+                    "%s: Acc=%.4f, Prec=%.4f, Rec=%.4f, F1=%.4f, %d/%d epochs in %.1fs%s",
+                    client_id, accuracy, precision, recall, f1,
+                    fit_summary['epochs_completed'], epochs_per_round, fit_summary['total_seconds'],
+                    " (early stop)" if fit_summary['early_stopped'] else "",
+                    extra={"client_id": client_id, "round": round_num,
+                           "samples_per_second": fit_summary['samples_per_second']}
+                )
             
             # Federated Averaging
-            new_weights = []
-            for layer_weights in zip(*client_weights_list):
-                avg_weights = np.mean(layer_weights, axis=0)
-                new_weights.append(avg_weights)
-            
-            # Update global model
-            global_weights = new_weights
-            global_model.set_weights(global_weights)
+            with profiler.phase("aggregate"):
+                global_weights = federated_average(client_weights_list)
+                
+                # Update global model
+                global_model.set_weights(global_weights)
             
             # Calculate round averages
             avg_metrics = {
@@ -175,24 +385,31 @@ async def run_federated_training(num_rounds: int, epochs_per_round: int, batch_s
             }
             
             # Store round history
-            training_status['round_history'].append({
+            round_entry = {
                 'round': round_num,
                 'client_metrics': round_metrics,
                 'average_metrics': avg_metrics,
                 'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
-            })
+            }
+            training_status['round_history'].append(round_entry)
             
             training_status['client_metrics'] = round_metrics
-            print(f"  Round {round_num} average: Acc={avg_metrics['accuracy']:.4f}, F1={avg_metrics['f1_score']:.4f}")
+            TRAINING_ROUND_DURATION.observe(time.perf_counter() - round_start, mode="federated")
+            publish_training_event("round_completed", round_entry)
+            logger.info("Round %d average: Acc=%.4f, F1=%.4f", round_num, avg_metrics['accuracy'],
+                        avg_metrics['f1_score'], extra={"round": round_num, "average_metrics": avg_metrics})
             
             # Small delay between rounds
             await asyncio.sleep(0.5)
         
         # Final evaluation on combined test set
-        all_X_test = np.concatenate([client_data[c]['X_test'] for c in client_data.keys()])
-        all_y_test = np.concatenate([client_data[c]['y_test'] for c in client_data.keys()])
+        all_test_rows = np.concatenate([client_data[c]['test_rows'] for c in client_data.keys()])
+        all_X_test = prepared_data['full_data']['X'][all_test_rows]
+        all_y_test = prepared_data['full_data']['y'][all_test_rows]
         
-        loss, accuracy, precision, recall = global_model.evaluate(all_X_test, all_y_test, verbose=0)
+        loss, accuracy, precision, recall = await asyncio.to_thread(
+            profiler.call, "evaluate", global_model.evaluate, all_X_test, all_y_test, verbose=0
+        )
         f1 = 2 * (precision * recall) / (precision + recall) if (precision + recall) > 0 else 0
         
         training_status['global_metrics'] = {
@@ -204,28 +421,59 @@ async def run_federated_training(num_rounds: int, epochs_per_round: int, batch_s
             'total_test_samples': len(all_y_test)
         }
         
-        # Save the trained model
-        global_model.save(MODEL_PATH)
-        print(f"\n✓ Model saved to {MODEL_PATH}")
-        
-        # Save scaler
-        import joblib
-        joblib.dump(scaler, SCALER_PATH)
-        print(f"✓ Scaler saved to {SCALER_PATH}")
+        # Model, scaler and feature spec (column order, vocabularies, scaling)
+        # become a new immutable registry version; nothing is overwritten in place.
+        # Written on the model writer thread so the event loop keeps serving
+        version, save_seconds = await run_in_writer(
+            profiler.call, "save", save_version,
+            get_registry(), global_model, scaler, feature_spec, SAVE_FORMATS,
+            {
+                "source": "training",
+                "metrics": training_status['global_metrics'],
+                "config": training_status.get('config'),
+                "rounds_completed": len(training_status.get('round_history', []))
+            }
+        )
+        logger.info("Model saved to the registry as %s (%s)", version,
+                    ", ".join(f"{name} {secs:.2f}s" for name, secs in save_seconds.items()),
+                    extra={"save_seconds": save_seconds})
+        training_status['model_version'] = version
+        training_status['save_seconds'] = save_seconds
         
-        # Update model data in model module
-        set_model_data(global_model, scaler, features)
+        # Serve the new version (swapped in atomically; the previous one stays available for rollback)
+        if settings.MODEL_AUTO_PROMOTE:
+            await activate_version(
+                version, reason="training",
+                loaded=ServingModel(version, global_model, scaler, features, feature_spec)
+            )
+            
+            # Prebuild the compressed artifacts clients will fetch
+            try:
+                manifest = await publish_model_artifacts()
+                training_status['artifact_version'] = manifest['version']
+            except Exception:
+                logger.exception("Publishing model artifacts failed")
         
         training_status['is_training'] = False
         training_status['last_updated'] = time.strftime('%Y-%m-%d %H:%M:%S')
-        print(f"\n✓ Federated learning completed! Final Accuracy: {accuracy:.4f}, F1: {f1:.4f}")
+        publish_training_event("training_completed", {"global_metrics": training_status['global_metrics']})
+        logger.info("Federated learning completed: Acc=%.4f, F1=%.4f", accuracy, f1,
+                    extra={"global_metrics": training_status['global_metrics']})
         
     except Exception as e:
-        import traceback
-        print(f"Training error: {str(e)}")
-        traceback.print_exc()
+        logger.exception("Training error: %s", e)
         training_status['is_training'] = False
         training_status['error'] = str(e)
+        publish_training_event("training_failed", {"error": str(e)})
+    
+    finally:
+        if profiler.mode is not None:
+            try:
+                profile_path = await asyncio.to_thread(profiler.save)
+                training_status['profile'] = profile_path
+                logger.info("Training profile written to %s", profile_path, extra={"profile_mode": profiler.mode})
+            except Exception as e:
+                logger.error("Could not write training profile: %s", e)
 
 
 async def run_simulated_training(num_rounds: int):
@@ -237,6 +485,8 @@ async def run_simulated_training(num_rounds: int):
     for round_num in range(1, num_rounds + 1):
         training_status['current_round'] = round_num
         training_status['last_updated'] = time.strftime('%Y-%m-%d %H:%M:%S')
+        publish_training_event("round_started", {"round": round_num})
+        round_start = time.perf_counter()
         
         # Simulate improving metrics
         base = 0.70 + (round_num * 0.04)
@@ -253,19 +503,23 @@ async def run_simulated_training(num_rounds: int):
                 'loss': float(max(0.1, 0.5 - round_num * 0.08))
             }
             round_metrics.append(metrics)
+            publish_training_event("client_completed", {"round": round_num, "metrics": metrics})
         
         avg_metrics = {k: float(np.mean([m[k] for m in round_metrics])) 
                       for k in round_metrics[0].keys() if k != 'client_id'}
         
-        training_status['round_history'].append({
+        round_entry = {
             'round': round_num,
             'client_metrics': round_metrics,
             'average_metrics': avg_metrics,
             'timestamp': time.strftime('%Y-%m-%d %H:%M:%S')
-        })
+        }
+        training_status['round_history'].append(round_entry)
         
         training_status['client_metrics'] = round_metrics
         await asyncio.sleep(2)
+        TRAINING_ROUND_DURATION.observe(time.perf_counter() - round_start, mode="simulated")
+        publish_training_event("round_completed", round_entry)
     
     training_status['is_training'] = False
     training_status['global_metrics'] = {
@@ -276,11 +530,22 @@ async def run_simulated_training(num_rounds: int):
         'loss': float(0.15 + np.random.random() * 0.05)
     }
     training_status['last_updated'] = time.strftime('%Y-%m-%d %H:%M:%S')
+    publish_training_event("training_completed", {"global_metrics": training_status['global_metrics']})
 
 
 @router.post("/start")
-async def start_training(config: TrainingConfig, background_tasks: BackgroundTasks):
-    """Start federated learning training"""
+async def start_training(
+    config: TrainingConfig,
+    background_tasks: BackgroundTasks,
+    x_profile_training: Optional[str] = Header(None),
+    authorization: Optional[str] = Header(None)
+):
+    """
+    Start federated learning training.
+    
+    Admins can profile the run with an X-Profile-Training: cprofile|sample
+    header when PROFILING_ENABLED is set; PROFILE_TRAINING profiles every run.
+    """
     global training_status
     
     try:
@@ -292,6 +557,11 @@ async def start_training(config: TrainingConfig, background_tasks: BackgroundTas
     if training_status['is_training']:
         raise HTTPException(status_code=400, detail="Training already in progress")
     
+    data_source = resolve_training_source(config.dataset)
+    profile_mode = header_mode(x_profile_training, authorization)
+    if profile_mode is None and settings.PROFILE_TRAINING in PROFILE_MODES:
+        profile_mode = settings.PROFILE_TRAINING
+    
     training_status = {
         "is_training": True,
         "current_round": 0,
@@ -300,26 +570,37 @@ async def start_training(config: TrainingConfig, background_tasks: BackgroundTas
         "global_metrics": None,
         "last_updated": time.strftime('%Y-%m-%d %H:%M:%S'),
         "round_history": [],
+        "client_progress": {},
         "config": {
             "rounds": config.rounds,
             "epochs_per_round": config.epochs_per_round,
             "batch_size": config.batch_size,
-            "num_clients": config.num_clients
+            "num_clients": config.num_clients,
+            "dataset": config.dataset,
+            "partition_strategy": config.partition_strategy,
+            "dirichlet_alpha": config.dirichlet_alpha,
+            "profile": profile_mode
         }
     }
+    publish_training_event("training_started", {"config": training_status['config']})
     
     background_tasks.add_task(
         run_federated_training,
         config.rounds,
         config.epochs_per_round,
         config.batch_size,
-        config.num_clients
+        config.num_clients,
+        data_source,
+        config.partition_strategy,
+        config.dirichlet_alpha,
+        profile_mode
     )
     
     return {
         "message": "Federated training started",
         "config": training_status['config'],
-        "tensorflow_available": TF_AVAILABLE
+        "tensorflow_available": TF_AVAILABLE,
+        "version": training_events.version
     }
 
 
@@ -333,6 +614,7 @@ async def stop_training():
     
     training_status['is_training'] = False
     training_status['last_updated'] = time.strftime('%Y-%m-%d %H:%M:%S')
+    publish_training_event("training_stopped", {"completed_rounds": training_status['current_round']})
     
     return {
         "message": "Training stopped",
@@ -16,8 +16,8 @@ from auth.database import (
     list_portal_users,
     update_portal_user,
     delete_portal_user,
-    update_portal_user_last_sign_in,
 )
+from auth.sign_in_buffer import record_sign_in
 from auth.jwt_handler import create_access_token, create_refresh_token, get_current_active_user
 from auth.models import (
     PortalUserCreate,
@@ -68,8 +68,8 @@ async def user_login(payload: PortalUserLogin):
             detail="Your account has been deactivated. Please contact your administrator.",
         )
 
-    # Record sign-in timestamp
-    await update_portal_user_last_sign_in(str(user["id"]))
+    # Record sign-in timestamp (flushed in batches in the background)
+    record_sign_in("portal_users", str(user["id"]))
 
     # Build JWT with role = "user" so we can distinguish from admin tokens
     token_data = {
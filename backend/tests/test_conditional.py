@@ -0,0 +1,103 @@
+"""
+Conditional GET: matching validators answer 304 without building the body,
+a version change or a restart (new BOOT_ID) changes the ETag.
+
+Run from backend/: python -m pytest -q tests
+"""
+
+import importlib.util
+import os
+import sys
+from email.utils import formatdate
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from core import conditional  # noqa: E402
+from core.conditional import conditional_response, etag_for  # noqa: E402
+from core.responses import FastJSONResponse  # noqa: E402
+
+LAST_MODIFIED = 1_700_000_000
+
+
+@pytest.fixture
+def versioned():
+    """App serving {"version": n} with validators derived from n; counts body builds."""
+    app = FastAPI()
+    state = {"version": 1, "builds": 0}
+
+    @app.get("/thing")
+    async def thing(request: Request):
+        def build():
+            state["builds"] += 1
+            return FastJSONResponse({"version": state["version"]})
+        return conditional_response(request, etag_for("thing", state["version"]), build,
+                                    last_modified=LAST_MODIFIED + state["version"])
+
+    return TestClient(app), state
+
+
+def test_matching_etag_skips_the_body(versioned):
+    client, state = versioned
+    first = client.get("/thing")
+    assert first.status_code == 200 and first.headers["cache-control"] == "no-cache"
+    etag = first.headers["etag"]
+
+    for header in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        response = client.get("/thing", headers={"If-None-Match": header})
+        assert response.status_code == 304, header
+        assert response.content == b""
+        assert response.headers["etag"] == etag
+    assert state["builds"] == 1
+
+    state["version"] = 2
+    changed = client.get("/thing", headers={"If-None-Match": etag})
+    assert changed.status_code == 200 and changed.json() == {"version": 2}
+    assert changed.headers["etag"] != etag
+
+
+def test_if_modified_since_only_without_if_none_match(versioned):
+    client, _ = versioned
+    later = formatdate(LAST_MODIFIED + 10, usegmt=True)
+    assert client.get("/thing", headers={"If-Modified-Since": later}).status_code == 304
+    earlier = formatdate(LAST_MODIFIED - 10, usegmt=True)
+    assert client.get("/thing", headers={"If-Modified-Since": earlier}).status_code == 200
+    # If-None-Match wins even when the date alone would match
+    response = client.get("/thing", headers={"If-Modified-Since": later, "If-None-Match": '"stale"'})
+    assert response.status_code == 200
+
+
+def test_restart_changes_every_etag(versioned, monkeypatch):
+    client, _ = versioned
+    etag = client.get("/thing").headers["etag"]
+    assert etag_for("thing", 1) == etag
+    # Same version counter in a new process must not validate the old copy
+    monkeypatch.setattr(conditional, "BOOT_ID", "restart1")
+    assert etag_for("thing", 1) != etag
+    assert client.get("/thing", headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_client_local_data_revalidates_until_readings_arrive(tmp_path):
+    spec = importlib.util.spec_from_file_location(
+        "client_server_conditional", os.path.join(BACKEND_DIR, "client", "server.py"))
+    server = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(server)
+    server.READINGS_LOG_DIR = str(tmp_path)
+
+    app = server.create_client_app(client_id="etag_client", data_file="no_such_dataset.csv")
+    with TestClient(app) as client:
+        first = client.get("/api/local-data")
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+        assert client.get("/api/local-data", headers={"If-None-Match": etag}).status_code == 304
+
+        reading = {"timestamp": "2025-01-01T00:00:00", "ph": 7.1, "tds_ppm": 250.0}
+        assert client.post("/api/readings", json={"readings": [reading]}).status_code == 200
+
+        after = client.get("/api/local-data", headers={"If-None-Match": etag})
+        assert after.status_code == 200
+        assert after.headers["etag"] != etag
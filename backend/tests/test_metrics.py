@@ -0,0 +1,215 @@
+"""
+/metrics of the admin and client apps must parse as Prometheus text
+exposition format 0.0.4.
+
+The parser below follows the format spec strictly (HELP/TYPE lines, label
+escaping, histogram series) so the test runs without extra packages; when
+prometheus_client is installed its parser checks the same bodies too.
+
+Run from backend/: python -m pytest -q tests
+"""
+
+import importlib.util
+import math
+import os
+import re
+import sys
+
+import pytest
+from fastapi.testclient import TestClient
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from core.metrics import REGISTRY, Counter  # noqa: E402
+
+METRIC_TYPES = {"counter", "gauge", "histogram", "summary", "untyped"}
+NAME = re.compile(r"[a-zA-Z_:][a-zA-Z0-9_:]*")
+LABEL_NAME = re.compile(r"[a-zA-Z_][a-zA-Z0-9_]*")
+ESCAPES = {"\\": "\\", '"': '"', "n": "\n"}
+
+# Label value exercising every escape the format defines
+TRICKY_VALUE = 'quote " backslash \\ newline \n end'
+ESCAPE_TEST = Counter("test_escape_total", "Label escaping check", ("value",))
+
+
+def _parse_labels(text: str, pos: int):
+    """Parse `{name="value",...}` starting at text[pos] == "{"; returns (labels, end)."""
+    labels = {}
+    pos += 1
+    while text[pos] != "}":
+        match = LABEL_NAME.match(text, pos)
+        assert match, f"bad label name at {text[pos:]!r}"
+        name = match.group()
+        pos = match.end()
+        assert text[pos:pos + 2] == '="', f"expected =\" after {name}"
+        pos += 2
+        value = []
+        while text[pos] != '"':
+            if text[pos] == "\\":
+                assert text[pos + 1] in ESCAPES, f"invalid escape \\{text[pos + 1]}"
+                value.append(ESCAPES[text[pos + 1]])
+                pos += 2
+            else:
+                assert text[pos] != "\n", "raw newline in label value"
+                value.append(text[pos])
+                pos += 1
+        pos += 1
+        assert name not in labels, f"duplicate label {name}"
+        labels[name] = "".join(value)
+        if text[pos] == ",":
+            pos += 1
+    return labels, pos + 1
+
+
+def _parse_value(text: str) -> float:
+    special = {"+Inf": math.inf, "-Inf": -math.inf, "NaN": math.nan}
+    return special[text] if text in special else float(text)
+
+
+def parse_exposition(body: str):
+    """
+    Parse a text-format body into {family: {"type", "help", "samples": [(name, labels, value)]}},
+    failing on anything the format does not allow.
+    """
+    assert body.endswith("\n"), "body must end with a newline"
+    families = {}
+    current = None
+    for line in body.split("\n")[:-1]:
+        if line.startswith("# HELP ") or line.startswith("# TYPE "):
+            keyword, rest = line[2:6], line[7:]
+            name, _, arg = rest.partition(" ")
+            assert NAME.fullmatch(name), f"bad metric name {name!r}"
+            family = families.setdefault(name, {"type": "untyped", "help": None, "samples": []})
+            if keyword == "TYPE":
+                assert arg in METRIC_TYPES, f"unknown type {arg!r}"
+                assert not family["samples"], f"TYPE of {name} after its samples"
+                family["type"] = arg
+            else:
+                family["help"] = arg
+            current = name
+            continue
+        if line.startswith("#") or not line.strip():
+            continue
+
+        match = NAME.match(line)
+        assert match, f"bad sample line {line!r}"
+        name, pos = match.group(), match.end()
+        labels = {}
+        if pos < len(line) and line[pos] == "{":
+            labels, pos = _parse_labels(line, pos)
+        assert line[pos] == " ", f"expected space before value in {line!r}"
+        value = _parse_value(line[pos + 1:].split(" ")[0])
+
+        family_name = name
+        if current is not None and families[current]["type"] in ("histogram", "summary"):
+            for suffix in ("_bucket", "_sum", "_count"):
+                if name == current + suffix:
+                    family_name = current
+        assert family_name == current, f"sample {name} outside its family block"
+        families[family_name]["samples"].append((name, labels, value))
+    return families
+
+
+def check_histograms(families):
+    """Each histogram series has cumulative buckets ending in +Inf == _count, and a _sum."""
+    for family_name, family in families.items():
+        if family["type"] != "histogram":
+            continue
+        series = {}
+        for name, labels, value in family["samples"]:
+            key = tuple(sorted((k, v) for k, v in labels.items() if k != "le"))
+            entry = series.setdefault(key, {"buckets": [], "sum": None, "count": None})
+            if name.endswith("_bucket"):
+                entry["buckets"].append((_parse_value(labels["le"]), value))
+            elif name.endswith("_sum"):
+                entry["sum"] = value
+            else:
+                entry["count"] = value
+        for key, entry in series.items():
+            bounds = [b for b, _ in entry["buckets"]]
+            counts = [c for _, c in entry["buckets"]]
+            assert bounds == sorted(bounds) and bounds[-1] == math.inf, f"{family_name}{key}: bad le order"
+            assert counts == sorted(counts), f"{family_name}{key}: buckets not cumulative"
+            assert entry["sum"] is not None and entry["count"] == counts[-1], f"{family_name}{key}"
+
+
+def _load_module(name: str, relative_path: str):
+    spec = importlib.util.spec_from_file_location(name, os.path.join(BACKEND_DIR, relative_path))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture(scope="module")
+def admin_client():
+    return TestClient(_load_module("admin_server", os.path.join("admin", "server.py")).app)
+
+
+@pytest.fixture(scope="module")
+def client_client():
+    return TestClient(_load_module("client_server", os.path.join("client", "server.py")).app)
+
+
+def _scrape(client, warmup_path: str):
+    for _ in range(3):
+        client.get(warmup_path)
+    ESCAPE_TEST.inc(value=TRICKY_VALUE)
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    return response.text
+
+
+@pytest.mark.parametrize("app_fixture, warmup_path", [
+    ("admin_client", "/api/health"),
+    ("client_client", "/api/health"),
+])
+def test_metrics_scrape(request, app_fixture, warmup_path):
+    body = _scrape(request.getfixturevalue(app_fixture), warmup_path)
+    families = parse_exposition(body)
+
+    # Counter: per-route request totals
+    requests = families["http_requests_total"]
+    assert requests["type"] == "counter"
+    health = [v for _, labels, v in requests["samples"]
+              if labels.get("route") == warmup_path and labels.get("method") == "GET"]
+    assert health and sum(health) >= 3
+
+    # Histogram: _bucket/_sum/_count series that add up
+    latency = families["http_request_duration_seconds"]
+    assert latency["type"] == "histogram"
+    names = {name for name, _, _ in latency["samples"]}
+    assert names == {"http_request_duration_seconds_bucket",
+                     "http_request_duration_seconds_sum",
+                     "http_request_duration_seconds_count"}
+    check_histograms(families)
+
+    # Label escaping round-trips
+    escaped = families["test_escape_total"]["samples"]
+    assert [labels["value"] for _, labels, _ in escaped] == [TRICKY_VALUE]
+
+
+def test_metrics_scrape_prometheus_client(admin_client):
+    parser = pytest.importorskip("prometheus_client.parser")
+    body = _scrape(admin_client, "/api/health")
+    families = {f.name: f for f in parser.text_string_to_metric_families(body)}
+    assert families["http_requests"].type == "counter"
+    assert families["http_request_duration_seconds"].type == "histogram"
+    values = [s.labels["value"] for s in families["test_escape"].samples]
+    assert values == [TRICKY_VALUE]
+
+
+def test_registry_render_matches_scrape():
+    # The registry renders the same format the endpoint serves
+    check_histograms(parse_exposition(REGISTRY.render()))
+
+
+def test_multi_tenant_routes_are_labelled_per_tenant():
+    server = _load_module("client_server_tenants", os.path.join("client", "server.py"))
+    client = TestClient(server.create_client_app(tenants=[{"id": "a"}, {"id": "b"}]))
+    for path in ("/clients/a/api/health", "/clients/b/api/health", "/api/health"):
+        assert client.get(path).status_code == 200
+    samples = parse_exposition(client.get("/metrics").text)["http_requests_total"]["samples"]
+    routes = {labels["route"] for _, labels, _ in samples}
+    assert {"/clients/a/api/health", "/clients/b/api/health", "/api/health"} <= routes
@@ -0,0 +1,98 @@
+"""
+Prediction cache: readings equal after rounding share an entry, the LRU
+stays bounded, and swapping the serving model never serves old predictions.
+
+Run from backend/: python -m pytest -q tests
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from core.features import FeatureSpec  # noqa: E402
+from core.prediction_cache import PredictionCache  # noqa: E402
+from routes import model as model_routes  # noqa: E402
+
+READING = {
+    "pressure_bar": 3.2, "flow_rate_L_min": 5.7, "total_volume_L": 1.42, "tds_ppm": 337.0,
+    "ph": 7.2, "temperature_C": 26.52, "signal_strength_dBm": -52.0,
+    "pressure_status": "Normal", "tds_status": "Moderate", "ph_status": "Neutral",
+    "wifi_status": "Connected", "sensor_status": "OK",
+}
+
+
+class ConstantModel:
+    """Keras-shaped model answering one probability and counting the rows it saw."""
+
+    def __init__(self, probability: float):
+        self.probability = probability
+        self.rows = 0
+
+    def predict(self, X, batch_size=None, verbose=0):
+        self.rows += len(X)
+        return np.full((len(X), 1), self.probability)
+
+
+def test_rounded_readings_share_a_key():
+    cache = PredictionCache(capacity=10, decimals=3)
+    key = cache.key(1, READING)
+    assert cache.key(1, {**READING, "ph": 7.2004}) == key
+    assert cache.key(1, {**READING, "ph": 7.201}) != key
+    assert cache.key(2, READING) != key
+
+
+def test_lru_evicts_least_recently_used():
+    cache = PredictionCache(capacity=2)
+    cache.put_many(["a", "b"], [0.1, 0.2])
+    assert cache.get_many(["a"], "test") == [0.1]
+    cache.put_many(["c"], [0.3])
+    assert cache.get_many(["a", "b", "c"], "test") == [0.1, None, 0.3]
+    stats = cache.stats()
+    assert stats["entries"] == 2 and stats["hits"] == 3 and stats["misses"] == 1
+    assert not PredictionCache(capacity=0).enabled
+
+
+@pytest.fixture
+def serving(monkeypatch):
+    """Isolated serving state and cache for routes.model."""
+    monkeypatch.setattr(model_routes, "_serving", model_routes._serving)
+    monkeypatch.setattr(model_routes, "_model_version", model_routes._model_version)
+    monkeypatch.setattr(model_routes, "_prediction_cache", PredictionCache(capacity=100, decimals=3))
+    return model_routes
+
+
+def _predict(serving, records):
+    model, _, _ = serving.get_model_data()
+    return serving._predict_records(model, serving._serving.feature_spec, records, "predict")
+
+
+def test_model_swap_invalidates_cached_predictions(serving):
+    spec = FeatureSpec.default()
+    old = ConstantModel(0.2)
+    serving.set_model_data(old, None, spec.features, spec, version="v0001")
+
+    assert _predict(serving, [READING]) == [0.2]
+    assert _predict(serving, [READING, {**READING, "ph": 7.2001}]) == [0.2, 0.2]
+    assert old.rows == 1
+    assert serving._prediction_cache.stats()["entries"] == 1
+
+    new = ConstantModel(0.9)
+    serving.set_model_data(new, None, spec.features, spec, version="v0002")
+    assert serving._prediction_cache.stats()["entries"] == 0
+    assert _predict(serving, [READING]) == [0.9]
+    assert new.rows == 1 and old.rows == 1
+
+
+def test_stale_generation_is_never_served(serving):
+    spec = FeatureSpec.default()
+    serving.set_model_data(ConstantModel(0.2), None, spec.features, spec)
+    cache = serving._prediction_cache
+    # An entry written under an earlier generation (e.g. by a request racing a swap)
+    stale_key = cache.key(serving._model_version - 1, READING)
+    cache.put_many([stale_key], [0.99])
+    assert _predict(serving, [READING]) == [0.2]
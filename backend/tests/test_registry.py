@@ -0,0 +1,99 @@
+"""
+Model registry: versions publish atomically, CURRENT follows promotions and
+repeated rollbacks keep stepping back through the serving history.
+
+Run from backend/: python -m pytest -q tests
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from core.registry import CURRENT_FILE, METADATA_FILE, ModelRegistry  # noqa: E402
+
+
+def _commit(registry: ModelRegistry, content: str, **metadata) -> str:
+    with registry.stage() as staged:
+        with open(staged.path("model.h5"), "w") as f:
+            f.write(content)
+        return staged.commit(metadata)
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return ModelRegistry(str(tmp_path / "registry"))
+
+
+def test_versions_are_numbered_and_described(registry):
+    assert registry.versions() == [] and registry.current() is None
+    v1 = _commit(registry, "one", metrics={"accuracy": 0.9})
+    v2 = _commit(registry, "two")
+    assert (v1, v2) == ("v0001", "v0002")
+    assert registry.versions() == [v1, v2]
+
+    meta = registry.metadata(v1)
+    assert meta["version"] == v1 and meta["metrics"] == {"accuracy": 0.9}
+    assert meta["files"]["model.h5"]["size"] == 3
+    with open(registry.path(v1, METADATA_FILE)) as f:
+        assert json.load(f) == meta
+
+
+def test_failed_stage_leaves_nothing_behind(registry):
+    with pytest.raises(RuntimeError):
+        with registry.stage() as staged:
+            with open(staged.path("model.h5"), "w") as f:
+                f.write("partial")
+            raise RuntimeError("training crashed")
+    assert registry.versions() == []
+    assert [name for name in os.listdir(registry.directory) if name.startswith(".staging")] == []
+
+
+def test_promote_swaps_current(registry):
+    v1, v2 = _commit(registry, "one"), _commit(registry, "two")
+    with pytest.raises(KeyError):
+        registry.promote("v0099")
+    assert registry.current() is None
+
+    registry.promote(v1)
+    event = registry.promote(v2)
+    assert event["previous"] == v1
+    with open(os.path.join(registry.directory, CURRENT_FILE)) as f:
+        assert f.read().strip() == v2
+    # Only CURRENT, the log and the versions: no temp files from the swap
+    assert sorted(os.listdir(registry.directory)) == sorted([CURRENT_FILE, "promotions.jsonl", "versions"])
+
+
+def test_repeated_rollbacks_walk_back(registry):
+    versions = [_commit(registry, str(i)) for i in range(4)]
+    for version in versions:
+        registry.promote(version)
+
+    for expected in reversed(versions[:-1]):
+        assert registry.rollback()["version"] == expected
+        assert registry.current() == expected
+    with pytest.raises(LookupError):
+        registry.rollback()
+
+    # State lives on disk: a new instance sees the same pointer and history
+    reopened = ModelRegistry(registry.directory)
+    assert reopened.current() == versions[0]
+    assert reopened.history() == [versions[0]]
+
+
+def test_rollback_after_promoting_past_a_rollback(registry):
+    v1, v2, v3, v4 = (_commit(registry, str(i)) for i in range(4))
+    for version in (v1, v2, v3):
+        registry.promote(version)
+    registry.rollback()                 # v3 -> v2
+    registry.promote(v4)                # v2 -> v4
+    assert registry.history() == [v1, v2, v4]
+    assert registry.rollback()["version"] == v2
+    assert registry.rollback()["version"] == v1
+    # Promoting the serving version again does not add a step to roll back through
+    registry.promote(v1)
+    assert registry.previous() is None
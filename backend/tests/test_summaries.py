@@ -0,0 +1,67 @@
+"""
+ReadingsSummary folded batch by batch equals statistics recomputed over
+all rows, and copies diverge independently.
+
+Run from backend/: python -m pytest -q tests
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+from core.summaries import ReadingsSummary  # noqa: E402
+
+COLUMNS = ["ph", "tds_ppm"]
+
+
+def _frame(n: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    ph = rng.normal(7.2, 0.4, n)
+    ph[rng.random(n) < 0.1] = np.nan
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2025-01-01", periods=n, freq="15min") + pd.Timedelta(days=seed),
+        "ph": ph,
+        "tds_ppm": rng.integers(100, 600, n),
+        "unsafe": (rng.random(n) < 0.3).astype(int),
+    })
+
+
+def test_incremental_matches_full_recompute():
+    batches = [_frame(n, seed) for seed, n in enumerate([50, 1, 7, 0, 120])]
+    summary = ReadingsSummary(COLUMNS, latest_size=10)
+    for batch in batches:
+        summary.add_frame(batch)
+    full = pd.concat(batches, ignore_index=True)
+
+    snap = summary.snapshot()
+    assert snap["total"] == len(full)
+    assert snap["unsafe"] == full["unsafe"].sum()
+    assert snap["safe"] == len(full) - full["unsafe"].sum()
+    # Empty batches change nothing
+    assert snap["version"] == 4
+    for col in COLUMNS:
+        stats = snap["columns"][col]
+        assert stats["count"] == full[col].count()
+        assert stats["mean"] == pytest.approx(full[col].mean())
+        assert stats["std"] == pytest.approx(full[col].std(ddof=0))
+
+    expected_latest = full.tail(10)["timestamp"].dt.strftime("%Y-%m-%d %H:%M:%S").tolist()
+    assert [r["timestamp"] for r in snap["latest"]] == expected_latest
+
+
+def test_copy_is_independent():
+    base = ReadingsSummary.from_frame(_frame(20, 0), COLUMNS, latest_size=5)
+    copy = base.copy()
+    copy.add_frame(_frame(3, 1))
+
+    assert base.snapshot()["total"] == 20
+    assert copy.snapshot()["total"] == 23
+    assert copy.version == base.version + 1
+    assert base.mean("ph") != copy.mean("ph")
+    assert base.mean("not_a_column") is None